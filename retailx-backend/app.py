@@ -1,62 +1,206 @@
+import threading
+import time
+
 from flask import Flask, jsonify
 from flask_cors import CORS
-from dotenv import load_dotenv
-import os
+
+# Config (.env yahin load hota hai)
+from config import Config
 
 # Extensions
 from extensions import mongo, bcrypt, jwt
+from json_provider import init_json
+
+from services.metrics import init_metrics, mongo_command_listener
+
+# App factory
+# Har gunicorn worker apna app fork ke BAAD banata hai (gunicorn "app:create_app()", --preload nahi),
+# toh Mongo client, thread pools aur scheduler threads kabhi workers ke beech share nahi hote.
+# Mongo indexes create_app mein hi provision hote hain (fail ho toh worker start nahi hota).
+# Heavy kaam (in-memory indexes build) STARTUP_WARMUP ke hisaab se: "lazy" mein worker ki
+# pehli request pe background thread, tab tak routes ke DB fallbacks chalte hain.
+
+
+def _provision_indexes(app):
+    from repositories.indexes import provision_indexes
+
+    # 🗂️ MONGO INDEXES: hamesha create_app ke andar (lazy mode mein bhi). Index conflict ya
+    # COLLSCAN self-check fail ho toh worker boot hi fail ho, background mein chup-chaap nahi.
+    provision_indexes(mongo.db, self_check=app.config["DB_INDEX_SELF_CHECK"])
+
+
+def _warm_up(app):
+    from services.search_index import init_search_index
+    from services.suggest_index import init_suggest_index
+    from services.retrieval_index import init_retrieval_index
+    from services.similar_products import init_similar_products
+    from services.feed import init_feed
+    from repositories.seller_stats_repository import init_seller_stats
+    from repositories.admin_stats_repository import init_admin_stats
+
+    start = time.perf_counter()
+
+    steps = [
+        # 🔍 SEARCH INDEX (startup pe build, writes pe incremental update)
+        ("search index", init_search_index),
+        # ⌨️ SUGGEST INDEX (typeahead prefixes)
+        ("suggest index", init_suggest_index),
+        # 🤖 CHAT RETRIEVAL INDEX (sparse hashed vectors, chat context ke liye)
+        ("chat retrieval index", init_retrieval_index),
+        # 🧩 SIMILAR PRODUCTS (precomputed top-K per product)
+        ("similar products", init_similar_products),
+        # 🏠 FEED (per-category top lists, background refresh)
+        ("feed", init_feed),
+        # 📊 SELLER STATS (writes pe $inc, periodic reconciliation)
+        ("seller stats", init_seller_stats),
+        # 🛡️ ADMIN STATS (aggregation snapshots, schedule pe refresh)
+        ("admin stats", init_admin_stats),
+    ]
+    # Har step alag: ek fail ho toh baaki phir bhi chalein (routes ke DB fallbacks toh hain hi)
+    failed = []
+    for name, init in steps:
+        try:
+            init(app)
+        except Exception as e:
+            failed.append(name)
+            print(f"❌ Warmup step failed ({name}): {e}")
+
+    app.config["WARMUP_FAILED"] = failed
+    app.config["WARMUP_MS"] = round((time.perf_counter() - start) * 1000, 1)
+    print(f"✅ Warmup done in {app.config['WARMUP_MS']} ms" + (f" (failed: {', '.join(failed)})" if failed else ""))
+
+
+def _warm_up_on_first_request(app):
+    """Pehli request pe (yaani fork ke baad, isi worker mein) warmup background thread mein."""
+    lock = threading.Lock()
+    state = {"started": False}
+
+    def start_warm_up():
+        if state["started"]:
+            return
+        with lock:
+            if state["started"]:
+                return
+            state["started"] = True
+
+        def run():
+            with app.app_context():
+                try:
+                    _warm_up(app)
+                except Exception as e:
+                    print(f"❌ Warmup failed: {e}")
+
+        threading.Thread(target=run, name="startup-warmup", daemon=True).start()
+
+    app.before_request(start_warm_up)
+    # asgi.py ka lifespan isse server start pe hi chala deta hai (async routes Flask hooks se nahi guzarte)
+    app.extensions["warm_up"] = start_warm_up
+
+
+def create_app(config=None):
+    """Build the Flask app; config (dict ya object) Config ke upar override hota hai."""
+    start = time.perf_counter()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if isinstance(config, dict):
+        app.config.from_mapping(config)
+    elif config is not None:
+        app.config.from_object(config)
+
+    # 🌐 CORS Configuration
+    CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True, expose_headers=["X-Next-Cursor"])
+
+    # 🛠️ INIT EXTENSIONS
+    # connect=False: client bante hi server se connect nahi hota, pehli query pe (fork ke baad)
+    mongo.init_app(
+        app,
+        connect=False,
+        maxPoolSize=app.config["MONGO_MAX_POOL_SIZE"],
+        minPoolSize=app.config["MONGO_MIN_POOL_SIZE"],
+        serverSelectionTimeoutMS=app.config["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+        connectTimeoutMS=app.config["MONGO_CONNECT_TIMEOUT_MS"],
+        socketTimeoutMS=app.config["MONGO_SOCKET_TIMEOUT_MS"],
+        waitQueueTimeoutMS=app.config["MONGO_WAIT_QUEUE_TIMEOUT_MS"],
+        event_listeners=[mongo_command_listener] if app.config["METRICS_ENABLED"] else [],
+    )
+    # mongo.init_app app.json ko apne BSONProvider se badal deta hai ({"$oid": ...}), isliye baad mein
+    init_json(app)
+    bcrypt.init_app(app)
+    jwt.init_app(app)
+
+    from services.password_hashing import init_password_hashing
+    init_password_hashing(app)
+    init_metrics(app)
+
+    # 🛣️ REGISTER BLUEPRINTS
+    from routes.auth_routes import auth_bp
+    from routes.admin_routes import admin_bp
+    from routes.seller_routes import seller_bp
+    from routes.preferences_routes import preferences_bp
+    from routes.products import product_bp
+    from routes.search import search_bp
+    from routes.chat import chat_bp, init_chat
+    from routes.cart_routes import cart_bp
+
+    app.register_blueprint(auth_bp, url_prefix="/api/auth")
+    app.register_blueprint(admin_bp, url_prefix="/api/admin")
+    app.register_blueprint(seller_bp, url_prefix="/api/seller")
+    app.register_blueprint(preferences_bp, url_prefix="/api")
+    app.register_blueprint(product_bp, url_prefix="/")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(chat_bp, url_prefix="/api/chat")
+    app.register_blueprint(cart_bp, url_prefix="/api")
+
+    # 🤖 CHAT (Gemini client pehli chat request pe banta hai)
+    init_chat(app)
+
+    # ⚡ PRODUCT CACHE (PRODUCT_CACHE_URL=redis://... do toh workers shared cache use karenge)
+    from repositories.products_repository import configure_cache
+    configure_cache(
+        url=app.config["PRODUCT_CACHE_URL"],
+        max_size=app.config["PRODUCT_CACHE_SIZE"],
+        ttl=app.config["PRODUCT_CACHE_TTL"],
+    )
+
+    # 🔥 WARMUP
+    warmup = app.config["STARTUP_WARMUP"]
+    if warmup != "off":
+        _provision_indexes(app)
+    if warmup == "sync":
+        _warm_up(app)
+    elif warmup == "lazy":
+        _warm_up_on_first_request(app)
+
+    @app.route("/api/test-db")
+    def test_db():
+        try:
+            mongo.db.test.insert_one({"msg": "RetailXDB is connected!"})
+            return jsonify({"status": "Success", "database": "retailxdb connected"}), 200
+        except Exception as e:
+            return jsonify({"status": "Error", "message": str(e)}), 500
+
+    @app.route("/")
+    def home():
+        return "RetailX Backend Running 🚀"
+
+    app.config["STARTUP_MS"] = round((time.perf_counter() - start) * 1000, 1)
+    print(f"✅ App ready in {app.config['STARTUP_MS']} ms (warmup: {warmup})")
+    return app
+
+
+_app = None
+
+
+def __getattr__(name):
+    # Purane "app:app" / "from app import app" ke liye: pehli baar maango tab banta hai
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(name)
 
-# Saare Blueprints
-from routes.auth_routes import auth_bp
-from routes.admin_routes import admin_bp
-from routes.seller_routes import seller_bp
-from routes.preferences_routes import preferences_bp
-from routes.products import product_bp 
-from routes.search import search_bp
-from routes.chat import chat_bp
-
-load_dotenv()
-
-app = Flask(__name__)
-
-# 🌐 CORS Configuration
-CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
-
-# ⚙️ CONFIG
-app.config["MONGO_URI"] = os.getenv("MONGO_URI")
-app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
-app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
-app.config["MONGO_DBNAME"] = "retailxDB"
-
-app.config["JWT_TOKEN_LOCATION"] = ["headers"]
-app.config["JWT_HEADER_NAME"] = "Authorization"
-app.config["JWT_HEADER_TYPE"] = "Bearer"
-
-# 🛠️ INIT EXTENSIONS
-mongo.init_app(app)
-bcrypt.init_app(app)
-jwt.init_app(app)
-
-# 🛣️ REGISTER BLUEPRINTS
-app.register_blueprint(auth_bp, url_prefix="/api/auth")
-app.register_blueprint(admin_bp, url_prefix="/api/admin")
-app.register_blueprint(seller_bp, url_prefix="/api/seller")
-app.register_blueprint(preferences_bp, url_prefix="/api")
-app.register_blueprint(product_bp, url_prefix="/")
-app.register_blueprint(search_bp, url_prefix="/api/search")
-app.register_blueprint(chat_bp, url_prefix="/api/chat")
-
-@app.route("/api/test-db")
-def test_db():
-    try:
-        mongo.db.test.insert_one({"msg": "RetailXDB is connected!"})
-        return jsonify({"status": "Success", "database": "retailxdb connected"}), 200
-    except Exception as e:
-        return jsonify({"status": "Error", "message": str(e)}), 500
-
-@app.route("/")
-def home():
-    return "RetailX Backend Running 🚀"
 
 if __name__ == "__main__":
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    create_app().run(debug=True, port=5000)
@@ -0,0 +1,76 @@
+from contextlib import asynccontextmanager
+
+from app import create_app
+from services.metrics import mongo_command_listener
+
+# ASGI serving mode
+# Hot read routes (routes/async_catalog.py) async Mongo driver (PyMongo AsyncMongoClient)
+# pe chalte hain, aur chat (routes/async_chat.py) Gemini ka wait event loop pe karta hai;
+# baaki saare routes (auth, seller, cart, writes) wahi Flask app hai, neeche mount kiya
+# hua, thread pool pe. Writes Flask se hi hote hain, toh catalog_events
+# isi process mein publish hote hain aur async routes ka cache / search index bhi invalid hota hai.
+#
+# Chalane ke liye (retailx-backend folder se):
+#     pip install "pymongo>=4.13" starlette uvicorn a2wsgi
+#     uvicorn asgi:create_asgi_app --factory --workers 4 --port 8000
+# --factory se har worker apna app (aur apna Mongo client) khud banata hai.
+
+
+def create_asgi_app(config=None):
+    from a2wsgi import WSGIMiddleware
+    from pymongo import AsyncMongoClient
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.middleware.cors import CORSMiddleware
+    from starlette.routing import Mount
+
+    from routes.async_catalog import routes
+    from routes.async_chat import routes as chat_routes
+
+    flask_app = create_app(config)
+    settings = flask_app.config
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Async client event loop ke andar banta hai (worker process mein, fork ke baad)
+        client = AsyncMongoClient(
+            settings["MONGO_URI"],
+            maxPoolSize=settings["MONGO_MAX_POOL_SIZE"],
+            minPoolSize=settings["MONGO_MIN_POOL_SIZE"],
+            serverSelectionTimeoutMS=settings["MONGO_SERVER_SELECTION_TIMEOUT_MS"],
+            connectTimeoutMS=settings["MONGO_CONNECT_TIMEOUT_MS"],
+            socketTimeoutMS=settings["MONGO_SOCKET_TIMEOUT_MS"],
+            waitQueueTimeoutMS=settings["MONGO_WAIT_QUEUE_TIMEOUT_MS"],
+            event_listeners=[mongo_command_listener] if settings["METRICS_ENABLED"] else [],
+        )
+        app.state.db = client.get_default_database(settings["MONGO_DBNAME"])
+        app.state.config = settings
+
+        # Lazy warmup Flask ki pehli request pe hota; async routes wahan se nahi guzarte
+        start_warm_up = flask_app.extensions.get("warm_up")
+        if start_warm_up:
+            start_warm_up()
+        try:
+            yield
+        finally:
+            await client.close()
+
+    return Starlette(
+        routes=[
+            *routes,
+            *chat_routes,
+            Mount("/", app=WSGIMiddleware(flask_app, workers=settings["ASGI_WSGI_THREADS"])),
+        ],
+        middleware=[
+            # 🌐 Flask CORS config jaisa (preflight yahin answer ho jaata hai)
+            Middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"],
+                       allow_headers=["*"], expose_headers=["X-Next-Cursor"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("asgi:create_asgi_app", factory=True, port=8000)
@@ -0,0 +1,324 @@
+"""End-to-end API load benchmark: throughput + p50/p95/p99 per endpoint and concurrency.
+
+Scenarios: products (listing), product (detail), search, seller_inventory, login.
+Har scenario har --concurrency level pe closed loop mein chalta hai (N threads,
+har thread response aate hi agli request). Results JSON (--out) mein commit id ke
+saath likhte hain; do runs ko benchmarks.compare se compare karo.
+
+Targets:
+  * in-process (default): create_app() ka Flask test client, --mongo-uri wala
+    mongod. --seed N pe pehle synthetic catalog daalta hai (benchmarks.seed).
+  * --memory: in-process + mongomock (`pip install mongomock`), bina mongod ke harness
+    smoke-run. Collation / $facet jaisi cheezein mongomock mein poori nahi hain, toh
+    commits compare karne ke liye mongod hi use karo.
+  * --base-url http://127.0.0.1:5000: already chal rahe server (gunicorn etc.) pe
+    HTTP keep-alive connections. Data pehle `python -m benchmarks.seed` se daalo.
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.bench_api --seed 100000 --concurrency 1 8 32 --requests 2000 --out bench_api.json
+    python -m benchmarks.bench_api --base-url http://127.0.0.1:5000 --concurrency 16 64 --out after.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import count
+from urllib.parse import quote, urlsplit
+
+from benchmarks.common import BRANDS, CATEGORIES, TAGS, seller_email, summarize, user_email
+from benchmarks.seed import BENCH_PASSWORD, DEFAULT_URI
+
+SCENARIOS = ("products", "product", "search", "seller_inventory", "login")
+SEARCH_TERMS = [t for t in TAGS] + [b.lower() for b in BRANDS] + [c.lower() for c in CATEGORIES]
+SORTS = ["_id", "finalPrice", "-finalPrice", "-rating"]
+
+
+# --- 🔌 CLIENTS (har worker thread ka apna) ---
+
+class InProcessClient:
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self._client.open(path, method=method, json=body, headers=headers or {})
+        response.get_data()  # streaming bodies bhi poori padho
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self._host, self._port = parts.hostname, parts.port or 80
+        self._timeout = timeout
+        self._conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        for attempt in (1, 2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+            try:
+                self._conn.request(method, path, body=payload, headers=headers)
+                response = self._conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Server ne keep-alive connection band kar diya: ek baar naya connection
+                self._conn.close()
+                self._conn = None
+                if attempt == 2:
+                    raise
+        try:
+            parsed = json.loads(data) if data else None
+        except ValueError:
+            parsed = None
+        return response.status, parsed
+
+
+# --- 🎯 SCENARIOS: (method, path, body, headers) ---
+
+def _products(rng, ctx):
+    params = [f"limit={rng.choice([20, 40])}", f"sort={quote(rng.choice(SORTS))}"]
+    if rng.random() < 0.5:
+        params.append(f"category={quote(rng.choice(CATEGORIES))}")
+    if rng.random() < 0.3:
+        low = rng.choice([0, 200, 500])
+        params += [f"min_price={low}", f"max_price={low + rng.choice([500, 1500])}"]
+    return "GET", "/api/products?" + "&".join(params), None, None
+
+
+def _product(rng, ctx):
+    return "GET", f"/api/product/{rng.choice(ctx['product_ids'])}", None, None
+
+
+def _search(rng, ctx):
+    return "GET", f"/api/search/?q={quote(rng.choice(SEARCH_TERMS))}", None, None
+
+
+def _seller_inventory(rng, ctx):
+    token = rng.choice(ctx["seller_tokens"])
+    return "GET", "/api/seller/inventory", None, {"Authorization": f"Bearer {token}"}
+
+
+def _login(rng, ctx):
+    body = {"email": user_email(rng.randrange(ctx["users"])), "password": BENCH_PASSWORD}
+    return "POST", "/api/auth/login", body, None
+
+
+SCENARIO_REQUESTS = {
+    "products": _products,
+    "product": _product,
+    "search": _search,
+    "seller_inventory": _seller_inventory,
+    "login": _login,
+}
+
+
+def run_scenario(make_client, name, ctx, concurrency, requests, warmup, seed):
+    build = SCENARIO_REQUESTS[name]
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    ticket = count()
+    # Warmup ke baad saare workers saath shuru; throughput ka clock yahin se
+    started = []
+    barrier = threading.Barrier(concurrency, action=lambda: started.append(time.perf_counter()))
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        client = make_client()
+        for _ in range(warmup // concurrency):
+            try:
+                client.request(*build(rng, ctx))
+            except Exception:
+                pass
+        barrier.wait()
+        samples, seen = [], {}
+        while next(ticket) < requests:
+            method, path, body, headers = build(rng, ctx)
+            start = time.perf_counter()
+            try:
+                status, _ = client.request(method, path, body, headers)
+            except Exception:
+                status = "exception"
+            samples.append((time.perf_counter() - start) * 1000)
+            seen[status] = seen.get(status, 0) + 1
+        with lock:
+            latencies.extend(samples)
+            for status, n in seen.items():
+                statuses[str(status)] = statuses.get(str(status), 0) + n
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started[0]
+
+    errors = sum(n for status, n in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency": summarize(latencies),
+    }
+
+
+# --- 🏗️ TARGET SETUP ---
+
+def _in_process_app(args):
+    """create_app() against the bench database; warmup sync taaki timing mein startup kaam na aaye."""
+    config = {
+        "MONGO_URI": args.mongo_uri,
+        "JWT_SECRET_KEY": os.getenv("JWT_SECRET_KEY") or "bench-jwt-secret",
+        "SECRET_KEY": os.getenv("SECRET_KEY") or "bench-secret",
+        "STARTUP_WARMUP": "sync",
+    }
+    if args.memory:
+        try:
+            import mongomock
+        except ImportError:
+            raise SystemExit("--memory ke liye mongomock chahiye: pip install mongomock")
+        import flask_pymongo
+        flask_pymongo.MongoClient = mongomock.MongoClient
+        # explain() based index self-check mongomock pe nahi chalta
+        config["DB_INDEX_SELF_CHECK"] = False
+
+    from app import create_app
+    from extensions import mongo
+    return create_app(config), mongo.db
+
+
+def _refresh_in_memory_state():
+    """Seed ke baad app ke in-memory indexes / snapshots dobara banao (startup pe DB khaali tha)."""
+    from repositories.admin_stats_repository import refresh_all
+    from repositories.seller_stats_repository import rebuild_seller_stats
+    from services import feed, retrieval_index, search_index, similar_products, suggest_index
+
+    for rebuild in (search_index.rebuild_from_db, suggest_index.rebuild_from_db, retrieval_index.rebuild_from_db,
+                    similar_products.rebuild_from_db, feed.rebuild_from_db, rebuild_seller_stats, refresh_all):
+        try:
+            rebuild()
+        except Exception as e:
+            print(f"Refresh failed ({rebuild.__module__}.{rebuild.__name__}): {e}")
+
+
+def _collect_context(db, client, args):
+    ids = [str(doc["_id"]) for doc in db.products.find({"isActive": True}, {"_id": 1}).limit(5000)] if db is not None else []
+    if not ids:
+        # Remote target: ids API se hi nikal lo
+        _, page = client.request("GET", "/api/products?limit=100&fields=name")
+        ids = [p["id"] for p in page or []]
+    if not ids:
+        raise SystemExit("Catalog khaali hai: --seed N do ya pehle benchmarks.seed chalao")
+
+    tokens = []
+    for i in range(min(args.sellers, args.seller_tokens)):
+        status, body = client.request("POST", "/api/seller/login",
+                                      {"email": seller_email(i), "password": BENCH_PASSWORD})
+        if status == 200 and body:
+            tokens.append(body["token"])
+    return {"product_ids": ids, "seller_tokens": tokens, "users": args.users}
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="running server; na do toh in-process test client")
+    parser.add_argument("--mongo-uri", default=DEFAULT_URI)
+    parser.add_argument("--memory", action="store_true", help="in-process mongomock stand-in")
+    parser.add_argument("--seed", type=int, default=0, metavar="N", help="pehle N products ka catalog seed karo")
+    parser.add_argument("--reset", action="store_true",
+                        help="--seed non-bench DB (naam mein 'bench' nahi) pe bhi collections drop kare")
+    parser.add_argument("--sellers", type=int, default=50)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--seller-tokens", type=int, default=10, help="kitne sellers ke tokens (inventory scenario)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=1000, help="per scenario per concurrency level")
+    parser.add_argument("--login-requests", type=int, default=200, help="login bcrypt-bound hai, kam requests")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--label", help="run ka naam (default: git commit)")
+    parser.add_argument("--out", help="results JSON file")
+    args = parser.parse_args()
+
+    if args.base_url and args.memory:
+        raise SystemExit("--memory sirf in-process target ke saath")
+
+    db, app = None, None
+    seed_stats = None
+    if args.base_url:
+        if args.seed:
+            from benchmarks.seed import connect, seed
+            try:
+                seed_stats = seed(connect(args.mongo_uri), args.seed, args.sellers, args.users,
+                                  force_reset=args.reset)
+            except ValueError as e:
+                raise SystemExit(str(e))
+            print("Seeded; server restart karo (ya index refresh ka wait) taaki in-memory indexes naya data dekhein")
+        make_client = lambda: HttpClient(args.base_url)
+    else:
+        app, db = _in_process_app(args)
+        if args.seed:
+            from benchmarks.seed import seed
+            try:
+                seed_stats = seed(db, args.seed, args.sellers, args.users, force_reset=args.reset)
+            except ValueError as e:
+                raise SystemExit(str(e))
+            _refresh_in_memory_state()
+        make_client = lambda: InProcessClient(app)
+
+    ctx = _collect_context(db, make_client(), args)
+    if "seller_inventory" in args.scenarios and not ctx["seller_tokens"]:
+        raise SystemExit("Seller login fail hua: seed data hai? (password BENCH_PASSWORD)")
+
+    results = []
+    for name in args.scenarios:
+        requests = args.login_requests if name == "login" else args.requests
+        for level in args.concurrency:
+            result = run_scenario(make_client, name, ctx, level, requests, args.warmup, seed=level)
+            print(f"{name:17s} c={level:<4d} {result['throughput_per_s']:>9.1f} req/s  "
+                  f"p50={result['latency']['p50_ms']:.1f}ms p95={result['latency']['p95_ms']:.1f}ms "
+                  f"p99={result['latency']['p99_ms']:.1f}ms errors={result['errors']}")
+            results.append(result)
+
+    report = {
+        "meta": {
+            "label": args.label or _git_commit(),
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": args.base_url or ("in-process+mongomock" if args.memory else "in-process"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed_stats,
+            "catalog_sample": len(ctx["product_ids"]),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
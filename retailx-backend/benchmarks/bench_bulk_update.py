@@ -0,0 +1,99 @@
+"""Bulk stock/price update benchmark: N single-item updates vs one bulk_write.
+
+Local mongod chahiye (ek alag bench database use hota hai, har run pe reset; naam mein
+"bench" na ho toh --reset dena padta hai).
+Single path = update_product_fields() per item (seller update-stock route jaisa);
+bulk path = bulk_update_products() (PATCH /api/seller/product/bulk-update).
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.bench_bulk_update --mongo-uri mongodb://localhost:27017/retailx_bench --products 5000 --batch 500
+"""
+import argparse
+import json
+import random
+import time
+
+from flask import Flask
+
+from benchmarks.common import make_products, summarize
+from benchmarks.seed import DEFAULT_URI, check_resettable
+from extensions import mongo
+from repositories.products_repository import bulk_update_products, update_product_fields
+
+SELLER = "seller0@example.com"
+
+
+def make_updates(rng, ids, n):
+    updates = []
+    for _ in range(n):
+        product_id = str(rng.choice(ids))
+        if rng.random() < 0.5:
+            updates.append({"id": product_id, "stock": rng.randint(0, 500)})
+        else:
+            updates.append({"id": product_id, "price": round(rng.uniform(99, 2999), 2),
+                            "discount": rng.choice([0, 10, 20])})
+    return updates
+
+
+def run_single(updates):
+    for item in updates:
+        changes = {k: v for k, v in item.items() if k != "id"}
+        if "price" in changes:
+            changes["finalPrice"] = changes["price"] - changes["price"] * changes["discount"] / 100
+        update_product_fields(item["id"], changes, seller_email=SELLER)
+
+
+def run_bulk(updates):
+    bulk_update_products(updates, SELLER)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mongo-uri", default=DEFAULT_URI)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=500, help="updates per request")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--out", help="results JSON file")
+    parser.add_argument("--reset", action="store_true",
+                        help="non-bench DB (naam mein 'bench' nahi) ke products bhi drop karo")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["MONGO_URI"] = args.mongo_uri
+    mongo.init_app(app)
+
+    rng = random.Random(11)
+    with app.app_context():
+        try:
+            check_resettable(mongo.db, args.reset)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        products = make_products(args.products)
+        for p in products:
+            p["seller_email"] = SELLER
+        mongo.db.products.drop()
+        mongo.db.products.insert_many(products)
+        ids = [p["_id"] for p in products]
+
+        results = {"products": args.products, "batch": args.batch}
+        for name, fn in (("single", run_single), ("bulk", run_bulk)):
+            samples = []
+            for _ in range(args.rounds):
+                updates = make_updates(rng, ids, args.batch)
+                start = time.perf_counter()
+                fn(updates)
+                samples.append((time.perf_counter() - start) * 1000)
+            stats = summarize(samples)
+            stats["items_per_s"] = round(args.batch / (stats["mean_ms"] / 1000), 1) if stats["mean_ms"] else None
+            results[name] = stats
+
+        mongo.db.products.drop()
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Offline chat cache benchmark (stub model, synthetic catalog, no Gemini / Mongo needed).
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.bench_chat_cache --messages 2000 --model-latency 0.05 --write-every 500
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import CONCERNS, TAGS, make_products, summarize
+from services.chat_service import ChatService
+from services.llm import StubModelClient
+
+BASE_MESSAGES = [
+    "show all products", "what products do you have", "list your inventory",
+    "hi", "best items for me",
+] + [f"something for {c}" for c in CONCERNS] + [f"do you have {t} products" for t in TAGS]
+
+
+def variants(message, rng):
+    # Users same sawaal alag case / punctuation mein puchte hain
+    return rng.choice([message, message.upper(), message.capitalize() + "?", f"  {message}!! "])
+
+
+def make_retriever(products, latency):
+    def retrieve(query):
+        time.sleep(latency)  # DB round trip ka andaaza
+        words = query.split()
+        hits = [p for p in products if any(w in p["name"].lower() or w in p["tags"] for w in words)][:5]
+        return "\n".join(f"- {p['name']} (Brand: {p['brand']})" for p in hits) or "No products found."
+    return retrieve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--model-latency", type=float, default=0.05, help="stub model seconds per call")
+    parser.add_argument("--db-latency", type=float, default=0.005, help="simulated retrieval seconds")
+    parser.add_argument("--write-every", type=int, default=500, help="catalog write (invalidate) every N messages, 0 = never")
+    parser.add_argument("--out", help="results JSON file")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    products = make_products(2000)
+    model = StubModelClient(latency=args.model_latency)
+    service = ChatService(model, make_retriever(products, args.db_latency))
+
+    # Zipf-ish popularity: pehle wale generic sawaal sabse zyada aate hain
+    weights = [1 / (i + 1) for i in range(len(BASE_MESSAGES))]
+    latencies, hit_latencies, miss_latencies = [], [], []
+    for i in range(args.messages):
+        if args.write_every and i and i % args.write_every == 0:
+            service.invalidate()
+        message = variants(rng.choices(BASE_MESSAGES, weights)[0], rng)
+        start = time.perf_counter()
+        _, hit = service.reply(message)
+        elapsed = (time.perf_counter() - start) * 1000
+        latencies.append(elapsed)
+        (hit_latencies if hit else miss_latencies).append(elapsed)
+
+    results = {
+        "messages": args.messages,
+        "model_calls": model.calls,
+        "all": summarize(latencies),
+        "hits": summarize(hit_latencies),
+        "misses": summarize(miss_latencies),
+        "cache": service.stats(),
+    }
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
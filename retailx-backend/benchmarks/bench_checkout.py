@@ -0,0 +1,115 @@
+"""Checkout concurrency stress test: hundreds of parallel checkouts against ONE SKU.
+
+Local mongod chahiye (alag bench database, har run pe reset; naam mein "bench" na ho
+toh --reset dena padta hai). Har checkout 1 unit
+khareedta hai; stock se zyada checkouts hone par bhi stock kabhi negative nahi jaana
+chahiye aur successful orders == sold units hone chahiye. Invariant toota toh exit 1.
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.bench_checkout --mongo-uri mongodb://localhost:27017/retailx_bench --stock 100 --checkouts 500 --workers 64
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+
+from benchmarks.common import make_product, summarize
+from benchmarks.seed import DEFAULT_URI, check_resettable
+from extensions import mongo
+from repositories.orders_repository import CheckoutError, checkout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mongo-uri", default=DEFAULT_URI)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--checkouts", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=64, help="parallel checkout threads")
+    parser.add_argument("--quantity", type=int, default=1, help="units per checkout")
+    parser.add_argument("--out", help="results JSON file")
+    parser.add_argument("--reset", action="store_true",
+                        help="non-bench DB (naam mein 'bench' nahi) ke products/orders bhi drop karo")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["MONGO_URI"] = args.mongo_uri
+    mongo.init_app(app)
+
+    with app.app_context():
+        db = mongo.db
+        try:
+            check_resettable(db, args.reset)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        db.products.drop()
+        db.orders.drop()
+        sku = make_product(random.Random(3))
+        sku.update({"stock": args.stock, "isActive": True})
+        db.products.insert_one(sku)
+
+        counts = {"ok": 0, "sold_out": 0, "error": 0}
+        latencies = []
+        lock = threading.Lock()
+
+        def one_checkout(i):
+            start = time.perf_counter()
+            try:
+                checkout(f"user{i}@example.com", [{"product_id": str(sku["_id"]), "quantity": args.quantity}])
+                outcome = "ok"
+            except CheckoutError:
+                outcome = "sold_out"
+            except Exception:
+                outcome = "error"
+            with lock:
+                counts[outcome] += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            # app context har thread mein chahiye (mongo.db usi se milta hai)
+            def run(i):
+                with app.app_context():
+                    one_checkout(i)
+            list(pool.map(run, range(args.checkouts)))
+        elapsed = time.perf_counter() - start
+
+        final_stock = db.products.find_one({"_id": sku["_id"]})["stock"]
+        orders = db.orders.count_documents({})
+        sold_units = args.stock - final_stock
+        expected_orders = min(args.checkouts, args.stock // args.quantity)
+
+        results = {
+            "initial_stock": args.stock,
+            "checkouts": args.checkouts,
+            "workers": args.workers,
+            "elapsed_s": round(elapsed, 3),
+            "orders": orders,
+            "outcomes": counts,
+            "final_stock": final_stock,
+            "checkouts_per_s": round(args.checkouts / elapsed, 1),
+            "latency": summarize(latencies),
+            "checks": {
+                "stock_never_negative": final_stock >= 0,
+                "orders_match_sold_units": orders * args.quantity == sold_units,
+                "sold_all_available": orders == expected_orders,
+                "no_errors": counts["error"] == 0,
+            },
+        }
+        db.products.drop()
+        db.orders.drop()
+
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if not all(results["checks"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""JSON serialization microbenchmark for product payloads.
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.bench_json --sizes 1000 10000 --repeat 20 --out bench_json.json
+"""
+import argparse
+import json
+
+from benchmarks.common import make_products, time_it
+from json_provider import OrjsonProvider, encode_default, orjson
+from repositories.products_repository import format_product
+
+
+def legacy_inventory(docs):
+    # Purana path: har doc copy karke _id ko str(), phir Flask ka default (sorted keys) json
+    out = []
+    for p in docs:
+        p = dict(p)
+        p["_id"] = str(p["_id"])
+        out.append(p)
+    return json.dumps(out, default=str, sort_keys=True)
+
+
+def legacy_listing(docs):
+    return json.dumps([format_product(p) for p in docs], sort_keys=True)
+
+
+def std_raw(docs):
+    return json.dumps(docs, default=encode_default)
+
+
+def orjson_raw(docs):
+    return orjson.dumps(docs, default=encode_default, option=OrjsonProvider.OPTIONS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--out", help="results JSON file")
+    args = parser.parse_args()
+
+    cases = {
+        "legacy_inventory (str loop + json)": legacy_inventory,
+        "legacy_listing (format_product + json)": legacy_listing,
+        "std provider (raw docs)": std_raw,
+    }
+    if orjson is not None:
+        cases["orjson provider (raw docs)"] = orjson_raw
+
+    results = {}
+    for size in args.sizes:
+        docs = make_products(size)
+        for name, fn in cases.items():
+            stats = time_it(lambda: fn(docs), repeat=args.repeat)
+            stats["bytes"] = len(fn(docs))
+            results[f"{size}:{name}"] = stats
+            print(f"{size:>7} docs | {name:<40} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Login-throughput benchmark: inline bcrypt vs the bounded bcrypt pool.
+
+Ek simulated WSGI server (W worker threads) pe login storm aur saath mein catalog
+requests chalti hain. Inline mode mein har login worker thread pe bcrypt chalata hai;
+pool mode mein bcrypt bounded executor pe jaata hai aur queue full ho toh turant 429.
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.bench_login --workers 16 --logins 400 --catalog 400 --rounds 12
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from benchmarks.common import summarize
+from services.executor import BoundedExecutor, PoolSaturated
+
+
+def catalog_request():
+    # Halka CPU kaam (serialization jaisa), ~1ms
+    sum(i * i for i in range(20000))
+
+
+def run(mode, args, stored_hash, password):
+    pool = BoundedExecutor(max_workers=args.pool_workers, max_queue=args.pool_queue, name="bcrypt")
+    login_latencies, catalog_latencies = [], []
+    counts = {"ok": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    def login():
+        start = time.perf_counter()
+        try:
+            if mode == "inline":
+                bcrypt.checkpw(password, stored_hash)
+            else:
+                pool.run(bcrypt.checkpw, password, stored_hash, timeout=30)
+            outcome = "ok"
+        except PoolSaturated:
+            outcome = "rejected"
+        with lock:
+            counts[outcome] += 1
+            if outcome == "ok":
+                login_latencies.append((time.perf_counter() - start) * 1000)
+
+    def catalog():
+        start = time.perf_counter()
+        catalog_request()
+        with lock:
+            catalog_latencies.append((time.perf_counter() - start) * 1000)
+
+    # Login aur catalog requests interleave karke WSGI workers pe daalo
+    jobs = []
+    for i in range(max(args.logins, args.catalog)):
+        if i < args.logins:
+            jobs.append(login)
+        if i < args.catalog:
+            jobs.append(catalog)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as server:
+        for job in jobs:
+            server.submit(job)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "elapsed_s": round(elapsed, 3),
+        "logins_ok": counts["ok"],
+        "logins_rejected_429": counts["rejected"],
+        "login_throughput_per_s": round(counts["ok"] / elapsed, 1),
+        "login": summarize(login_latencies),
+        "catalog": summarize(catalog_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=16, help="simulated WSGI worker threads")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--catalog", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--pool-workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--pool-queue", type=int, default=8)
+    parser.add_argument("--out", help="results JSON file")
+    args = parser.parse_args()
+
+    password = b"Str0ng!Passw0rd"
+    stored_hash = bcrypt.hashpw(password, bcrypt.gensalt(rounds=args.rounds))
+
+    results = [run("inline", args, stored_hash, password), run("pool", args, stored_hash, password)]
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
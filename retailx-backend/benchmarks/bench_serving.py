@@ -0,0 +1,183 @@
+"""WSGI vs ASGI serving benchmark: browsing routes at high connection counts.
+
+bench_api har connection ke liye ek thread chalata hai, jo 1000+ connections pe client hi
+bottleneck ban jaata hai. Yahan ek asyncio event loop N keep-alive connections kholta
+hai (har connection closed loop mein). Results bench_api jaise format mein hain, toh
+benchmarks.compare se dono runs compare ho jaate hain.
+
+Scenarios: products, product, search, batch (cart/wishlist jaisa 10-id lookup).
+
+Usage (retailx-backend folder se, catalog pehle benchmarks.seed se):
+    gunicorn -w 4 --threads 16 "app:create_app()" -b 127.0.0.1:5000
+    python -m benchmarks.bench_serving --base-url http://127.0.0.1:5000 --label wsgi --out wsgi.json
+
+    uvicorn asgi:create_asgi_app --factory --workers 4 --port 8000
+    python -m benchmarks.bench_serving --base-url http://127.0.0.1:8000 --label asgi --out asgi.json
+
+    python -m benchmarks.compare wsgi.json asgi.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from benchmarks.bench_api import HttpClient, SCENARIO_REQUESTS, _collect_context, _git_commit
+from benchmarks.common import summarize
+
+SCENARIOS = ("products", "product", "search", "batch")
+BATCH_SIZE = 10
+
+
+def _batch(rng, ctx):
+    ids = rng.sample(ctx["product_ids"], min(BATCH_SIZE, len(ctx["product_ids"])))
+    return "GET", "/api/products/batch?ids=" + ",".join(ids), None, None
+
+
+REQUESTS = {**{name: SCENARIO_REQUESTS[name] for name in ("products", "product", "search")}, "batch": _batch}
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client (Content-Length ya chunked responses)."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self._reader = self._writer = None
+
+    async def request(self, method, path):
+        for attempt in (1, 2):
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode())
+                return await self._read_response()
+            except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+                # Server ne keep-alive connection band kar diya: ek baar naya connection
+                self.close()
+                if attempt == 2:
+                    raise
+
+    async def _read_response(self):
+        status = int((await self._reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if status == 304 or status < 200:
+            pass
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self._reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+async def run_scenario(base_url, name, ctx, concurrency, requests, warmup, seed):
+    parts = urlsplit(base_url)
+    build = REQUESTS[name]
+    latencies, statuses = [], {}
+    connections = [Connection(parts.hostname, parts.port or 80) for _ in range(concurrency)]
+
+    async def drive(conn, rng, n, record):
+        for _ in range(n):
+            method, path, _, _ = build(rng, ctx)
+            start = time.perf_counter()
+            try:
+                status = await conn.request(method, path)
+            except Exception:
+                status = "exception"
+            if record:
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    rngs = [random.Random(seed * 1000 + i) for i in range(concurrency)]
+    # Warmup: saare connections khul jaayein (aur server caches garam), timing se bahar
+    await asyncio.gather(*(drive(c, r, max(warmup // concurrency, 1), False) for c, r in zip(connections, rngs)))
+
+    per_conn, extra = divmod(requests, concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(c, r, per_conn + (i < extra), True)
+                           for i, (c, r) in enumerate(zip(connections, rngs))))
+    elapsed = time.perf_counter() - start
+    for conn in connections:
+        conn.close()
+
+    errors = sum(n for status, n in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency": summarize(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", required=True, help="chal raha server (gunicorn ya uvicorn)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[64, 256, 1024],
+                        help="open keep-alive connections (ulimit -n itna hona chahiye)")
+    parser.add_argument("--requests", type=int, default=5000, help="per scenario per concurrency level")
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--label", help="run ka naam, e.g. wsgi / asgi (default: git commit)")
+    parser.add_argument("--out", help="results JSON file")
+    args = parser.parse_args()
+
+    # Product ids API se hi (catalog benchmarks.seed se aaya hona chahiye)
+    ctx_args = argparse.Namespace(sellers=0, seller_tokens=0, users=0)
+    ctx = _collect_context(None, HttpClient(args.base_url), ctx_args)
+
+    results = []
+    for name in args.scenarios:
+        for level in args.concurrency:
+            result = asyncio.run(run_scenario(args.base_url, name, ctx, level, args.requests, args.warmup,
+                                              seed=level))
+            print(f"{name:9s} c={level:<5d} {result['throughput_per_s']:>9.1f} req/s  "
+                  f"p50={result['latency']['p50_ms']:.1f}ms p95={result['latency']['p95_ms']:.1f}ms "
+                  f"p99={result['latency']['p99_ms']:.1f}ms errors={result['errors']}")
+            results.append(result)
+
+    report = {
+        "meta": {
+            "label": args.label or _git_commit(),
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": args.base_url,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "catalog_sample": len(ctx["product_ids"]),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
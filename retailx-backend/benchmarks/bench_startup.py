@@ -0,0 +1,124 @@
+"""Cold-start benchmark: app import + create_app() + pehli request, har run fresh process mein.
+
+Modes:
+  * eager: purana behaviour (warmup create_app ke andar + Gemini client startup pe hi)
+  * sync:  STARTUP_WARMUP=sync (indexes create_app mein, chat client lazy)
+  * lazy:  STARTUP_WARMUP=lazy (default; indexes create_app mein, in-memory warmup pehli request pe
+           background thread mein)
+
+"ready_ms" = process start se pehli request ka response; "warmup_ms" = in-memory indexes
+ready hone tak (lazy mein background mein, --wait-warmup se measure).
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.bench_startup --mongo-uri mongodb://localhost:27017/retailx_bench --runs 5 --out startup.json
+    python -m benchmarks.bench_startup --memory --modes eager lazy
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from benchmarks.common import summarize
+from benchmarks.seed import DEFAULT_URI
+
+MODES = ("eager", "sync", "lazy")
+
+
+def _child(args):
+    """Ek cold start: sirf is process ka time, JSON stdout pe."""
+    t0 = time.perf_counter()
+    config = {
+        "MONGO_URI": args.mongo_uri,
+        "JWT_SECRET_KEY": "bench-jwt-secret",
+        "SECRET_KEY": "bench-secret",
+        "STARTUP_WARMUP": "lazy" if args.child == "lazy" else "sync",
+    }
+    if args.memory:
+        import mongomock
+        import flask_pymongo
+        flask_pymongo.MongoClient = mongomock.MongoClient
+        config["DB_INDEX_SELF_CHECK"] = False
+
+    from app import create_app
+    t_import = time.perf_counter()
+    app = create_app(config)
+    if args.child == "eager":
+        # Purane routes/chat.py jaisa: model client import time pe hi
+        from routes import chat
+        try:
+            chat.chat_service.model_client.client
+        except Exception as e:
+            print(f"Model client init failed: {e}", file=sys.stderr)
+    t_app = time.perf_counter()
+    status = app.test_client().get("/").status_code
+    t_ready = time.perf_counter()
+
+    warmup_ms = app.config.get("WARMUP_MS")
+    if args.child == "lazy" and args.wait_warmup:
+        while "WARMUP_MS" not in app.config and time.perf_counter() - t_ready < 120:
+            time.sleep(0.01)
+        warmup_ms = app.config.get("WARMUP_MS")
+
+    print(json.dumps({
+        "import_ms": (t_import - t0) * 1000,
+        "create_app_ms": (t_app - t_import) * 1000,
+        "ready_ms": (t_ready - t0) * 1000,
+        "warmup_ms": warmup_ms,
+        "status": status,
+    }))
+
+
+def run_mode(mode, args):
+    cmd = [sys.executable, "-m", "benchmarks.bench_startup", "--child", mode, "--mongo-uri", args.mongo_uri]
+    if args.memory:
+        cmd.append("--memory")
+    if args.wait_warmup:
+        cmd.append("--wait-warmup")
+
+    runs, wall = [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        wall.append((time.perf_counter() - start) * 1000)
+        if out.returncode != 0:
+            raise SystemExit(f"{mode} run failed:\n{out.stderr}")
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    result = {"mode": mode, "runs": args.runs, "process_wall": summarize(wall)}
+    for key in ("import_ms", "create_app_ms", "ready_ms", "warmup_ms"):
+        values = [r[key] for r in runs if r[key] is not None]
+        if values:
+            result[key.replace("_ms", "")] = summarize(values)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default=DEFAULT_URI)
+    parser.add_argument("--memory", action="store_true", help="mongomock stand-in (pip install mongomock)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--wait-warmup", action="store_true", help="lazy mode mein background warmup ka time bhi lo")
+    parser.add_argument("--out", help="results JSON file")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args)
+        return
+
+    results = []
+    for mode in args.modes:
+        r = run_mode(mode, args)
+        results.append(r)
+        print(f"{mode:6s} ready p50 {r['ready']['p50_ms']:8.1f} ms  "
+              f"create_app p50 {r['create_app']['p50_ms']:8.1f} ms  import p50 {r['import']['p50_ms']:8.1f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Typeahead (/api/search/suggest) latency under concurrent load (offline, no Mongo needed).
+
+Synthetic catalog pe SuggestIndex build hota hai, phir W threads users ki tarah
+har query ko letter-by-letter type karte hain (har prefix ek suggest call, keystrokes
+ke beech --keystroke-ms ka gap), beech beech mein catalog writes bhi aate hain.
+p99 budget se upar gaya toh exit 1.
+
+--keystroke-ms 0 pure CPU closed loop hai: tab p99 mostly GIL handoff (switch
+interval ~5ms) dikhata hai, suggest ka apna time nahi.
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.bench_suggest --products 100000 --workers 64 --queries 2000 --budget-ms 5
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import BRANDS, CATEGORIES, TAGS, make_product, make_products, summarize
+from services.suggest_index import SuggestIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=64, help="concurrent typists")
+    parser.add_argument("--keystroke-ms", type=float, default=30, help="gap between keystrokes")
+    parser.add_argument("--queries", type=int, default=2000, help="typed queries (each = many prefixes)")
+    parser.add_argument("--write-every", type=int, default=50, help="catalog write every N queries, 0 = never")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="p99 latency budget per suggest call")
+    parser.add_argument("--out", help="results JSON file")
+    args = parser.parse_args()
+
+    products = make_products(args.products)
+    index = SuggestIndex()
+    start = time.perf_counter()
+    index.rebuild(products)
+    build_s = time.perf_counter() - start
+
+    rng = random.Random(5)
+    # Zipf-ish: popular words zyada type hote hain
+    vocab = [b.lower() for b in BRANDS] + [c.lower() for c in CATEGORIES] + TAGS
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    queries = [rng.choices(vocab, weights)[0] for _ in range(args.queries)]
+
+    latencies = []
+    lock = threading.Lock()
+    write_rng = random.Random(9)
+
+    def type_query(i, query):
+        if args.write_every and i % args.write_every == 0:
+            with lock:
+                product = make_product(write_rng)
+            index.upsert(product)
+        samples = []
+        for n in range(1, len(query) + 1):
+            if args.keystroke_ms:
+                time.sleep(args.keystroke_ms / 1000)
+            t = time.perf_counter()
+            index.suggest(query[:n])
+            samples.append((time.perf_counter() - t) * 1000)
+        with lock:
+            latencies.extend(samples)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(lambda pair: type_query(*pair), enumerate(queries)))
+    elapsed = time.perf_counter() - start
+
+    stats = summarize(latencies)
+    results = {
+        "products": args.products,
+        "entries": len(index),
+        "build_s": round(build_s, 3),
+        "workers": args.workers,
+        "keystroke_ms": args.keystroke_ms,
+        "suggest_calls": len(latencies),
+        "calls_per_s": round(len(latencies) / elapsed, 1),
+        "latency": stats,
+        "budget_ms": args.budget_ms,
+        "within_budget": stats["p99_ms"] <= args.budget_ms,
+    }
+    print(json.dumps(results, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    if not results["within_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
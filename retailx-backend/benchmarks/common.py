@@ -0,0 +1,117 @@
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+# Benchmarks ke shared helpers: synthetic products aur timing stats
+
+CATEGORIES = ["Skincare", "Haircare", "Makeup", "Fragrance", "Bath & Body", "Men's Grooming"]
+BRANDS = ["Lakme", "Himalaya", "Mamaearth", "Nivea", "Maybelline", "Biotique", "Plum", "Cetaphil"]
+TAGS = ["organic", "vegan", "matte", "hydrating", "oily skin", "dry skin", "acne", "sulphate free",
+        "spf", "long lasting", "herbal", "fragrance free"]
+STYLES = ["Minimal", "Glam", "Natural", "Everyday", "Party"]
+CONCERNS = ["acne", "dryness", "frizz", "dark spots", "oiliness", "sensitivity"]
+
+
+def make_product(rng, seller_email="seller0@example.com"):
+    price = round(rng.uniform(99, 2999), 2)
+    discount = rng.choice([0, 5, 10, 15, 20, 30])
+    category = rng.choice(CATEGORIES)
+    brand = rng.choice(BRANDS)
+    return {
+        "_id": ObjectId(),
+        "name": f"{brand} {rng.choice(TAGS).title()} {category} {rng.randint(1, 999)}",
+        "description": " ".join(rng.choices(TAGS + CONCERNS, k=25)),
+        "category": category,
+        "subCategory": rng.choice(["Face", "Body", "Lips", "Eyes", "Hair"]),
+        "brand": brand,
+        "price": price,
+        "discount": discount,
+        "finalPrice": round(price - price * discount / 100, 2),
+        "stock": rng.randint(0, 500),
+        "rating": round(rng.uniform(1, 5), 1),
+        "reviewsCount": rng.randint(0, 5000),
+        "imageURL": f"https://cdn.example.com/p/{rng.randint(1, 10**6)}.jpg",
+        "seller_email": seller_email,
+        "isActive": rng.random() > 0.05,
+        "tags": rng.sample(TAGS, k=3),
+        "highlights": [f"Highlight {i}" for i in range(4)],
+        "specs": {"Volume": f"{rng.choice([50, 100, 200])} ml", "Skin Type": rng.choice(["All", "Oily", "Dry"])},
+        "aiMetadata": {"style": rng.choice(STYLES), "concern": rng.choice(CONCERNS)},
+        "images": [f"https://cdn.example.com/p/{rng.randint(1, 10**6)}_{i}.jpg" for i in range(4)],
+        "createdAt": datetime(2025, 1, 1) + timedelta(minutes=rng.randint(0, 500000)),
+        "version": 1,
+    }
+
+
+def seller_email(i):
+    return f"seller{i}@example.com"
+
+
+def user_email(i):
+    return f"user{i}@example.com"
+
+
+def iter_products(n, sellers=50, seed=42):
+    """Lazily yield n products spread over `sellers` sellers (1M docs memory mein nahi rakhne)."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield make_product(rng, seller_email=seller_email(i % sellers))
+
+
+def make_products(n, seed=42):
+    return list(iter_products(n, seed=seed))
+
+
+def make_seller(i, password_hash):
+    return {
+        "email": seller_email(i),
+        "password": password_hash,
+        "storeName": f"Bench Store {i}",
+        "registrationId": f"REG{i:06d}",
+        "role": "seller",
+        "businessAddress": "",
+        "contactNumber": "",
+        "gstin": "",
+        "businessType": "Individual",
+        "createdAt": datetime(2025, 1, 1) + timedelta(hours=i),
+    }
+
+
+def make_user(rng, i, password_hash):
+    return {
+        "email": user_email(i),
+        "password": password_hash,
+        "preferences": rng.sample(CATEGORIES, k=rng.randint(0, 3)),
+        "role": "user",
+    }
+
+
+def time_it(fn, repeat=20):
+    """Run fn `repeat` times; returns timing stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+    }
@@ -0,0 +1,73 @@
+"""Compare two bench_api result files (e.g. main vs feature branch) and flag regressions.
+
+Har (scenario, concurrency) ke liye throughput aur p50/p95/p99 ka % change. Throughput
+--threshold % se zyada gira ya p95/p99 utna badha toh regression, exit 1 (CI mein use
+kar sakte ho).
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.compare before.json after.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report.get("meta", {}), {(r["scenario"], r["concurrency"]): r for r in report["results"]}
+
+
+def _change(old, new):
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare(base, head, threshold):
+    """Rows for every (scenario, concurrency) present in both runs."""
+    rows = []
+    for key in sorted(set(base) & set(head)):
+        old, new = base[key], head[key]
+        row = {
+            "scenario": key[0],
+            "concurrency": key[1],
+            "throughput_pct": round(_change(old["throughput_per_s"], new["throughput_per_s"]), 1),
+        }
+        for p in ("p50_ms", "p95_ms", "p99_ms"):
+            row[f"{p}_pct"] = round(_change(old["latency"][p], new["latency"][p]), 1)
+        row["regression"] = (
+            row["throughput_pct"] < -threshold
+            or row["p95_ms_pct"] > threshold
+            or row["p99_ms_pct"] > threshold
+            or new["errors"] > old["errors"]
+        )
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed % change")
+    parser.add_argument("--out", help="comparison JSON file")
+    args = parser.parse_args()
+
+    base_meta, base = _load(args.base)
+    head_meta, head = _load(args.head)
+    rows = compare(base, head, args.threshold)
+
+    print(f"{base_meta.get('label')} -> {head_meta.get('label')}  (threshold {args.threshold}%)")
+    for r in rows:
+        flag = "REGRESSION" if r["regression"] else ""
+        print(f"{r['scenario']:17s} c={r['concurrency']:<4d} thr {r['throughput_pct']:+7.1f}%  "
+              f"p50 {r['p50_ms_pct']:+7.1f}%  p95 {r['p95_ms_pct']:+7.1f}%  p99 {r['p99_ms_pct']:+7.1f}%  {flag}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"base": base_meta, "head": head_meta, "threshold": args.threshold, "rows": rows}, f, indent=2)
+    if any(r["regression"] for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
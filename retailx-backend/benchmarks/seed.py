@@ -0,0 +1,123 @@
+"""Synthetic catalog generator: products, sellers and users for benchmarks.
+
+Local mongod ke alag bench database mein data daalta hai (bench_api --memory
+in-process mongomock mein isi seed() ko use karta hai). Products batches mein
+generate + insert hote hain, toh 1M products bhi memory mein ek saath nahi aate. Saare users/sellers ka password
+BENCH_PASSWORD hai (ek hi bcrypt hash, app ke BCRYPT_LOG_ROUNDS cost pe, taaki login
+pe rehash na ho).
+
+Seed pehle purani collections drop karta hai, par sirf bench database pe (naam mein
+"bench" ho); kisi aur DB pe drop ke liye --reset explicitly dena padta hai.
+
+Usage (retailx-backend folder se):
+    python -m benchmarks.seed --mongo-uri mongodb://localhost:27017/retailx_bench --products 100000 --sellers 500 --users 10000
+"""
+import argparse
+import json
+import os
+import random
+import time
+from itertools import islice
+
+import bcrypt
+
+from benchmarks.common import iter_products, make_seller, make_user
+
+BENCH_PASSWORD = "Bench@12345"
+DEFAULT_URI = "mongodb://localhost:27017/retailx_bench"
+
+SEEDED_COLLECTIONS = ("products", "sellers", "users", "carts", "orders", "seller_stats", "admin_stats")
+
+
+def db_name(mongo_uri):
+    return mongo_uri.rsplit("/", 1)[-1].split("?", 1)[0] or "retailx_bench"
+
+
+def is_bench_db(name):
+    return "bench" in name.lower()
+
+
+def check_resettable(db, force=False):
+    """Bench scripts drop se pehle: non-bench DB pe ValueError jab tak force (--reset) na ho."""
+    if not force and not is_bench_db(db.name):
+        raise ValueError(
+            f"'{db.name}' bench database nahi lagta; collections drop karne ke liye --reset do"
+        )
+
+
+def connect(mongo_uri=DEFAULT_URI):
+    from pymongo import MongoClient
+    return MongoClient(mongo_uri)[db_name(mongo_uri)]
+
+
+def _batches(iterable, size):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def seed(db, products=10000, sellers=50, users=1000, rounds=None, batch_size=5000, seed=42, reset=True,
+         force_reset=False):
+    """Fill db with a synthetic catalog; returns counts and timings.
+
+    reset non-bench DB pe ValueError deta hai jab tak force_reset na ho (galat URI pe
+    asli data drop na ho jaaye).
+    """
+    if reset:
+        check_resettable(db, force_reset)
+
+    rounds = rounds or int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+    password_hash = bcrypt.hashpw(BENCH_PASSWORD.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+    rng = random.Random(seed)
+
+    if reset:
+        for name in SEEDED_COLLECTIONS:
+            db[name].drop()
+
+    start = time.perf_counter()
+    for chunk in _batches(iter_products(products, sellers=sellers, seed=seed), batch_size):
+        db.products.insert_many(chunk, ordered=False)
+    products_s = time.perf_counter() - start
+
+    for chunk in _batches((make_seller(i, password_hash) for i in range(sellers)), batch_size):
+        db.sellers.insert_many(chunk, ordered=False)
+    for chunk in _batches((make_user(rng, i, password_hash) for i in range(users)), batch_size):
+        db.users.insert_many(chunk, ordered=False)
+
+    return {
+        "products": products,
+        "sellers": sellers,
+        "users": users,
+        "bcrypt_rounds": rounds,
+        "products_insert_s": round(products_s, 3),
+        "total_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mongo-uri", default=DEFAULT_URI)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--sellers", type=int, default=50)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, help="bcrypt cost (default: BCRYPT_LOG_ROUNDS ya 12)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true",
+                        help="non-bench DB (naam mein 'bench' nahi) ki collections bhi drop karo")
+    args = parser.parse_args()
+
+    db = connect(args.mongo_uri)
+    try:
+        stats = seed(db, args.products, args.sellers, args.users, args.rounds, args.batch_size, args.seed,
+                     force_reset=args.reset)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
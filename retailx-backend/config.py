@@ -1,8 +1,89 @@
+import os
 
+from dotenv import load_dotenv
+
+# .env yahin ek baar load hota hai (create_app se pehle config import hota hai)
+load_dotenv()
+
+
+def _int(name, default):
+    return int(os.getenv(name, default))
 
-import os
 
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-    MONGO_URI = os.getenv("MONGO_URI")
\ No newline at end of file
+    MONGO_URI = os.getenv("MONGO_URI")
+    MONGO_DBNAME = "retailxDB"
+
+    JWT_TOKEN_LOCATION = ["headers"]
+    JWT_HEADER_NAME = "Authorization"
+    JWT_HEADER_TYPE = "Bearer"
+
+    # 🍃 Mongo client pool (har worker process ka apna client, post-fork bante hi)
+    MONGO_MAX_POOL_SIZE = _int("MONGO_MAX_POOL_SIZE", 50)
+    MONGO_MIN_POOL_SIZE = _int("MONGO_MIN_POOL_SIZE", 0)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = _int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)
+    MONGO_CONNECT_TIMEOUT_MS = _int("MONGO_CONNECT_TIMEOUT_MS", 5000)
+    MONGO_SOCKET_TIMEOUT_MS = _int("MONGO_SOCKET_TIMEOUT_MS", 30000)
+    # Pool khaali ho toh connection ke liye itna hi wait, phir error (request hang nahi hoti)
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = _int("MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000)
+
+    # Startup kaam (indexes provision + in-memory indexes build):
+    #   "lazy": indexes create_app mein, in-memory indexes har worker ki pehli request pe
+    #           background thread mein (fork ke baad, fast boot)
+    #   "sync": dono create_app ke andar hi
+    #   "off":  kuch nahi (scripts / tests)
+    # Index conflict / COLLSCAN self-check fail ho toh "lazy" aur "sync" dono mein app start nahi hoga.
+    STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "lazy")
+
+    # Catalog GET responses ka Cache-Control max-age (ETag revalidation ke saath)
+    HTTP_CACHE_MAX_AGE = _int("HTTP_CACHE_MAX_AGE", 30)
+
+    # JSON provider: "orjson" (default agar installed hai) ya "std"
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER")
+
+    # ⚡ Product cache (PRODUCT_CACHE_URL=redis://... do toh workers shared cache use karenge)
+    PRODUCT_CACHE_URL = os.getenv("PRODUCT_CACHE_URL")
+    PRODUCT_CACHE_SIZE = _int("PRODUCT_CACHE_SIZE", 2048)
+    PRODUCT_CACHE_TTL = _int("PRODUCT_CACHE_TTL", 60)
+
+    # 🔐 bcrypt: cost (BCRYPT_LOG_ROUNDS) badlo toh purane hashes login pe rehash ho jaate hain
+    BCRYPT_LOG_ROUNDS = _int("BCRYPT_LOG_ROUNDS", 12)
+    AUTH_POOL_WORKERS = _int("AUTH_POOL_WORKERS", 0) or None  # default: CPU count
+    AUTH_POOL_QUEUE = _int("AUTH_POOL_QUEUE", 64)
+    AUTH_HASH_TIMEOUT = float(os.getenv("AUTH_HASH_TIMEOUT", 10))
+
+    # Startup pe hot queries ka explain() check, COLLSCAN mila toh app start nahi hoga
+    DB_INDEX_SELF_CHECK = os.getenv("DB_INDEX_SELF_CHECK", "1") == "1"
+
+    # Multiple workers ke in-memory indexes (search, chat retrieval) sync rakhne ke liye periodic rebuild (0 = off)
+    SEARCH_INDEX_REFRESH_SECONDS = _int("SEARCH_INDEX_REFRESH_SECONDS", 300)
+    # 🤖 Chat retrieval: hashed feature buckets (sparse, memory dim pe depend nahi karti) aur
+    # is se kam cosine score wale matches noise hain
+    RETRIEVAL_DIM = _int("RETRIEVAL_DIM", 1 << 18)
+    RETRIEVAL_MIN_SCORE = float(os.getenv("RETRIEVAL_MIN_SCORE", 0.05))
+    # 🧩 Har product ke kitne similar products precompute hon
+    SIMILAR_TOP_K = _int("SIMILAR_TOP_K", 24)
+    # Similar-products table poora rebuild mehenga hai, writes pe incremental update hota hi hai
+    SIMILAR_PRODUCTS_REFRESH_SECONDS = _int("SIMILAR_PRODUCTS_REFRESH_SECONDS", 900)
+    FEED_REFRESH_SECONDS = _int("FEED_REFRESH_SECONDS", 300)
+    SELLER_STATS_RECONCILE_SECONDS = _int("SELLER_STATS_RECONCILE_SECONDS", 3600)
+    ADMIN_STATS_REFRESH_SECONDS = _int("ADMIN_STATS_REFRESH_SECONDS", 900)
+
+    # 📈 /metrics (Prometheus text): route latency, Mongo command timing, spans
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+    # 🌊 asgi.py: baaki (sync) Flask routes ke liye thread pool size
+    ASGI_WSGI_THREADS = _int("ASGI_WSGI_THREADS", 16)
+
+    # 🤖 Chat (Gemini client pehli chat request pe banta hai, import pe nahi)
+    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    # CHAT_MODEL_BACKEND=stub se bina Gemini ke offline chala sakte hain
+    CHAT_MODEL_BACKEND = os.getenv("CHAT_MODEL_BACKEND", "gemini")
+    CHAT_MAX_CONCURRENCY = _int("CHAT_MAX_CONCURRENCY", 8)
+    CHAT_MAX_QUEUE = _int("CHAT_MAX_QUEUE", 16)
+    CHAT_CACHE_URL = os.getenv("CHAT_CACHE_URL")
+    CHAT_CONTEXT_CACHE_TTL = _int("CHAT_CONTEXT_CACHE_TTL", 300)
+    CHAT_REPLY_CACHE_TTL = _int("CHAT_REPLY_CACHE_TTL", 600)
+    CHAT_TIMEOUT_SECONDS = float(os.getenv("CHAT_TIMEOUT_SECONDS", 30))
@@ -0,0 +1,75 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from bson import Decimal128, ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson optional hai, na ho toh stdlib provider
+    orjson = None
+
+# App-wide JSON provider
+# ObjectId / datetime / Decimal natively encode hote hain, toh routes raw Mongo
+# documents seedha jsonify kar sakte hain (_id ko str() karne wale loops ki zaroorat nahi).
+
+
+def encode_default(o):
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, datetime):
+        # DB mein utcnow() naive save hota hai, usko UTC maan ke ISO format
+        if o.tzinfo is None:
+            o = o.replace(tzinfo=timezone.utc)
+        return o.isoformat()
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, Decimal128):
+        o = o.to_decimal()
+    if isinstance(o, Decimal):
+        return float(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class StdJSONProvider(DefaultJSONProvider):
+    default = staticmethod(encode_default)
+    sort_keys = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=encode_default, option=self.OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # bytes seedha response mein, str decode/encode ka extra round trip nahi
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=encode_default, option=self.OPTIONS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def dumps_bytes(obj):
+    """Same encoding bina Flask app ke (asgi routes ke liye)."""
+    if orjson:
+        return orjson.dumps(obj, default=encode_default, option=OrjsonProvider.OPTIONS)
+    return json.dumps(obj, default=encode_default, separators=(",", ":")).encode()
+
+
+PROVIDERS = {
+    "orjson": OrjsonProvider,
+    "std": StdJSONProvider,
+}
+
+
+def init_json(app):
+    """JSON_PROVIDER config se provider chuno ("orjson" default, na mile toh "std")."""
+    name = app.config.get("JSON_PROVIDER") or ("orjson" if orjson else "std")
+    if name == "orjson" and orjson is None:
+        print("⚠️ orjson installed nahi hai, stdlib JSON provider use ho raha hai")
+        name = "std"
+    app.json = PROVIDERS[name](app)
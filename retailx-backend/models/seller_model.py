@@ -1,5 +1,6 @@
-from extensions import mongo, bcrypt
+from extensions import mongo
 from datetime import datetime
+from services.password_hashing import verify_and_upgrade
 
 class Seller:
     @staticmethod
@@ -24,8 +25,11 @@ class Seller:
         return mongo.db.sellers.insert_one(seller_data)
 
     @staticmethod
-    def verify_password(stored_password, provided_password):
-        return bcrypt.check_password_hash(stored_password, provided_password)
+    def verify_password(seller, provided_password):
+        # bcrypt pool pe check; cost badli ho toh naya hash background mein save
+        def save_hash(new_hash):
+            mongo.db.sellers.update_one({"_id": seller["_id"]}, {"$set": {"password": new_hash}})
+        return verify_and_upgrade(seller["password"], provided_password, save_hash)
 
 
 
@@ -0,0 +1,134 @@
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from extensions import mongo
+from services import scheduler
+
+# Admin dashboard ke platform-wide stats: materialized snapshots (admin_stats collection)
+# Har snapshot ek aggregation pipeline se banta hai aur _id = snapshot naam ke saath
+# store hota hai. Dashboard load sirf find_one hai; heavy aggregation schedule pe ya
+# POST /api/admin/stats/refresh pe chalti hai.
+
+TOP_SELLERS = 50
+SIGNUP_DAYS = 90
+
+
+def _value_expr():
+    return {"$multiply": [{"$ifNull": ["$stock", 0]}, {"$ifNull": ["$finalPrice", 0]}]}
+
+
+def build_catalog_snapshot(db):
+    """Products per category/seller, active vs inactive, inventory value: ONE $facet pass."""
+    active = {"$cond": [{"$eq": ["$isActive", True]}, 1, 0]}
+    pipeline = [{"$facet": {
+        "totals": [{"$group": {
+            "_id": None,
+            "products": {"$sum": 1},
+            "active": {"$sum": active},
+            "stock": {"$sum": {"$ifNull": ["$stock", 0]}},
+            "inventoryValue": {"$sum": _value_expr()},
+            "outOfStock": {"$sum": {"$cond": [{"$lte": [{"$ifNull": ["$stock", 0]}, 0]}, 1, 0]}},
+        }}],
+        "byCategory": [
+            {"$group": {"_id": {"$ifNull": ["$category", "Other"]}, "products": {"$sum": 1},
+                        "active": {"$sum": active}, "inventoryValue": {"$sum": _value_expr()}}},
+            {"$sort": {"products": -1, "_id": 1}},
+        ],
+        "bySeller": [
+            {"$group": {"_id": "$seller_email", "products": {"$sum": 1},
+                        "active": {"$sum": active}, "inventoryValue": {"$sum": _value_expr()}}},
+            {"$sort": {"products": -1, "_id": 1}},
+            {"$limit": TOP_SELLERS},
+        ],
+    }}]
+    doc = next(db.products.aggregate(pipeline), {})
+    totals = (doc.get("totals") or [{}])[0]
+    products = totals.get("products", 0)
+
+    def rows(key, label):
+        return [{label: r["_id"], "products": r["products"], "active": r["active"],
+                 "inventoryValue": round(r["inventoryValue"], 2)} for r in doc.get(key, [])]
+
+    return {
+        "products": products,
+        "active": totals.get("active", 0),
+        "inactive": products - totals.get("active", 0),
+        "totalStock": totals.get("stock", 0),
+        "outOfStock": totals.get("outOfStock", 0),
+        "inventoryValue": round(totals.get("inventoryValue", 0), 2),
+        "byCategory": rows("byCategory", "category"),
+        "topSellers": rows("bySeller", "seller"),
+    }
+
+
+def _signups_per_day(collection, since):
+    # users ke docs mein createdAt nahi hai, ObjectId ka timestamp hi signup time hai
+    pipeline = [
+        {"$match": {"_id": {"$gte": ObjectId.from_datetime(since)}}},
+        {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": {"$toDate": "$_id"}}},
+                    "count": {"$sum": 1}}},
+    ]
+    return {row["_id"]: row["count"] for row in collection.aggregate(pipeline)}
+
+
+def build_signups_snapshot(db):
+    """Daily user/seller signups for the last SIGNUP_DAYS days (_id range scan, no full count)."""
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    since = today - timedelta(days=SIGNUP_DAYS - 1)
+    users = _signups_per_day(db.users, since)
+    sellers = _signups_per_day(db.sellers, since)
+    days = [(since + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(SIGNUP_DAYS)]
+    return {
+        # Collection metadata se, scan nahi
+        "totalUsers": db.users.estimated_document_count(),
+        "totalSellers": db.sellers.estimated_document_count(),
+        "days": [{"date": day, "users": users.get(day, 0), "sellers": sellers.get(day, 0)} for day in days],
+    }
+
+
+SNAPSHOTS = {
+    "catalog": build_catalog_snapshot,
+    "signups": build_signups_snapshot,
+}
+
+
+def refresh_snapshot(name):
+    start = time.perf_counter()
+    data = SNAPSHOTS[name](mongo.db)
+    doc = {
+        "data": data,
+        "refreshedAt": datetime.utcnow(),
+        "buildMs": round((time.perf_counter() - start) * 1000, 1),
+    }
+    mongo.db.admin_stats.replace_one({"_id": name}, doc, upsert=True)
+    return {"_id": name, **doc}
+
+
+def refresh_all():
+    return [refresh_snapshot(name) for name in SNAPSHOTS]
+
+
+def get_snapshot(name):
+    """Stored snapshot (one find_one); built on first request if it doesn't exist yet."""
+    doc = mongo.db.admin_stats.find_one({"_id": name})
+    if doc is None:
+        doc = refresh_snapshot(name)
+    return {"name": name, "refreshedAt": doc["refreshedAt"], "buildMs": doc.get("buildMs"), **doc["data"]}
+
+
+def init_admin_stats(app):
+    interval = app.config.get("ADMIN_STATS_REFRESH_SECONDS")
+    try:
+        # Startup pe sirf missing / purane snapshots banao, har restart pe full aggregation nahi
+        cutoff = datetime.utcnow() - timedelta(seconds=interval or 0)
+        fresh = {d["_id"] for d in mongo.db.admin_stats.find({"refreshedAt": {"$gte": cutoff}}, {"_id": 1})}
+        stale = [name for name in SNAPSHOTS if name not in fresh]
+        for name in stale:
+            refresh_snapshot(name)
+        print(f"✅ Admin stats ready ({len(stale)} snapshots refreshed)")
+    except Exception as e:
+        print(f"❌ Admin stats refresh failed: {e}")
+
+    if interval:
+        scheduler.every(interval, refresh_all, name="admin-stats-refresh")
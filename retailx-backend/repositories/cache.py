@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Read-through cache for hot product reads
+# Default in-process LRU + TTL hai; PRODUCT_CACHE_URL (redis://...) do toh saare
+# workers ek hi shared cache use karte hain.
+#
+# Listing keys mein ek "generation" number hota hai. Write pe generation bump karo
+# aur us scope ki saari purani keys apne aap unreachable ho jaati hain. Delete ke ulat
+# isme stale-set race nahi: write se pehle padha gaya doc purani generation ki key pe
+# hi save hota hai, jo bump ke baad koi nahi padhta.
+
+
+class LRUTTLCache:
+    # In-process: calls sirf memory, async code seedha call kar sakta hai
+    remote = False
+
+    def __init__(self, max_size=2048, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()   # key -> (expires_at, value)
+        self._generations = {}       # generations evict nahi hone chahiye, alag rakhe hain
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (ttl or self.ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get_many(self, keys):
+        """{key: value} for the keys that are cached (misses are left out)."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items, ttl=None):
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def generation(self, scope):
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def generations(self, scopes):
+        with self._lock:
+            return [self._generations.get(scope, 0) for scope in scopes]
+
+    def bump(self, scope):
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class RedisCache:
+    """Same interface as LRUTTLCache, shared across workers.
+
+    Eviction redis ki maxmemory-policy se hoti hai; volatile-lru rakho taaki bina TTL
+    wali generation keys kabhi evict na hon.
+    """
+
+    # Har call network round trip hai: async code isse thread pool pe chalata hai
+    remote = True
+
+    def __init__(self, url, ttl=60, prefix="retailx:"):
+        import redis  # optional dependency, sirf shared backend ke liye
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(self.prefix + key, json.dumps(value, default=str), ex=ttl or self.ttl)
+
+    def get_many(self, keys):
+        # Ek MGET round trip, N GET nahi
+        keys = list(keys)
+        if not keys:
+            return {}
+        found = {}
+        for key, raw in zip(keys, self._client.mget([self.prefix + k for k in keys])):
+            if raw is not None:
+                found[key] = json.loads(raw)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items, ttl=None):
+        pipe = self._client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self.prefix + key, json.dumps(value, default=str), ex=ttl or self.ttl)
+        pipe.execute()
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+    def generation(self, scope):
+        return int(self._client.get(self.prefix + "gen:" + scope) or 0)
+
+    def generations(self, scopes):
+        scopes = list(scopes)
+        if not scopes:
+            return []
+        return [int(raw or 0) for raw in self._client.mget([self.prefix + "gen:" + s for s in scopes])]
+
+    def bump(self, scope):
+        self._client.incr(self.prefix + "gen:" + scope)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def create_cache(url=None, max_size=2048, ttl=60):
+    if url:
+        return RedisCache(url, ttl=ttl)
+    return LRUTTLCache(max_size=max_size, ttl=ttl)
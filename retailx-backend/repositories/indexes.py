@@ -0,0 +1,126 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.collation import Collation
+
+# Category lookups case-insensitive hain ("Skincare" == "skincare"), isliye regex ki
+# jagah is collation ke saath equality match karte hain. Query aur index dono pe same
+# collation hona chahiye, warna index use nahi hoga. Brand filter bhi isi collation se
+# case-insensitive match hota hai (in-memory search ke facets jaisa).
+CATEGORY_COLLATION = Collation(locale="en", strength=2)
+
+# 🗂️ Declarative index list: collection -> indexes
+INDEXES = {
+    "products": [
+        {"keys": [("isActive", ASCENDING), ("category", ASCENDING), ("_id", ASCENDING)],
+         "name": "active_category_id_ci", "collation": CATEGORY_COLLATION},
+        {"keys": [("seller_email", ASCENDING)], "name": "seller_email"},
+        # Keyset pagination: har sort key ke baad _id tie-breaker (dono directions mein chal jaata hai)
+        {"keys": [("isActive", ASCENDING), ("_id", ASCENDING)], "name": "active_id"},
+        {"keys": [("isActive", ASCENDING), ("finalPrice", ASCENDING), ("_id", ASCENDING)],
+         "name": "active_price"},
+        {"keys": [("isActive", ASCENDING), ("rating", ASCENDING), ("_id", ASCENDING)],
+         "name": "active_rating"},
+        {"keys": [("isActive", ASCENDING), ("category", ASCENDING), ("finalPrice", ASCENDING), ("_id", ASCENDING)],
+         "name": "active_category_price_ci", "collation": CATEGORY_COLLATION},
+        {"keys": [("isActive", ASCENDING), ("category", ASCENDING), ("rating", ASCENDING), ("_id", ASCENDING)],
+         "name": "active_category_rating_ci", "collation": CATEGORY_COLLATION},
+    ],
+    "users": [
+        {"keys": [("email", ASCENDING)], "name": "email"},
+    ],
+    "sellers": [
+        {"keys": [("email", ASCENDING)], "name": "email"},
+    ],
+    "admins": [
+        {"keys": [("email", ASCENDING)], "name": "email"},
+    ],
+    "carts": [
+        {"keys": [("user_email", ASCENDING)], "name": "user_email", "unique": True},
+    ],
+    "orders": [
+        {"keys": [("user_email", ASCENDING), ("createdAt", DESCENDING)], "name": "user_recent"},
+    ],
+    "import_jobs": [
+        # start_import ka "is seller ka koi job chal raha hai?" check
+        {"keys": [("seller_email", ASCENDING), ("status", ASCENDING)], "name": "seller_status"},
+    ],
+}
+
+# Purane indexes jinke naam ab naye keys ke saath use hote the / replace ho chuke hain.
+# Same naam, alag keys pe create_indexes IndexKeySpecsConflict (code 86) deta hai, toh pehle drop.
+RETIRED_INDEXES = {
+    "products": ["active_category_ci"],   # (isActive, category) -> active_category_id_ci
+}
+
+# Hot queries jo kabhi COLLSCAN pe nahi girni chahiye: (collection, filter, collation, sort)
+# Sorted queries ke liye in-memory SORT stage bhi failure hai.
+HOT_QUERIES = [
+    ("products", {"isActive": True, "category": "skincare"}, CATEGORY_COLLATION, None),
+    ("products", {"isActive": True}, None, [("_id", ASCENDING)]),
+    ("products", {"isActive": True, "finalPrice": {"$gte": 100, "$lte": 500}}, None,
+     [("finalPrice", ASCENDING), ("_id", ASCENDING)]),
+    ("products", {"isActive": True}, None, [("rating", DESCENDING), ("_id", DESCENDING)]),
+    ("products", {"isActive": True, "category": "skincare"}, CATEGORY_COLLATION,
+     [("finalPrice", DESCENDING), ("_id", DESCENDING)]),
+    ("products", {"seller_email": "seller@example.com"}, None, None),
+    ("users", {"email": "user@example.com"}, None, None),
+    ("sellers", {"email": "seller@example.com"}, None, None),
+    ("admins", {"email": "admin@example.com"}, None, None),
+    ("carts", {"user_email": "user@example.com"}, None, None),
+    ("orders", {"user_email": "user@example.com"}, None, [("createdAt", DESCENDING)]),
+]
+
+
+class QueryPlanError(RuntimeError):
+    pass
+
+
+def ensure_indexes(db):
+    for collection, names in RETIRED_INDEXES.items():
+        existing = db[collection].index_information()
+        for name in names:
+            if name in existing:
+                db[collection].drop_index(name)
+
+    for collection, specs in INDEXES.items():
+        models = [
+            IndexModel(spec["keys"], **{k: v for k, v in spec.items() if k != "keys"})
+            for spec in specs
+        ]
+        db[collection].create_indexes(models)
+
+
+def _plan_stages(plan):
+    """Yield every stage name in an explain() plan tree."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def check_query_plans(db):
+    """explain() every hot query and raise QueryPlanError on a COLLSCAN or blocking SORT."""
+    failures = []
+    for collection, query, collation, sort in HOT_QUERIES:
+        cursor = db[collection].find(query)
+        if collation is not None:
+            cursor = cursor.collation(collation)
+        if sort is not None:
+            cursor = cursor.sort(sort)
+        winning_plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = set(_plan_stages(winning_plan))
+        if "COLLSCAN" in stages or (sort is not None and "SORT" in stages):
+            failures.append(f"{collection} {query} sort={sort}")
+
+    if failures:
+        raise QueryPlanError("Hot queries without a usable index: " + "; ".join(failures))
+
+
+def provision_indexes(db, self_check=True):
+    ensure_indexes(db)
+    if self_check:
+        check_query_plans(db)
+    print("✅ Mongo indexes provisioned")
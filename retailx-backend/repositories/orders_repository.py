@@ -0,0 +1,208 @@
+import math
+from datetime import datetime
+
+from bson import ObjectId
+
+from extensions import mongo
+from repositories.products_repository import release_stock, reserve_stock
+
+# 🛒 Server-side cart + checkout
+# Cart mein sirf {product_id, quantity} rehta hai; price/stock har baar DB se ek
+# $in query mein revalidate hote hain (client ka bheja price kabhi trust nahi hota).
+# Checkout har line ka stock conditional atomic $inc se reserve karta hai, koi line
+# fail ho toh pehle se reserved lines wapas release ho jaati hain -> oversell nahi.
+
+MAX_CART_LINES = 100
+MAX_LINE_QUANTITY = 20
+
+# Cart revalidation ko sirf itne fields chahiye
+CART_PRODUCT_PROJECTION = {
+    "name": 1, "brand": 1, "price": 1, "discount": 1, "finalPrice": 1, "stock": 1,
+    "isActive": 1, "imageURL": 1, "seller_email": 1, "category": 1,
+}
+
+
+class CheckoutError(Exception):
+    def __init__(self, message, issues=None):
+        super().__init__(message)
+        self.issues = issues or []
+
+
+def parse_cart_item(item):
+    """{"product_id" (ya "id"), "quantity"} -> (ObjectId, quantity), ya ValueError."""
+    product_id = str(item.get("product_id") or item.get("id") or "") if isinstance(item, dict) else ""
+    if not ObjectId.is_valid(product_id):
+        raise ValueError("valid product_id is required")
+    try:
+        quantity = int(item.get("quantity", 1))
+    except (TypeError, ValueError):
+        raise ValueError("quantity must be a number")
+    if not 1 <= quantity <= MAX_LINE_QUANTITY:
+        raise ValueError(f"quantity must be between 1 and {MAX_LINE_QUANTITY}")
+    return ObjectId(product_id), quantity
+
+
+# --- 🛒 CART ---
+
+def get_cart_items(user_email):
+    cart = mongo.db.carts.find_one({"user_email": user_email}, {"items": 1})
+    return (cart or {}).get("items", [])
+
+
+def normalize_cart_items(items):
+    """Raw items -> cart lines: same product do baar aaye toh quantity jud jaati hai, MAX_CART_LINES tak."""
+    merged = {}
+    for item in items:
+        product_id, quantity = parse_cart_item(item)
+        merged[product_id] = min(merged.get(product_id, 0) + quantity, MAX_LINE_QUANTITY)
+    if len(merged) > MAX_CART_LINES:
+        raise ValueError(f"cart can have at most {MAX_CART_LINES} products")
+    return [{"product_id": pid, "quantity": qty} for pid, qty in merged.items()]
+
+
+def replace_cart(user_email, items):
+    """Poora cart ek saath set karo."""
+    lines = normalize_cart_items(items)
+    mongo.db.carts.update_one(
+        {"user_email": user_email},
+        {"$set": {"items": lines, "updatedAt": datetime.utcnow()}},
+        upsert=True,
+    )
+    return lines
+
+
+def set_cart_item(user_email, product_id, quantity):
+    product_id, quantity = parse_cart_item({"product_id": product_id, "quantity": quantity})
+    items = [i for i in get_cart_items(user_email) if i["product_id"] != product_id]
+    items.append({"product_id": product_id, "quantity": quantity})
+    return replace_cart(user_email, items)
+
+
+def remove_cart_item(user_email, product_id):
+    if not ObjectId.is_valid(str(product_id)):
+        raise ValueError("valid product_id is required")
+    mongo.db.carts.update_one(
+        {"user_email": user_email},
+        {"$pull": {"items": {"product_id": ObjectId(product_id)}}, "$set": {"updatedAt": datetime.utcnow()}},
+    )
+
+
+def clear_cart(user_email):
+    mongo.db.carts.update_one({"user_email": user_email}, {"$set": {"items": [], "updatedAt": datetime.utcnow()}})
+
+
+def _unit_price(product):
+    """finalPrice, warna price (bulk/import se null aa sakta hai); dono na ho toh None."""
+    for field in ("finalPrice", "price"):
+        try:
+            value = float(product.get(field))
+        except (TypeError, ValueError):
+            continue
+        if math.isfinite(value):
+            return value
+    return None
+
+
+def price_cart(items):
+    """Revalidate cart lines with ONE $in query. Returns {"lines", "total", "issues"}."""
+    ids = [item["product_id"] for item in items]
+    products = {
+        p["_id"]: p for p in mongo.db.products.find({"_id": {"$in": ids}}, CART_PRODUCT_PROJECTION)
+    } if ids else {}
+
+    lines, issues, total = [], [], 0.0
+    for item in items:
+        product_id, quantity = item["product_id"], item["quantity"]
+        product = products.get(product_id)
+        if product is None or not product.get("isActive", True):
+            issues.append({"id": str(product_id), "issue": "unavailable"})
+            continue
+        stock = product.get("stock") or 0
+        if stock < quantity:
+            issues.append({"id": str(product_id), "issue": "insufficient_stock", "available": stock})
+
+        unit_price = _unit_price(product)
+        if unit_price is None:
+            issues.append({"id": str(product_id), "issue": "unavailable"})
+            continue
+        line_total = round(unit_price * quantity, 2)
+        total += line_total
+        lines.append({
+            "id": str(product_id),
+            "name": product.get("name"),
+            "brand": product.get("brand"),
+            "imageURL": product.get("imageURL", ""),
+            "category": product.get("category"),
+            "seller_email": product.get("seller_email"),
+            "price": product.get("price"),
+            "discount": product.get("discount", 0),
+            "finalPrice": unit_price,
+            "stock": stock,
+            "quantity": quantity,
+            "lineTotal": line_total,
+        })
+    return {"lines": lines, "total": round(total, 2), "issues": issues}
+
+
+# --- 💳 CHECKOUT ---
+
+def checkout(user_email, items=None, expected_total=None):
+    """Reserve stock for every line and create the order; raises CheckoutError (nothing reserved) on failure.
+
+    `items` na diya toh saved cart use hota hai (aur order ke baad clear hota hai).
+    """
+    from_saved_cart = items is None
+    if from_saved_cart:
+        items = get_cart_items(user_email)
+    else:
+        # Saved cart jaisa hi merge + limits (explicit items bhi replace_cart wale rules se)
+        items = normalize_cart_items(items)
+    if not items:
+        raise CheckoutError("Cart is empty")
+
+    priced = price_cart(items)
+    if priced["issues"]:
+        raise CheckoutError("Some items are no longer available", priced["issues"])
+    if expected_total is not None and abs(float(expected_total) - priced["total"]) > 0.01:
+        raise CheckoutError("Prices have changed, please review your cart",
+                            [{"issue": "price_changed", "total": priced["total"]}])
+
+    # Fixed order (_id) mein reserve karo; beech mein fail hua toh jo liya woh wapas
+    reserved = []
+    try:
+        for line in sorted(priced["lines"], key=lambda l: l["id"]):
+            if reserve_stock(line["id"], line["quantity"]) is None:
+                raise CheckoutError("Item went out of stock",
+                                    [{"id": line["id"], "issue": "insufficient_stock"}])
+            reserved.append(line)
+
+        order = {
+            "user_email": user_email,
+            "items": [
+                {
+                    "product_id": ObjectId(line["id"]),
+                    "name": line["name"],
+                    "seller_email": line["seller_email"],
+                    "quantity": line["quantity"],
+                    "unitPrice": line["finalPrice"],
+                    "lineTotal": line["lineTotal"],
+                }
+                for line in priced["lines"]
+            ],
+            "total": priced["total"],
+            "status": "placed",
+            "createdAt": datetime.utcnow(),
+        }
+        mongo.db.orders.insert_one(order)
+    except Exception:
+        for line in reserved:
+            release_stock(line["id"], line["quantity"])
+        raise
+
+    if from_saved_cart:
+        clear_cart(user_email)
+    return order
+
+
+def get_orders(user_email, limit=20):
+    return list(mongo.db.orders.find({"user_email": user_email}).sort("createdAt", -1).limit(limit))
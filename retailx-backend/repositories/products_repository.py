@@ -1,5 +1,27 @@
+import asyncio
+import base64
+import json
+import math
+from datetime import datetime, timezone
+
 from extensions import mongo
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from repositories.cache import create_cache
+from repositories.indexes import CATEGORY_COLLATION
+from services import catalog_events, facets
+
+def _image_url(p):
+    return p.get("imageURL") or (p.get("images", [""])[0] if p.get("images") else "")
+
+def _modified_at(p):
+    modified = p.get("updatedAt") or p.get("createdAt")
+    if isinstance(modified, datetime):
+        if modified.tzinfo is None:
+            modified = modified.replace(tzinfo=timezone.utc)
+        return modified.isoformat()
+    return modified
 
 def format_product(p):
     if not p:
@@ -17,23 +39,614 @@ def format_product(p):
         "stock": p.get("stock", 0),
         "rating": p.get("rating", 0),
         "reviewsCount": p.get("reviewsCount", 0),
-        "imageURL": p.get("imageURL") or (p.get("images", [""])[0] if p.get("images") else ""),
+        "imageURL": _image_url(p),
         "tags": p.get("tags", []),
         "isActive": p.get("isActive", True),
         "highlights": p.get("highlights", []),
         "specs": p.get("specs", {}),
         "aiMetadata": p.get("aiMetadata", {}),
-        "images": p.get("images", [])
+        "images": p.get("images", []),
+        "version": p.get("version", 0),
+        "updatedAt": _modified_at(p)
+    }
+
+# --- 👀 VIEWS (projection + matching lean serializer) ---
+# Listing cards ko specs/highlights/aiMetadata/saari images nahi chahiye, toh
+# Mongo se hi nahi mangwate. Detail page ke liye poora format_product.
+
+def format_product_card(p):
+    if not p:
+        return None
+    return {
+        "id": str(p.get("_id")),
+        "name": p.get("name"),
+        "category": p.get("category"),
+        "brand": p.get("brand"),
+        "price": p.get("price"),
+        "discount": p.get("discount", 0),
+        "finalPrice": p.get("finalPrice"),
+        "stock": p.get("stock", 0),
+        "rating": p.get("rating", 0),
+        "reviewsCount": p.get("reviewsCount", 0),
+        "imageURL": _image_url(p),
+        "images": p.get("images", [])[:1],
+        "version": p.get("version", 0)
     }
 
-def get_all_products(query_filter=None, limit=20):
+
+CARD_PROJECTION = {
+    "name": 1, "category": 1, "brand": 1, "price": 1, "discount": 1, "finalPrice": 1,
+    "stock": 1, "rating": 1, "reviewsCount": 1, "imageURL": 1, "images": {"$slice": 1}, "version": 1
+}
+
+VIEWS = {
+    "card": {"projection": CARD_PROJECTION, "serializer": format_product_card},
+    "detail": {"projection": None, "serializer": format_product},
+    # Seller dashboard "_id" hi use karta hai; raw doc chalega kyunki JSON provider ObjectId encode karta hai
+    "seller-inventory": {"projection": {"aiMetadata": 0, "images": 0}, "serializer": lambda p: p},
+}
+
+# fields= param ke liye allowed names (format_product ki keys)
+PRODUCT_FIELDS = {
+    "id", "name", "description", "category", "subCategory", "brand", "price", "discount",
+    "finalPrice", "stock", "rating", "reviewsCount", "imageURL", "tags", "isActive",
+    "highlights", "specs", "aiMetadata", "images", "version", "updatedAt"
+}
+
+def parse_fields(raw):
+    """"name,finalPrice" -> ["name", "finalPrice"]; None if not given."""
+    if not raw:
+        return None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in PRODUCT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def select_fields(doc, fields):
+    # id aur version hamesha rehte hain (ETag inhi se banta hai)
+    return {k: v for k, v in doc.items() if k in ("id", "version") or k in fields}
+
+def resolve_view(view="detail", fields=None):
+    """(projection, serializer) for a named view, or for an explicit fields= list."""
+    if fields:
+        projection = {f: 1 for f in fields if f != "id"}
+        projection["version"] = 1
+        if "updatedAt" in fields:
+            projection["createdAt"] = 1
+        if "imageURL" in fields and "images" not in fields:
+            # imageURL images[0] se banta hai; poori list chahiye toh explicit images: 1 rehne do
+            projection["images"] = {"$slice": 1}
+        return projection, lambda p: select_fields(format_product(p), fields)
+    if view not in VIEWS:
+        raise ValueError(f"Unknown view: {view}")
+    return VIEWS[view]["projection"], VIEWS[view]["serializer"]
+
+# --- 📄 KEYSET PAGINATION ---
+# skip() deep pages pe linear slow hota hai, isliye last item ke (sort value, _id)
+# se agla page shuru karte hain. Har sort key ke liye indexes.py mein index hai.
+SORT_FIELDS = {"_id", "finalPrice", "rating"}
+
+def parse_sort(sort):
+    """"finalPrice" -> ("finalPrice", 1), "-rating" -> ("rating", -1)."""
+    sort = sort or "_id"
+    direction = -1 if sort.startswith("-") else 1
+    field = sort.lstrip("-")
+    if field not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort field: {field}")
+    return field, direction
+
+def encode_cursor(field, product):
+    value = product.get(field)
+    if isinstance(value, ObjectId):
+        value = str(value)
+    raw = json.dumps([value, str(product["_id"])]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(field, cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        last_id = ObjectId(last_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return (last_id if field == "_id" else value), last_id
+
+def _after_cursor(field, direction, value, last_id):
+    op = "$gt" if direction == 1 else "$lt"
+    if field == "_id":
+        return {"_id": {op: last_id}}
+    # Null/missing sort value Mongo mein sabse chhota hai: ascending mein pehle, descending
+    # mein last. {field: None} missing ko bhi match karta hai, toh dono ek hi group hain.
+    if value is None:
+        same_value = {field: None, "_id": {op: last_id}}
+        return {"$or": [same_value, {field: {"$ne": None}}]} if direction == 1 else same_value
+    after = [{field: {op: value}}, {field: value, "_id": {op: last_id}}]
+    if direction == -1:
+        after.append({field: None})
+    return {"$or": after}
+
+def page_plan(query_filter=None, limit=20, sort="_id", cursor=None, view="detail", fields=None):
+    """Query, projection and sort for one keyset page (sync aur async readers dono yahi use karte hain)."""
+    field, direction = parse_sort(sort)
+    projection, serializer = resolve_view(view, fields)
+    if projection and field != "_id" and not any(v == 0 for v in projection.values()):
+        # Cursor banane ke liye sort field chahiye hi
+        projection = {**projection, field: 1}
     query = query_filter if query_filter else {"isActive": True}
-    products = mongo.db.products.find(query).limit(limit)
-    return [format_product(p) for p in products]
+    if cursor:
+        value, last_id = decode_cursor(field, cursor)
+        query = {"$and": [query, _after_cursor(field, direction, value, last_id)]}
+
+    sort_spec = [("_id", direction)] if field == "_id" else [(field, direction), ("_id", direction)]
+    return {"query": query, "projection": projection, "sort": sort_spec, "limit": limit,
+            "field": field, "serializer": serializer}
+
+def page_result(plan, products):
+    """Fetched docs (limit + 1 tak) -> {items, next_cursor}."""
+    next_cursor = None
+    if len(products) > plan["limit"]:
+        products = products[:plan["limit"]]
+        next_cursor = encode_cursor(plan["field"], products[-1])
+    return {"items": [plan["serializer"](p) for p in products], "next_cursor": next_cursor}
+
+def get_products_page(query_filter=None, limit=20, sort="_id", cursor=None, collation=None,
+                      view="detail", fields=None):
+    """One page of serialized products plus next_cursor (None on the last page)."""
+    plan = page_plan(query_filter, limit, sort, cursor, view, fields)
+    # Ek extra doc fetch karke pata chalta hai ki agla page hai ya nahi
+    products = mongo.db.products.find(plan["query"], plan["projection"]).sort(plan["sort"]).limit(limit + 1)
+    if collation is not None:
+        products = products.collation(collation)
+    return page_result(plan, list(products))
+
+def get_all_products(query_filter=None, limit=20, collation=None, sort="_id", cursor=None,
+                     view="detail", fields=None):
+    return get_products_page(query_filter, limit=limit, sort=sort, cursor=cursor, collation=collation,
+                             view=view, fields=fields)["items"]
+
+# --- ⚡ READ-THROUGH CACHE ---
+# Single product (detail view) aur listing pages. Invalidation neeche wale
+# catalog_events listener se hota hai, jo saare write helpers publish karte hain.
+
+_cache = create_cache()
+
+def configure_cache(url=None, max_size=2048, ttl=60):
+    global _cache
+    _cache = create_cache(url, max_size=max_size, ttl=ttl)
+
+def cache_stats():
+    return _cache.stats()
+
+def listing_scope(category=None):
+    # Category collation case-insensitive hai, toh scope bhi
+    return f"cat:{category.casefold()}" if category else "all"
+
+def _page_cache_key(scope, kwargs):
+    # collation scope (category) se hi tay hoti hai, key mein nahi daalte
+    params = json.dumps({k: v for k, v in kwargs.items() if k != "collation"}, sort_keys=True, default=str)
+    return f"page:{scope}:g{_cache.generation(scope)}:{params}"
+
+def _facets_cache_key(base_query, filters):
+    # Category facet baaki categories bhi ginta hai, toh har write pe invalid ("all" scope)
+    params = json.dumps({"q": base_query, "f": filters}, sort_keys=True, default=str)
+    return f"facets:all:g{_cache.generation('all')}:{params}"
+
+def filter_collation(filters):
+    """Category/brand filters case-insensitive match hote hain (collation), in-memory search jaisa."""
+    return CATEGORY_COLLATION if filters["category"] or filters["brand"] else None
+
+def listing_query(filters, exclude_id=None):
+    """/api/products filters -> (base_query, query, collation, scope); base_query facet counts ke liye."""
+    base_query = {"isActive": True}
+    if exclude_id:
+        try:
+            base_query["_id"] = {"$ne": ObjectId(exclude_id)}
+        except:
+            pass
+    categories = filters["category"]
+    # Case-insensitive equality (collation index use karega), regex nahi
+    collation = filter_collation(filters)
+    # Ek category ho toh usi category ka cache scope, warna "all"
+    scope = listing_scope(categories[0] if len(categories) == 1 else None)
+    return base_query, facets.apply_filters(base_query, filters), collation, scope
+
+def search_filter(query_text):
+    """Regex fallback jab search index abhi build nahi hua."""
+    return {
+        "isActive": True,
+        "$or": [
+            {"name": {"$regex": query_text, "$options": "i"}},
+            {"brand": {"$regex": query_text, "$options": "i"}},
+            {"category": {"$regex": query_text, "$options": "i"}},
+            {"tags": {"$regex": query_text, "$options": "i"}}
+        ]
+    }
+
+def get_products_page_cached(scope, **kwargs):
+    """get_products_page through the cache; `scope` decides which writes invalidate it."""
+    key = _page_cache_key(scope, kwargs)
+    page = _cache.get(key)
+    if page is None:
+        page = get_products_page(**kwargs)
+        _cache.set(key, page)
+    return page
+
+def get_facet_counts(base_query, filters, collation=None):
+    """Category/brand/price/rating counts over the whole match set in ONE $facet aggregation."""
+    key = _facets_cache_key(base_query, filters)
+    counts = _cache.get(key)
+    if counts is None:
+        pipeline = facets.facet_pipeline(base_query, filters)
+        options = {"collation": collation} if collation is not None else {}
+        doc = next(mongo.db.products.aggregate(pipeline, **options), {})
+        counts = facets.from_aggregation(doc)
+        _cache.set(key, counts)
+    return counts
+
+# Product keys bhi generation wale hain (per product scope), delete nahi: warna write se
+# pehle DB padhne wala reader invalidation ke baad purana doc wapas cache kar deta
+def _product_scope(product_id):
+    return f"product:{product_id}"
+
+def _product_key(product_id, generation=None):
+    if generation is None:
+        generation = _cache.generation(_product_scope(product_id))
+    return f"product:{product_id}:g{generation}"
 
 def get_product_by_id(product_id):
+    # Generation DB read se PEHLE padhni hai
+    key = _product_key(product_id)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        product = format_product(mongo.db.products.find_one({"_id": ObjectId(product_id)}))
+    except:
+        return None
+    if product is not None:
+        _cache.set(key, product)
+    return product
+
+def _cached_products(product_ids):
+    """(found, missing ObjectIds, {id: cache key}); keys _store_products ko wapas do."""
+    generations = _cache.generations([_product_scope(pid) for pid in product_ids])
+    keys = {pid: _product_key(pid, gen) for pid, gen in zip(product_ids, generations)}
+    ids_by_key = {key: pid for pid, key in keys.items()}
+    found = {ids_by_key[key]: product for key, product in _cache.get_many(ids_by_key).items()}
+    missing = [ObjectId(pid) for pid in product_ids if pid not in found]
+    return found, missing, keys
+
+def _store_products(docs, keys):
+    fetched = {}
+    for doc in docs:
+        product = format_product(doc)
+        fetched[product["id"]] = product
+    _cache.set_many({keys[pid]: product for pid, product in fetched.items() if pid in keys})
+    return fetched
+
+def get_products_by_ids(product_ids):
+    """Many products (detail view) at once: cache first, misses in ONE $in query.
+
+    Returns {id: product} for the ids that exist; callers keep their own order.
+    """
+    found, missing, keys = _cached_products(product_ids)
+    if missing:
+        found.update(_store_products(mongo.db.products.find({"_id": {"$in": missing}}), keys))
+    return found
+
+@catalog_events.subscribe
+def _invalidate_cache(before, after):
+    if before is not None:
+        # Naye product ki koi purani entry nahi hoti, bump sirf update/delete pe
+        _cache.bump(_product_scope(before["_id"]))
+    # Category badli ho toh purani aur nayi dono listings invalid
+    categories = {p.get("category") for p in (before, after) if p and p.get("category")}
+    for category in categories:
+        _cache.bump(listing_scope(category))
+    _cache.bump("all")
+
+# --- 🌊 ASYNC READS (asgi.py serving mode) ---
+# Upar wale read helpers ke async twins: same page plan, same cache keys, same
+# serializers; sirf Mongo I/O `db` (PyMongo AsyncMongoClient database) pe await hota hai.
+# Isliye WSGI aur ASGI workers ek hi cache (aur same invalidation) share karte hain.
+# Cache Redis ho (PRODUCT_CACHE_URL) toh uske calls blocking network I/O hain: woh
+# _cache_call se thread pool pe jaate hain, event loop nahi rukta.
+
+async def _cache_call(fn, *args):
+    if _cache.remote:
+        return await asyncio.to_thread(fn, *args)
+    return fn(*args)
+
+async def get_products_page_async(db, query_filter=None, limit=20, sort="_id", cursor=None, collation=None,
+                                  view="detail", fields=None):
+    plan = page_plan(query_filter, limit, sort, cursor, view, fields)
+    products = db.products.find(plan["query"], plan["projection"]).sort(plan["sort"]).limit(limit + 1)
+    if collation is not None:
+        products = products.collation(collation)
+    return page_result(plan, await products.to_list(None))
+
+async def get_all_products_async(db, query_filter=None, limit=20, collation=None, sort="_id", cursor=None,
+                                 view="detail", fields=None):
+    page = await get_products_page_async(db, query_filter, limit=limit, sort=sort, cursor=cursor,
+                                         collation=collation, view=view, fields=fields)
+    return page["items"]
+
+async def get_products_page_cached_async(db, scope, **kwargs):
+    key = await _cache_call(_page_cache_key, scope, kwargs)
+    page = await _cache_call(_cache.get, key)
+    if page is None:
+        page = await get_products_page_async(db, **kwargs)
+        await _cache_call(_cache.set, key, page)
+    return page
+
+async def get_facet_counts_async(db, base_query, filters, collation=None):
+    key = await _cache_call(_facets_cache_key, base_query, filters)
+    counts = await _cache_call(_cache.get, key)
+    if counts is None:
+        pipeline = facets.facet_pipeline(base_query, filters)
+        options = {"collation": collation} if collation is not None else {}
+        cursor = await db.products.aggregate(pipeline, **options)
+        docs = await cursor.to_list(1)
+        counts = facets.from_aggregation(docs[0] if docs else {})
+        await _cache_call(_cache.set, key, counts)
+    return counts
+
+async def get_product_by_id_async(db, product_id):
+    key = await _cache_call(_product_key, product_id)
+    cached = await _cache_call(_cache.get, key)
+    if cached is not None:
+        return cached
     try:
-        product = mongo.db.products.find_one({"_id": ObjectId(product_id)})
-        return format_product(product)
+        product = format_product(await db.products.find_one({"_id": ObjectId(product_id)}))
     except:
-        return None
\ No newline at end of file
+        return None
+    if product is not None:
+        await _cache_call(_cache.set, key, product)
+    return product
+
+async def get_products_by_ids_async(db, product_ids):
+    found, missing, keys = await _cache_call(_cached_products, product_ids)
+    if missing:
+        docs = await db.products.find({"_id": {"$in": missing}}).to_list(None)
+        found.update(await _cache_call(_store_products, docs, keys))
+    return found
+
+# --- 🧮 SHARED PRODUCT HELPERS ---
+# Single add, update aur bulk import sab yahi use karte hain
+
+def compute_final_price(price, discount):
+    return price - (price * (discount / 100))
+
+def parse_tags(tags_data):
+    # Agar user ne "shampoo, organic" bheja toh array ban jayega ["shampoo", "organic"]
+    # Agar sirf "shampoo" bheja toh ["shampoo"] ban jayega
+    if isinstance(tags_data, str):
+        return [t.strip() for t in tags_data.split(",") if t.strip()]
+    if isinstance(tags_data, list):
+        return tags_data
+    return []
+
+def build_seller_product(data, seller_email):
+    """New product document from seller input (numbers converted, tags parsed, finalPrice computed)."""
+    price = float(data.get('price', 0))
+    discount = float(data.get('discount', 0))
+    return {
+        "name": data.get('name'),
+        "brand": data.get('brand', "Generic"),
+        "price": price,
+        "discount": discount,
+        "finalPrice": compute_final_price(price, discount),
+        "stock": int(data.get('stock', 0)),
+        "rating": 0,
+        "imageURL": data.get('imageURL', ""),
+        "description": data.get('description', ""),
+        "category": data.get('category', "Other"),
+        "subCategory": data.get('subCategory', ""),
+        "seller_email": seller_email, # Isse connect hota hai product seller se
+        "isActive": True,
+        "tags": parse_tags(data.get('tags', [])),
+        "highlights": data.get('highlights', []), # Expecting Array from frontend
+        "specs": data.get('specs', {}),           # Expecting Object from frontend
+        "createdAt": datetime.utcnow()
+    }
+
+# --- ✍️ WRITE HELPERS ---
+# Saare product writes yahin se jaate hain taaki catalog_events ke listeners
+# (search index waghera) ko har change ka pata chale. Har write "version" badhata
+# hai aur "updatedAt" stamp karta hai (ETag / Last-Modified inhi se).
+
+STAMP_FIELDS = ("version", "updatedAt")
+
+def insert_product(product):
+    product["version"] = 1
+    product["updatedAt"] = datetime.utcnow()
+    result = mongo.db.products.insert_one(product)  # insert_one product["_id"] set kar deta hai
+    catalog_events.publish(None, product)
+    return result
+
+def insert_products(products):
+    """insert_many(ordered=False): returns (inserted docs, {batch index: error message})."""
+    now = datetime.utcnow()
+    for product in products:
+        product["version"] = 1
+        product["updatedAt"] = now
+
+    failed = {}
+    try:
+        mongo.db.products.insert_many(products, ordered=False)
+    except BulkWriteError as e:
+        failed = {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+
+    inserted = [p for i, p in enumerate(products) if i not in failed]
+    catalog_events.publish_many((None, product) for product in inserted)
+    return inserted, failed
+
+def update_product_fields(product_id, changes, seller_email=None):
+    """$set changes on one product; returns the updated doc or None if not found."""
+    scope = {"_id": ObjectId(product_id)}
+    if seller_email:
+        scope["seller_email"] = seller_email
+
+    # Client version/updatedAt khud set nahi kar sakta
+    changes = {k: v for k, v in changes.items() if k not in STAMP_FIELDS}
+    now = datetime.utcnow()
+    before = mongo.db.products.find_one_and_update(
+        scope,
+        {"$set": {**changes, "updatedAt": now}, "$inc": {"version": 1}},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        return None
+
+    if any("." in key for key in changes):
+        # Nested keys ke liye local merge sahi nahi hoga, DB se hi le lo
+        after = mongo.db.products.find_one({"_id": before["_id"]})
+    else:
+        after = {**before, **changes, "updatedAt": now, "version": before.get("version", 0) + 1}
+    catalog_events.publish(before, after)
+    return after
+
+# Bulk stock / price updates: ek $in pre-read + ek bulk_write(ordered=False)
+BULK_UPDATE_FIELDS = {"stock": int, "price": float, "discount": float}
+
+def _final_price_expr():
+    # finalPrice DB mein stored price/discount se hi calculate hota hai (client ka nahi);
+    # missing/null price ya discount 0 maana jaata hai, local `after` jaisa
+    price = {"$ifNull": ["$price", 0]}
+    discount = {"$ifNull": ["$discount", 0]}
+    return {"$subtract": [price, {"$multiply": [price, {"$divide": [discount, 100]}]}]}
+
+def parse_bulk_item(item):
+    """{"id", "stock"?, "price"?, "discount"?} -> (ObjectId, changes), ya ValueError."""
+    if not isinstance(item, dict) or not ObjectId.is_valid(str(item.get("id", ""))):
+        raise ValueError("valid id is required")
+    changes = {}
+    for field, cast in BULK_UPDATE_FIELDS.items():
+        if item.get(field) is not None:
+            try:
+                changes[field] = cast(item[field])
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"{field} must be a number")
+            if not math.isfinite(changes[field]):
+                raise ValueError(f"{field} must be a finite number")
+    if not changes:
+        raise ValueError("nothing to update (stock, price or discount)")
+    if changes.get("stock", 0) < 0 or not changes.get("price", 0) >= 0:
+        raise ValueError("stock and price must be >= 0")
+    if not 0 <= changes.get("discount", 0) <= 100:
+        raise ValueError("discount must be between 0 and 100")
+    return ObjectId(item["id"]), changes
+
+def bulk_update_products(items, seller_email):
+    """Many stock/price changes in one round trip, scoped to seller_email.
+
+    Returns per-item results in request order: {"id", "status": updated|not_found|invalid|error}.
+    """
+    results = [None] * len(items)
+    parsed = []  # (request index, ObjectId, changes)
+    for i, item in enumerate(items):
+        try:
+            oid, changes = parse_bulk_item(item)
+            parsed.append((i, oid, changes))
+        except ValueError as e:
+            item_id = item.get("id") if isinstance(item, dict) else None
+            results[i] = {"id": item_id, "status": "invalid", "message": str(e)}
+
+    # Seller ke hi products: doosre seller ka id "not_found" dikhega
+    ids = list({oid for _, oid, _ in parsed})
+    before_docs = {
+        doc["_id"]: doc
+        for doc in mongo.db.products.find({"_id": {"$in": ids}, "seller_email": seller_email})
+    } if ids else {}
+
+    ops, op_items = [], []
+    now = datetime.utcnow()
+    for i, oid, changes in parsed:
+        if oid not in before_docs:
+            results[i] = {"id": str(oid), "status": "not_found"}
+            continue
+        stamp = {"version": {"$add": [{"$ifNull": ["$version", 0]}, 1]}, "updatedAt": now}
+        if "price" in changes or "discount" in changes:
+            stamp["finalPrice"] = _final_price_expr()
+        ops.append(UpdateOne(
+            {"_id": oid, "seller_email": seller_email},
+            [{"$set": changes}, {"$set": stamp}],  # pipeline update: finalPrice naye price/discount se
+        ))
+        op_items.append((i, oid, changes))
+
+    failed, matched = {}, 0
+    if ops:
+        try:
+            matched = mongo.db.products.bulk_write(ops, ordered=False).matched_count
+        except BulkWriteError as e:
+            failed = {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+            matched = e.details.get("nMatched", 0)
+
+    # Pre-read aur bulk_write ke beech koi product delete ho gaya toh uska op kuch match nahi karta:
+    # kam matches hon toh ek $in se dekho kaun bache hain (baaki "not_found", "updated" nahi)
+    gone = set()
+    if matched < len(op_items) - len(failed):
+        op_ids = list({oid for _, oid, _ in op_items})
+        present = {doc["_id"] for doc in mongo.db.products.find({"_id": {"$in": op_ids}}, {"_id": 1})}
+        gone = set(op_ids) - present
+
+    # Ek hi product kai baar aaye toh changes order mein jodte hain (bulk_write bhi same order mein lagata hai)
+    current = dict(before_docs)
+    for op_index, (i, oid, changes) in enumerate(op_items):
+        if op_index in failed:
+            results[i] = {"id": str(oid), "status": "error", "message": failed[op_index]}
+            continue
+        if oid in gone:
+            results[i] = {"id": str(oid), "status": "not_found"}
+            continue
+        before = current[oid]
+        after = {**before, **changes, "updatedAt": now, "version": before.get("version", 0) + 1}
+        if "price" in changes or "discount" in changes:
+            after["finalPrice"] = compute_final_price(after.get("price") or 0, after.get("discount") or 0)
+        current[oid] = after
+        results[i] = {"id": str(oid), "status": "updated",
+                      "finalPrice": after.get("finalPrice"), "stock": after.get("stock")}
+
+    catalog_events.publish_many((before_docs[oid], after) for oid, after in current.items()
+                                if after is not before_docs[oid])
+    return results
+
+# Checkout ke liye stock reservation: conditional atomic $inc, oversell nahi hota.
+# Filter mein "stock >= qty" hai, toh do parallel checkouts last unit dono nahi le sakte.
+
+def _publish_stock_change(after, delta):
+    before = {**after, "stock": after.get("stock", 0) - delta, "version": after.get("version", 1) - 1}
+    catalog_events.publish(before, after)
+
+def reserve_stock(product_id, quantity):
+    """Atomically take `quantity` units; returns the updated doc, or None if not enough stock."""
+    after = mongo.db.products.find_one_and_update(
+        {"_id": ObjectId(product_id), "isActive": True, "stock": {"$gte": quantity}},
+        {"$inc": {"stock": -quantity, "version": 1}, "$set": {"updatedAt": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
+    )
+    if after is not None:
+        _publish_stock_change(after, -quantity)
+    return after
+
+def release_stock(product_id, quantity):
+    """Give reserved units back (failed / cancelled checkout)."""
+    after = mongo.db.products.find_one_and_update(
+        {"_id": ObjectId(product_id)},
+        {"$inc": {"stock": quantity, "version": 1}, "$set": {"updatedAt": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
+    )
+    if after is not None:
+        _publish_stock_change(after, quantity)
+    return after
+
+def delete_product(product_id, seller_email=None):
+    scope = {"_id": ObjectId(product_id)}
+    if seller_email:
+        scope["seller_email"] = seller_email
+
+    deleted = mongo.db.products.find_one_and_delete(scope)
+    if deleted is not None:
+        catalog_events.publish(deleted, None)
+    return deleted
@@ -0,0 +1,159 @@
+from datetime import datetime
+
+from extensions import mongo
+from pymongo import ReplaceOne, UpdateOne
+from services import catalog_events, scheduler
+
+# Seller dashboard ke liye per-seller stats doc (seller_stats collection, _id = seller email)
+# Har product write (add / update / delete / stock / bulk / import / checkout) catalog_events
+# publish karta hai; yahan before aur after ka farak ek hi $inc se seller ke doc pe lagta
+# hai (single-doc $inc atomic hai, parallel writes bhi sahi jodte hain). Bulk writes ka
+# poora batch per seller jod ke ek bulk_write mein jaata hai. Dashboard ko
+# poori inventory nahi mangwani padti. Reconciliation job sab kuch products se dobara banata hai.
+
+LOW_STOCK_THRESHOLD = 5
+COUNTERS = ("skus", "totalStock", "inventoryValue", "lowStock", "outOfStock")
+
+
+def _category_key(category):
+    # Category naam field path mein jaata hai: "." aur "$" wahan allowed nahi
+    return str(category or "Other").strip().replace(".", "_").replace("$", "_") or "Other"
+
+
+def _contribution(product):
+    """{field path: value} jo ek product seller ke stats mein jodta hai."""
+    stock = int(product.get("stock") or 0)
+    value = stock * float(product.get("finalPrice") or 0)
+    category = f"categories.{_category_key(product.get('category'))}"
+    return {
+        "skus": 1,
+        "totalStock": stock,
+        "inventoryValue": value,
+        "lowStock": 1 if 0 < stock <= LOW_STOCK_THRESHOLD else 0,
+        "outOfStock": 1 if stock <= 0 else 0,
+        f"{category}.skus": 1,
+        f"{category}.stock": stock,
+        f"{category}.value": value,
+    }
+
+
+def stats_deltas(before, after):
+    """{seller_email: {field: delta}} for one product write (insert: before=None, delete: after=None)."""
+    deltas = {}
+    for product, sign in ((before, -1), (after, 1)):
+        if not product or not product.get("seller_email"):
+            continue
+        seller = deltas.setdefault(product["seller_email"], {})
+        for field, value in _contribution(product).items():
+            seller[field] = seller.get(field, 0) + sign * value
+    # Sirf stock/price jaisa change ho toh baaki counters 0 hote hain, unhe $inc mein mat bhejo
+    return {email: {f: d for f, d in fields.items() if d} for email, fields in deltas.items()}
+
+
+def batch_deltas(changes):
+    """stats_deltas summed over [(before, after)]: one {field: delta} per seller."""
+    totals = {}
+    for before, after in changes:
+        for email, fields in stats_deltas(before, after).items():
+            seller = totals.setdefault(email, {})
+            for field, delta in fields.items():
+                seller[field] = seller.get(field, 0) + delta
+    return {email: {f: d for f, d in fields.items() if d} for email, fields in totals.items()}
+
+
+@catalog_events.subscribe_batch
+def _apply_product_changes(changes):
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne({"_id": seller_email}, {"$inc": inc, "$set": {"updatedAt": now}}, upsert=True)
+        for seller_email, inc in batch_deltas(changes).items() if inc
+    ]
+    if ops:
+        mongo.db.seller_stats.bulk_write(ops, ordered=False)
+
+
+def get_seller_stats(seller_email):
+    doc = mongo.db.seller_stats.find_one({"_id": seller_email}) or {}
+    categories = [
+        {"category": name, "skus": c.get("skus", 0), "stock": c.get("stock", 0),
+         "inventoryValue": round(c.get("value", 0), 2)}
+        for name, c in (doc.get("categories") or {}).items()
+        if c.get("skus", 0) > 0
+    ]
+    categories.sort(key=lambda c: (-c["skus"], c["category"]))
+    return {
+        "skus": doc.get("skus", 0),
+        "totalStock": doc.get("totalStock", 0),
+        # Float $inc ka chhota drift round se chhup jaata hai (aur reconciliation theek kar deta hai)
+        "inventoryValue": round(doc.get("inventoryValue", 0), 2),
+        "lowStock": doc.get("lowStock", 0),
+        "outOfStock": doc.get("outOfStock", 0),
+        "lowStockThreshold": LOW_STOCK_THRESHOLD,
+        "categories": categories,
+        "updatedAt": doc.get("updatedAt"),
+        "reconciledAt": doc.get("reconciledAt"),
+    }
+
+
+# --- 🔁 RECONCILIATION ---
+
+def _rebuild_pipeline(seller_email=None):
+    match = {"seller_email": seller_email} if seller_email else {"seller_email": {"$exists": True, "$ne": None}}
+    stock = {"$ifNull": ["$stock", 0]}
+    value = {"$multiply": [stock, {"$ifNull": ["$finalPrice", 0]}]}
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {"seller": "$seller_email", "category": {"$ifNull": ["$category", "Other"]}},
+            "skus": {"$sum": 1},
+            "stock": {"$sum": stock},
+            "value": {"$sum": value},
+            "lowStock": {"$sum": {"$cond": [{"$and": [{"$gt": [stock, 0]}, {"$lte": [stock, LOW_STOCK_THRESHOLD]}]}, 1, 0]}},
+            "outOfStock": {"$sum": {"$cond": [{"$lte": [stock, 0]}, 1, 0]}},
+        }},
+    ]
+
+
+def rebuild_seller_stats(seller_email=None):
+    """Recompute stats from the products collection (one seller, or all). Returns sellers written.
+
+    Aggregation aur replace ke beech aaye writes agle reconcile tak chhoot sakte hain;
+    isliye ye job periodic chalta hai.
+    """
+    now = datetime.utcnow()
+    docs = {}
+    for row in mongo.db.products.aggregate(_rebuild_pipeline(seller_email)):
+        seller = row["_id"]["seller"]
+        doc = docs.setdefault(seller, {**{c: 0 for c in COUNTERS}, "categories": {}})
+        doc["skus"] += row["skus"]
+        doc["totalStock"] += row["stock"]
+        doc["inventoryValue"] += row["value"]
+        doc["lowStock"] += row["lowStock"]
+        doc["outOfStock"] += row["outOfStock"]
+        category = doc["categories"].setdefault(_category_key(row["_id"]["category"]), {"skus": 0, "stock": 0, "value": 0})
+        category["skus"] += row["skus"]
+        category["stock"] += row["stock"]
+        category["value"] += row["value"]
+
+    if seller_email and seller_email not in docs:
+        docs[seller_email] = {**{c: 0 for c in COUNTERS}, "categories": {}}
+
+    ops = [ReplaceOne({"_id": seller}, {**doc, "updatedAt": now, "reconciledAt": now}, upsert=True)
+           for seller, doc in docs.items()]
+    if ops:
+        mongo.db.seller_stats.bulk_write(ops, ordered=False)
+    if seller_email is None:
+        # Jin sellers ke ab koi product nahi, unke purane docs
+        mongo.db.seller_stats.delete_many({"_id": {"$nin": list(docs)}})
+    return len(docs)
+
+
+def init_seller_stats(app):
+    try:
+        print(f"✅ Seller stats reconciled: {rebuild_seller_stats()} sellers")
+    except Exception as e:
+        print(f"❌ Seller stats reconcile failed: {e}")
+
+    interval = app.config.get("SELLER_STATS_RECONCILE_SECONDS")
+    if interval:
+        scheduler.every(interval, rebuild_seller_stats, name="seller-stats-reconcile")
@@ -1,7 +1,12 @@
+from concurrent.futures import TimeoutError as HashTimeout
+from functools import wraps
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token
-from extensions import bcrypt  # Ensure your extensions file has bcrypt
+from flask_jwt_extended import create_access_token, get_jwt, verify_jwt_in_request
+from extensions import mongo
 from models.admin_model import Admin
+from repositories.admin_stats_repository import SNAPSHOTS, get_snapshot, refresh_snapshot
+from services.executor import PoolSaturated
+from services.password_hashing import hash_password, verify_and_upgrade
 import os
 import re
 
@@ -41,14 +46,18 @@ def register_admin():
         if Admin.find_by_email(email):
             return jsonify({"message": "Admin pehle se hi registered hai!"}), 400
 
-        # 5. Hash Password & Create
-        hashed_pw = bcrypt.generate_password_hash(password).decode("utf-8")
+        # 5. Hash Password & Create (bcrypt pool pe)
+        hashed_pw = hash_password(password)
         Admin.create_admin(email, hashed_pw)
 
         # 6. Generate Token
-        token = create_access_token(identity={"email": email, "role": "admin"})
+        token = create_access_token(identity=email, additional_claims={"role": "admin"})
         return jsonify({"token": token, "message": "Admin registration successful!"}), 201
     
+    except PoolSaturated:
+        return jsonify({"message": "Server busy hai, thodi der baad try karo"}), 429, {"Retry-After": "1"}
+    except HashTimeout:
+        return jsonify({"message": "Server busy hai, thodi der baad try karo"}), 503, {"Retry-After": "5"}
     except Exception as e:
         return jsonify({"message": f"Server error: {str(e)}"}), 500
 
@@ -64,15 +73,75 @@ def login_admin():
         return jsonify({"message": "Email aur password dono chahiye!"}), 400
 
     admin = Admin.find_by_email(email)
+
+    def save_hash(new_hash):
+        mongo.db.admins.update_one({"_id": admin["_id"]}, {"$set": {"password": new_hash}})
     
-    # 1. User check and Password verification
-    if not admin or not bcrypt.check_password_hash(admin["password"], password):
+    # 1. User check and Password verification (bcrypt pool pe, cost badli ho toh rehash)
+    try:
+        valid = bool(admin) and verify_and_upgrade(admin["password"], password, save_hash)
+    except PoolSaturated:
+        return jsonify({"message": "Server busy hai, thodi der baad try karo"}), 429, {"Retry-After": "1"}
+    except HashTimeout:
+        return jsonify({"message": "Server busy hai, thodi der baad try karo"}), 503, {"Retry-After": "5"}
+
+    if not valid:
         return jsonify({"message": "Email ya Password galat hai!"}), 401
 
     # 2. Token generation
-    token = create_access_token(identity={"email": email, "role": "admin"})
+    token = create_access_token(identity=email, additional_claims={"role": "admin"})
     return jsonify({
         "token": token, 
         "message": "Welcome back Admin!",
         "admin": {"email": email} # Frontend ke liye thodi info
-    }), 200
\ No newline at end of file
+    }), 200
+
+
+# 🛡️ Sirf admin token (identity = email, "role": "admin" claim) wale
+# JWT "sub" string hi ho sakta hai, isliye role alag claim mein hai (sellers jaisa)
+def admin_required(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+        if get_jwt().get("role") != "admin":
+            return jsonify({"message": "Admin access chahiye"}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+# --- 📊 PLATFORM STATS (materialized snapshots) ---
+# Final Route: GET /api/admin/stats  -> {"catalog": {...}, "signups": {...}}
+@admin_bp.route("/stats", methods=["GET"])
+@admin_required
+def get_stats():
+    try:
+        return jsonify({name: get_snapshot(name) for name in SNAPSHOTS}), 200
+    except Exception as e:
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+# Final Route: GET /api/admin/stats/<name>  (catalog | signups)
+@admin_bp.route("/stats/<name>", methods=["GET"])
+@admin_required
+def get_stats_snapshot(name):
+    if name not in SNAPSHOTS:
+        return jsonify({"message": f"Unknown snapshot, use one of: {', '.join(SNAPSHOTS)}"}), 404
+    try:
+        return jsonify(get_snapshot(name)), 200
+    except Exception as e:
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
+
+# Final Route: POST /api/admin/stats/refresh?name=catalog  (name na ho toh saare)
+@admin_bp.route("/stats/refresh", methods=["POST"])
+@admin_required
+def refresh_stats():
+    name = request.args.get("name")
+    if name and name not in SNAPSHOTS:
+        return jsonify({"message": f"Unknown snapshot, use one of: {', '.join(SNAPSHOTS)}"}), 404
+    try:
+        refreshed = [refresh_snapshot(n) for n in ([name] if name else SNAPSHOTS)]
+        return jsonify({
+            "message": "Stats refreshed",
+            "refreshed": [{"name": r["_id"], "buildMs": r["buildMs"]} for r in refreshed],
+        }), 200
+    except Exception as e:
+        return jsonify({"message": f"Server error: {str(e)}"}), 500
@@ -0,0 +1,230 @@
+import json
+import time
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from bson import ObjectId
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.routing import Route
+from werkzeug.datastructures import MultiDict
+
+from json_provider import dumps_bytes
+from repositories.products_repository import (
+    filter_collation, get_all_products_async, get_facet_counts_async, get_product_by_id_async,
+    get_products_by_ids_async, get_products_page_cached_async, listing_query, parse_fields, search_filter,
+    select_fields,
+)
+from routes.http_cache import listing_etag, parse_modified, product_etag
+from routes.products import MAX_BATCH_IDS, MAX_PAGE_SIZE
+from routes.search import SEARCH_LIMIT, indexed_search, parse_search_fields
+from services import facets
+from services.metrics import http_request_seconds, span
+from services.search_index import search_index
+
+# Async read routes (asgi.py)
+# Browsing wale hot GETs: /api/products, /api/product/<id>, /api/search, /api/products/batch.
+# Mongo I/O await hota hai, toh ek process hazaaron open connections rakh sakta hai bina
+# har ek ke liye OS thread ke. Query building, cache keys, serializers aur search index
+# wahi hain jo Flask routes use karte hain; response/ETag behaviour bhi same.
+
+
+def _args(request):
+    # werkzeug MultiDict taaki facets.parse_filters / .get(type=...) same chalein
+    return MultiDict(request.query_params.multi_items())
+
+
+def _json(body, status=200):
+    return Response(dumps_bytes(body), status_code=status, media_type="application/json")
+
+
+def _is_not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match ho toh If-Modified-Since ignore hota hai (RFC 9110)
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or any(t.removeprefix("W/").strip('"') == etag for t in tags)
+    if_modified_since = request.headers.get("if-modified-since")
+    if last_modified and if_modified_since:
+        try:
+            return last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_json(request, etag, build_body, last_modified=None):
+    """routes.http_cache.conditional_json ka Starlette version (same headers, same 304)."""
+    last_modified = parse_modified(last_modified)
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": f"public, max-age={request.app.state.config['HTTP_CACHE_MAX_AGE']}",
+    }
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    if _is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    with span("serialize.json"):
+        body = dumps_bytes(build_body())
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# --- 🔍 PUBLIC ROUTES ---
+
+# Final Route: GET /api/product/<id>
+async def get_single_product(request):
+    id = request.path_params["id"]
+    if not ObjectId.is_valid(id):
+        return _json({"error": "Invalid ID format"}, 400)
+
+    try:
+        product = await get_product_by_id_async(request.app.state.db, id)
+    except Exception as e:
+        return _json({"error": str(e)}, 500)
+
+    if product:
+        return conditional_json(request, product_etag(product), lambda: product,
+                                last_modified=product.get("updatedAt"))
+    return _json({"error": "Product not found"}, 404)
+
+
+# Final Route: GET /api/products?category=..&brand=..&min_price=..&max_price=..&min_rating=..&facets=1
+async def get_products(request):
+    args = _args(request)
+    cursor = args.get('cursor')
+
+    try:
+        limit = min(max(int(args.get('limit', 20)), 1), MAX_PAGE_SIZE)
+        fields = parse_fields(args.get('fields'))
+    except ValueError as e:
+        return _json({"error": str(e)}, 400)
+    filters = facets.parse_filters(args)
+    base_query, query, collation, scope = listing_query(filters, args.get('exclude'))
+
+    db = request.app.state.db
+    try:
+        page = await get_products_page_cached_async(db, scope, query_filter=query, limit=limit,
+                                                    sort=args.get('sort', '_id'), cursor=cursor,
+                                                    collation=collation, view="card", fields=fields)
+    except ValueError as e:
+        return _json({"error": str(e)}, 400)
+
+    etag = listing_etag(page["items"], page["next_cursor"])
+
+    if facets.wants_facets(args):
+        try:
+            counts = await get_facet_counts_async(db, base_query, filters, collation)
+        except Exception as e:
+            return _json({"error": str(e)}, 500)
+        body = {**page, "facets": counts}
+        etag = listing_etag(page["items"], f'{page["next_cursor"]}|{json.dumps(counts, sort_keys=True)}')
+        return conditional_json(request, etag, lambda: body)
+
+    if cursor or args.get('paginate') in ("1", "true"):
+        return conditional_json(request, etag, lambda: page)
+
+    response = conditional_json(request, etag, lambda: page["items"])
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return response
+
+
+# Final Route: GET /api/products/batch?ids=a,b,c  (ya POST {"ids": [...]})
+async def get_products_batch(request):
+    args = _args(request)
+    if request.method == "POST":
+        try:
+            payload = await request.json()
+        except ValueError:
+            payload = None
+        ids = payload.get("ids") if isinstance(payload, dict) else None
+    else:
+        ids = [i for i in (args.get("ids") or "").split(",") if i.strip()]
+    if not isinstance(ids, list) or not ids:
+        return _json({"error": "ids required"}, 400)
+
+    # Order same rakho, duplicates hatao
+    ids = list(dict.fromkeys(str(i).strip() for i in ids))
+    if len(ids) > MAX_BATCH_IDS:
+        return _json({"error": f"At most {MAX_BATCH_IDS} ids per request"}, 400)
+
+    try:
+        fields = parse_fields(args.get('fields'))
+    except ValueError as e:
+        return _json({"error": str(e)}, 400)
+
+    valid_ids = [i for i in ids if ObjectId.is_valid(i)]
+    try:
+        found = await get_products_by_ids_async(request.app.state.db, valid_ids)
+    except Exception as e:
+        return _json({"error": str(e)}, 500)
+
+    items = [found[i] for i in valid_ids if i in found]
+    if fields:
+        items = [select_fields(p, fields) for p in items]
+    missing = [i for i in ids if i not in found]
+
+    body = {"items": items, "missing": missing}
+    return conditional_json(request, listing_etag(items, ",".join(missing)), lambda: body)
+
+
+# Final Route: GET /api/search/?q=..&facets=1
+async def search_products(request):
+    args = _args(request)
+    query_text = args.get('q', '')
+
+    if not query_text:
+        return _json([])
+
+    try:
+        fields = parse_search_fields(args.get('fields'))
+    except ValueError as e:
+        return _json({"error": str(e)}, 400)
+
+    filters = facets.parse_filters(args)
+    with_facets = facets.wants_facets(args)
+
+    try:
+        # ⚡ In-memory index: DB await nahi, par scoring + facet counting CPU kaam hai
+        # (bade match sets pe 100ms+), isliye thread pool pe, event loop pe nahi
+        if search_index.built_at is not None:
+            results, counts = await run_in_threadpool(indexed_search, query_text, filters, with_facets, fields)
+        else:
+            # Warmup abhi chal raha hai: regex fallback, Mongo pe await
+            db = request.app.state.db
+            regex_filter = search_filter(query_text)
+            collation = filter_collation(filters)
+            results = await get_all_products_async(db, query_filter=facets.apply_filters(regex_filter, filters),
+                                                   limit=SEARCH_LIMIT, collation=collation, view="card",
+                                                   fields=fields)
+            counts = await get_facet_counts_async(db, regex_filter, filters, collation) if with_facets else None
+    except Exception as e:
+        print(f"--- ERROR: Search Failed: {str(e)} ---")
+        return _json({"error": "Internal Server Error"}, 500)
+
+    if counts is None:
+        return conditional_json(request, listing_etag(results), lambda: results)
+    body = {"items": results, "facets": counts}
+    return conditional_json(request, listing_etag(results, json.dumps(counts, sort_keys=True)), lambda: body)
+
+
+# --- 📈 METRICS ---
+
+def observed(rule, handler):
+    # Flask hooks yahan nahi chalte, toh same histogram mein "asgi" blueprint label ke saath
+    async def endpoint(request):
+        start = time.perf_counter()
+        response = await handler(request)
+        http_request_seconds.observe(time.perf_counter() - start, "asgi", rule, request.method,
+                                     str(response.status_code))
+        return response
+    return endpoint
+
+
+routes = [
+    Route("/api/products", observed("/api/products", get_products), methods=["GET"]),
+    Route("/api/products/batch", observed("/api/products/batch", get_products_batch), methods=["GET", "POST"]),
+    Route("/api/product/{id}", observed("/api/product/<id>", get_single_product), methods=["GET"]),
+    Route("/api/search/", observed("/api/search/", search_products), methods=["GET"]),
+]
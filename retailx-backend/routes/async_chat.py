@@ -0,0 +1,73 @@
+from concurrent.futures import TimeoutError as CallTimeout
+
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from routes import chat
+from routes.async_catalog import observed
+from routes.chat import BUSY_REPLY, sse
+from services.executor import PoolSaturated
+
+# Async chat routes (asgi.py)
+# Flask wale /api/chat/ aur /api/chat/stream jaise hi (same ChatService, same responses),
+# par Gemini ka wait event loop pe hota hai. WSGI pe ek slow reply ya open SSE stream
+# poora request thread rok leta tha; yahan sirf llm_executor ka worker busy rehta hai.
+
+
+async def _message(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    return data.get("message") if isinstance(data, dict) else None
+
+
+# Final Route: POST /api/chat/
+async def chat_endpoint(request):
+    user_message = await _message(request)
+    if not user_message:
+        return JSONResponse({"reply": "Bhai, kuch toh likho!"}, 400)
+
+    try:
+        reply, cached = await chat.chat_service.reply_async(user_message)
+        return JSONResponse({"reply": reply, "cached": cached})
+    except PoolSaturated:
+        return JSONResponse({"reply": BUSY_REPLY}, 503, headers={"Retry-After": "2"})
+    except CallTimeout:
+        return JSONResponse({"reply": BUSY_REPLY}, 504)
+    except Exception as e:
+        print(f"Chat Route Error: {e}")
+        return JSONResponse({"reply": BUSY_REPLY}, 500)
+
+
+# Final Route: POST /api/chat/stream
+async def chat_stream(request):
+    user_message = await _message(request)
+    if not user_message:
+        return JSONResponse({"reply": "Bhai, kuch toh likho!"}, 400)
+
+    try:
+        chunks = await chat.chat_service.stream_reply_async(user_message)
+    except PoolSaturated:
+        return JSONResponse({"reply": BUSY_REPLY}, 503, headers={"Retry-After": "2"})
+
+    async def events():
+        try:
+            async for chunk in chunks:
+                yield sse("delta", {"text": chunk})
+            yield sse("done", {})
+        except CallTimeout:
+            print("Chat Stream Timeout")
+            yield sse("error", {"reply": BUSY_REPLY, "code": "timeout"})
+        except Exception as e:
+            print(f"Chat Stream Error: {e}")
+            yield sse("error", {"reply": BUSY_REPLY, "code": "error"})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+routes = [
+    Route("/api/chat/", observed("/api/chat/", chat_endpoint), methods=["POST"]),
+    Route("/api/chat/stream", observed("/api/chat/stream", chat_stream), methods=["POST"]),
+]
@@ -1,12 +1,17 @@
+from concurrent.futures import TimeoutError as HashTimeout
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token
-from extensions import mongo, bcrypt
+from extensions import mongo
+from services.executor import PoolSaturated
+from services.password_hashing import hash_password, verify_and_upgrade
 import re
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 
 PASSWORD_REGEX = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*[\W_]).{8,}$')
 
+BUSY_RESPONSE = {"message": "Too many requests, thodi der baad try karo"}
+
 @auth_bp.route("/register", methods=["POST"])
 def register():
     data = request.json
@@ -23,7 +28,13 @@ def register():
     if mongo.db.users.find_one({"email": email}):
         return jsonify({"message": "User already exists"}), 409
 
-    hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+    try:
+        hashed_password = hash_password(password)
+    except PoolSaturated:
+        return jsonify(BUSY_RESPONSE), 429, {"Retry-After": "1"}
+    except HashTimeout:
+        # bcrypt queue bahut lambi: 500 nahi, thodi der baad retry
+        return jsonify(BUSY_RESPONSE), 503, {"Retry-After": "5"}
 
     mongo.db.users.insert_one({
         "email": email,
@@ -43,7 +54,22 @@ def login():
 
     user = mongo.db.users.find_one({"email": email})
 
-    if not user or not bcrypt.check_password_hash(user["password"], password):
+    if not user:
+        return jsonify({"message": "Invalid credentials"}), 401
+
+    def save_hash(new_hash):
+        mongo.db.users.update_one({"_id": user["_id"]}, {"$set": {"password": new_hash}})
+
+    try:
+        # Cost badli ho toh background mein naye cost se rehash
+        valid = verify_and_upgrade(user["password"], password, save_hash)
+    except PoolSaturated:
+        return jsonify(BUSY_RESPONSE), 429, {"Retry-After": "1"}
+    except HashTimeout:
+        # bcrypt queue bahut lambi: 500 nahi, thodi der baad retry
+        return jsonify(BUSY_RESPONSE), 503, {"Retry-After": "5"}
+
+    if not valid:
         return jsonify({"message": "Invalid credentials"}), 401
 
     access_token = create_access_token(identity=email)
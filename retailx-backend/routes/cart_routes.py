@@ -0,0 +1,91 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from repositories.orders_repository import (
+    CheckoutError, checkout, get_cart_items, get_orders, price_cart,
+    remove_cart_item, replace_cart, set_cart_item,
+)
+
+cart_bp = Blueprint("cart", __name__)
+
+# 🛒 GET CART (prices/stock DB se revalidated)
+# Final Route: GET /api/cart
+@cart_bp.route("/cart", methods=["GET"])
+@jwt_required()
+def get_cart():
+    try:
+        return jsonify(price_cart(get_cart_items(get_jwt_identity()))), 200
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+# Final Route: PUT /api/cart  Body: {"items": [{"product_id", "quantity"}]}
+# Frontend ka local cart ek baar mein sync karne ke liye
+@cart_bp.route("/cart", methods=["PUT"])
+@jwt_required()
+def sync_cart():
+    try:
+        items = (request.json or {}).get("items", [])
+        if not isinstance(items, list):
+            return jsonify({"message": "items list chahiye"}), 400
+        lines = replace_cart(get_jwt_identity(), items)
+        return jsonify(price_cart(lines)), 200
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+# Final Route: POST /api/cart/items  Body: {"product_id", "quantity"}
+@cart_bp.route("/cart/items", methods=["POST"])
+@jwt_required()
+def add_cart_item():
+    try:
+        data = request.json or {}
+        lines = set_cart_item(get_jwt_identity(), data.get("product_id"), data.get("quantity", 1))
+        return jsonify(price_cart(lines)), 200
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+# Final Route: DELETE /api/cart/items/<product_id>
+@cart_bp.route("/cart/items/<product_id>", methods=["DELETE"])
+@jwt_required()
+def delete_cart_item(product_id):
+    try:
+        email = get_jwt_identity()
+        remove_cart_item(email, product_id)
+        return jsonify(price_cart(get_cart_items(email))), 200
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+# 💳 CHECKOUT
+# Final Route: POST /api/cart/checkout  Body (optional): {"items": [...], "expected_total": 1234.5}
+# Stock atomically reserve hota hai; kuch bhi fail ho toh 409 + issues, kuch reserve nahi rehta
+@cart_bp.route("/cart/checkout", methods=["POST"])
+@jwt_required()
+def place_order():
+    try:
+        data = request.get_json(silent=True) or {}
+        order = checkout(get_jwt_identity(), data.get("items"), data.get("expected_total"))
+        return jsonify({
+            "message": "Order placed successfully",
+            "order_id": str(order["_id"]),
+            "total": order["total"],
+        }), 201
+    except CheckoutError as e:
+        return jsonify({"message": str(e), "issues": e.issues}), 409
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+# 📦 MY ORDERS
+# Final Route: GET /api/orders
+@cart_bp.route("/orders", methods=["GET"])
+@jwt_required()
+def my_orders():
+    try:
+        return jsonify(get_orders(get_jwt_identity())), 200
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
@@ -1,30 +1,45 @@
-import os
-from flask import Blueprint, request, jsonify
-from google import genai
+import json
+from concurrent.futures import TimeoutError as CallTimeout
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from extensions import mongo
-from dotenv import load_dotenv
-
-# .env file se keys load karne ke liye zaroori hai
-load_dotenv()
+from services import catalog_events
+from services.chat_service import ChatService
+from services.executor import BoundedExecutor, PoolSaturated
+from services.llm import LazyModelClient, create_model_client
+from services.retrieval_index import RETRIEVAL_PROJECTION, retrieval_index
 
 chat_bp = Blueprint('chat_bp', __name__)
 
-# API Key check karein
-api_key = os.getenv("GEMINI_API_KEY")
+# init_chat(app) se banta hai (create_app ke andar)
+chat_service = None
 
-if not api_key:
-    # Ye server terminal mein dikhega agar key nahi mili toh
-    print("❌ ERROR: GEMINI_API_KEY missing! Apni .env file check karo.")
+# Is se kam cosine score wale matches noise hain (init_chat config se set karta hai)
+retrieval_min_score = 0.05
 
-# AI Client Initialization
-client_ai = genai.Client(api_key=api_key)
+def _context_line(name, brand, price, rating, style, concern):
+    return (
+        f"- {name} (Brand: {brand})\n"
+        f"  Price: ₹{price} | Rating: {rating}⭐\n"
+        f"  Best for: {style} and {concern}.\n"
+    )
 
 def get_products_from_db(query):
-    """Database se products fetch karne ka function"""
+    """Chat context ke liye products: pehle in-memory vector index, warna database"""
     if not query:
         return "No query provided."
         
     query = query.lower()
+
+    # ⚡ Vector index ready hai toh DB scan nahi; koi achha match na mile toh top rated dikhao
+    if retrieval_index.built_at is not None:
+        matches = [p for p, _ in retrieval_index.search(query, k=5, min_score=retrieval_min_score)]
+        if not matches:
+            matches = retrieval_index.top_rated(8)
+        product_list = "".join(
+            _context_line(p["name"], p["brand"], p["finalPrice"], p["rating"], p["style"], p["concern"])
+            for p in matches
+        )
+        return product_list if product_list else "No specific beauty products found for this query."
     
     # Generic keywords for broad search
     generic_keywords = ["what", "have", "items", "products", "list", "inventory", "show", "all", "beauty"]
@@ -53,17 +68,72 @@ def get_products_from_db(query):
         for p in results:
             style = p.get('aiMetadata', {}).get('style', 'General')
             concern = p.get('aiMetadata', {}).get('concern', 'daily use')
-            product_list += (
-                f"- {p.get('name')} (Brand: {p.get('brand')})\n"
-                f"  Price: ₹{p.get('finalPrice')} | Rating: {p.get('rating')}⭐\n"
-                f"  Best for: {style} and {concern}.\n"
-            )
+            product_list += _context_line(p.get('name'), p.get('brand'), p.get('finalPrice'), p.get('rating'), style, concern)
         
         return product_list if product_list else "No specific beauty products found for this query."
     
     except Exception as e:
+        # ChatService error pakad ke fallback context deta hai (aur usse cache nahi karta)
         print(f"DB Fetch Error: {e}")
-        return "Error fetching products from database."
+        raise
+
+def init_chat(app):
+    """Chat service from app config; Gemini client pehli chat request tak nahi banta."""
+    global chat_service, retrieval_min_score
+    config = app.config
+    retrieval_min_score = config["RETRIEVAL_MIN_SCORE"]
+    api_key = config["GEMINI_API_KEY"]
+    model_backend = config["CHAT_MODEL_BACKEND"]
+
+    if not api_key and model_backend == "gemini" and not config.get("TESTING"):
+        # Ye server terminal mein dikhega agar key nahi mili toh
+        print("❌ ERROR: GEMINI_API_KEY missing! Apni .env file check karo.")
+
+    # AI Client (lazy): genai import + Client sirf chat use hone pe
+    client_ai = LazyModelClient(lambda: create_model_client(model_backend, api_key=api_key))
+
+    # Gemini calls ke liye alag bounded pool: chat burst product/search workers ko nahi khayega
+    llm_executor = BoundedExecutor(
+        max_workers=config["CHAT_MAX_CONCURRENCY"],
+        max_queue=config["CHAT_MAX_QUEUE"],
+        name="chat-llm",
+    )
+
+    # Context + reply cache (CHAT_CACHE_URL=redis://... se workers ke beech shared)
+    chat_service = ChatService(
+        client_ai,
+        get_products_from_db,
+        cache_url=config["CHAT_CACHE_URL"],
+        context_ttl=config["CHAT_CONTEXT_CACHE_TTL"],
+        reply_ttl=config["CHAT_REPLY_CACHE_TTL"],
+        executor=llm_executor,
+        timeout=config["CHAT_TIMEOUT_SECONDS"],
+    )
+
+BUSY_REPLY = "Arey yaar, system thoda busy hai. Dubara try karo?"
+
+# Chat context sirf inhi fields se banta hai (index aur DB fallback dono); checkout ka
+# stock $inc ya seller ka stock update context nahi badalta, toh reply cache bhi nahi jaata
+CONTEXT_FIELDS = tuple(RETRIEVAL_PROJECTION)
+
+def _field(doc, path):
+    for part in path.split("."):
+        doc = doc.get(part) if isinstance(doc, dict) else None
+    return doc
+
+def changes_chat_context(before, after):
+    if before is None or after is None:
+        return True
+    if any(_field(before, f) != _field(after, f) for f in CONTEXT_FIELDS):
+        return True
+    # In stock <-> out of stock badla toh suggestions badal sakti hain
+    return ((before.get("stock") or 0) > 0) != ((after.get("stock") or 0) > 0)
+
+@catalog_events.subscribe_batch
+def _invalidate_chat_cache(changes):
+    # Poore batch pe ek hi bump (redis pe ek INCR), per item nahi
+    if chat_service is not None and any(changes_chat_context(b, a) for b, a in changes):
+        chat_service.invalidate()
 
 @chat_bp.route('/', methods=['POST']) 
 def chat_endpoint():
@@ -75,30 +145,58 @@ def chat_endpoint():
         if not user_message:
             return jsonify({"reply": "Bhai, kuch toh likho!"}), 400
 
-        # Database se products ka context nikalna
-        context_data = get_products_from_db(user_message)
-
-        # AI ko instruct karna
-        system_instruction = f"""
-        You are the 'RetailX Beauty Expert'. 
-        Current Inventory Info:
-        {context_data}
-
-        RULES:
-        1. Always suggest products only from the inventory provided above.
-        2. If a user has a specific skin concern (like acne, dry skin, etc.), match it with the 'Best for' section.
-        3. If no products match, tell them we don't have that specific item but suggest the closest alternative from the inventory.
-        4. Keep the conversation friendly, Hinglish (Hindi + English) is okay if the user uses it.
-        """
-
-        # Gemini model call
-        response = client_ai.models.generate_content(
-            model="gemini-1.5-flash", 
-            contents=f"{system_instruction}\nUser: {user_message}"
-        )
+        # Cache hit pe na DB retrieval hoti hai na Gemini call
+        reply, cached = chat_service.reply(user_message)
         
-        return jsonify({"reply": response.text})
+        return jsonify({"reply": reply, "cached": cached})
 
+    except PoolSaturated:
+        # Saare LLM slots busy: wait karwane ki jagah turant mana karo
+        return jsonify({"reply": BUSY_REPLY}), 503, {"Retry-After": "2"}
+    except CallTimeout:
+        return jsonify({"reply": BUSY_REPLY}), 504
     except Exception as e:
         print(f"Chat Route Error: {e}")
-        return jsonify({"reply": "Arey yaar, system thoda busy hai. Dubara try karo?"}), 500
\ No newline at end of file
+        return jsonify({"reply": BUSY_REPLY}), 500
+
+
+def sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+# --- 🌊 STREAMING CHAT (Server-Sent Events) ---
+# Final Route: POST /api/chat/stream
+# Gemini ke tokens aate hi "delta" events bhejte hain, end mein "done".
+# Model call llm_executor pe chalti hai, par WSGI pe har open stream ek request thread
+# bhi rokta hai. asgi.py mode mein /api/chat/ aur /api/chat/stream routes/async_chat.py
+# se serve hote hain: wait event loop pe, thread sirf executor ka.
+@chat_bp.route('/stream', methods=['POST'])
+def chat_stream():
+    data = request.json or {}
+    user_message = data.get("message")
+
+    if not user_message:
+        return jsonify({"reply": "Bhai, kuch toh likho!"}), 400
+
+    try:
+        chunks = chat_service.stream_reply(user_message)
+    except PoolSaturated:
+        return jsonify({"reply": BUSY_REPLY}), 503, {"Retry-After": "2"}
+
+    def events():
+        try:
+            for chunk in chunks:
+                yield sse("delta", {"text": chunk})
+            yield sse("done", {})
+        except CallTimeout:
+            # Headers ja chuke hain, 504 nahi de sakte: client ko timeout event
+            print("Chat Stream Timeout")
+            yield sse("error", {"reply": BUSY_REPLY, "code": "timeout"})
+        except Exception as e:
+            print(f"Chat Stream Error: {e}")
+            yield sse("error", {"reply": BUSY_REPLY, "code": "error"})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
\ No newline at end of file
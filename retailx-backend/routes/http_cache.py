@@ -0,0 +1,63 @@
+import hashlib
+from datetime import datetime, timezone
+
+from flask import Response, current_app, jsonify, request
+
+from services.metrics import span
+
+# Conditional GET helpers (ETag / Last-Modified / 304)
+# ETag product "version" se banta hai, isliye 304 dene ke liye body serialize
+# karni hi nahi padti.
+
+
+def product_etag(product):
+    return f'{product["id"]}-{product.get("version", 0)}'
+
+
+def listing_etag(items, extra=""):
+    """Strong ETag for a list of products: hash of every (id, version) in order."""
+    digest = hashlib.blake2b(digest_size=16)
+    for item in items:
+        digest.update(f'{item["id"]}:{item.get("version", 0)};'.encode())
+    digest.update(str(extra).encode())
+    return digest.hexdigest()
+
+
+def parse_modified(value):
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        # If-None-Match ho toh If-Modified-Since ignore hota hai (RFC 9110)
+        return request.if_none_match.contains(etag)
+    if last_modified and request.if_modified_since:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def conditional_json(etag, build_body, max_age=None, last_modified=None):
+    """304 if the client already has `etag`, otherwise jsonify(build_body()) with cache headers."""
+    if max_age is None:
+        max_age = current_app.config.get("HTTP_CACHE_MAX_AGE", 30)
+    last_modified = parse_modified(last_modified)
+
+    if _is_not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        with span("serialize.json"):
+            response = jsonify(build_body())
+
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if last_modified:
+        response.last_modified = last_modified
+    return response
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from extensions import mongo
+from services.feed import category_top_lists
 
 preferences_bp = Blueprint("preferences", __name__, url_prefix="/api")
 
@@ -20,4 +21,23 @@ def save_preferences():
         {"$set": {"preferences": categories}}
     )
 
-    return jsonify({"message": "Preferences saved successfully"}), 200
\ No newline at end of file
+    return jsonify({"message": "Preferences saved successfully"}), 200
+
+
+# 🏠 PERSONALIZED FEED
+# Final Route: GET /api/feed?limit=40
+# Preferred categories ki precomputed top lists (memory se) fairly interleave hoti hain
+MAX_FEED_SIZE = 100
+
+@preferences_bp.route("/feed", methods=["GET"])
+@jwt_required()
+def get_feed():
+    limit = min(max(request.args.get("limit", 40, type=int), 1), MAX_FEED_SIZE)
+
+    categories = []
+    if get_jwt().get("role") != "admin":  # admin ki preferences nahi hoti
+        user = mongo.db.users.find_one({"email": get_jwt_identity()}, {"preferences": 1})
+        categories = (user or {}).get("preferences", [])
+
+    items = category_top_lists.feed(categories, limit)
+    return jsonify({"categories": categories, "items": items}), 200
@@ -1,13 +1,25 @@
+import json
+
 from flask import Blueprint, jsonify, request
 from extensions import mongo
-from repositories.products_repository import get_all_products, format_product
+from repositories.indexes import CATEGORY_COLLATION
+from repositories.products_repository import (
+    get_products_page_cached, get_product_by_id, listing_scope, listing_query, insert_product, update_product_fields,
+    get_products_by_ids, get_facet_counts, parse_fields, select_fields, compute_final_price, VIEWS,
+    delete_product as delete_product_doc,
+)
 from bson import ObjectId
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
+from routes.http_cache import conditional_json, listing_etag, product_etag
+from services import facets
+from services.similar_products import similar_products
 
 # Prefix "/" hi rakha hai kyunki tu frontend change nahi karna chahta tha
 product_bp = Blueprint('product_bp', __name__)
 
+MAX_PAGE_SIZE = 100
+
 # --- 🔍 PUBLIC ROUTES ---
 
 @product_bp.route("/api/product/<id>", methods=["GET"])
@@ -16,34 +28,116 @@ def get_single_product(id):
         if not ObjectId.is_valid(id):
             return jsonify({"error": "Invalid ID format"}), 400
 
-        query_id = ObjectId(id)
-        product = mongo.db.products.find_one({"_id": query_id})
+        # Cache se (miss pe DB), already format_product kiya hua
+        product = get_product_by_id(id)
         
         if product:
-            # Consistent formatting for frontend
-            return jsonify(format_product(product)), 200
+            # Client ke paas same version hai toh 304, body serialize hi nahi hoti
+            return conditional_json(product_etag(product), lambda: product, last_modified=product.get("updatedAt"))
         
         return jsonify({"error": "Product not found"}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Final Route: GET /api/product/<id>/similar?limit=24
+# Precomputed table se (memory lookup); product table mein nahi hai toh same category listing
+@product_bp.route("/api/product/<id>/similar", methods=["GET"])
+def get_similar_products(id):
+    if not ObjectId.is_valid(id):
+        return jsonify({"error": "Invalid ID format"}), 400
+    limit = min(max(request.args.get('limit', 24, type=int), 1), MAX_PAGE_SIZE)
+
+    items = similar_products.similar(id, limit)
+    if items is None:
+        product = get_product_by_id(id)
+        if not product:
+            return jsonify({"error": "Product not found"}), 404
+        query = {"isActive": True, "category": product.get("category"), "_id": {"$ne": ObjectId(id)}}
+        items = get_products_page_cached(listing_scope(product.get("category")), query_filter=query, limit=limit,
+                                         collation=CATEGORY_COLLATION, view="card")["items"]
+
+    return conditional_json(listing_etag(items), lambda: items)
+
+# Final Route: GET /api/products?category=..&brand=A&brand=B&min_price=..&max_price=..&min_rating=4&facets=1
+# facets=1 pe {items, next_cursor, facets}: counts poore match set pe, ek $facet aggregation se
 @product_bp.route("/api/products", methods=["GET"])
 def get_products():
-    category_name = request.args.get('category')
-    limit = int(request.args.get('limit', 20))
     exclude_id = request.args.get('exclude') 
-    
-    query = {"isActive": True}
-    if category_name:
-        query["category"] = {"$regex": f"^{category_name}$", "$options": "i"}
-    if exclude_id:
+    cursor = request.args.get('cursor')
+    sort = request.args.get('sort', '_id')
+
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), MAX_PAGE_SIZE)
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    filters = facets.parse_filters(request.args)
+    base_query, query, collation, scope = listing_query(filters, exclude_id)
+
+    try:
+        page = get_products_page_cached(scope, query_filter=query, limit=limit, sort=sort,
+                                        cursor=cursor, collation=collation, view="card", fields=fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = listing_etag(page["items"], page["next_cursor"])
+
+    if facets.wants_facets(request.args):
         try:
-            query["_id"] = {"$ne": ObjectId(exclude_id)}
-        except:
-            pass 
+            counts = get_facet_counts(base_query, filters, collation)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+        body = {**page, "facets": counts}
+        etag = listing_etag(page["items"], f'{page["next_cursor"]}|{json.dumps(counts, sort_keys=True)}')
+        return conditional_json(etag, lambda: body)
+
+    # Purane clients ko list hi milti hai; paginate=1 ya cursor bhejne pe {items, next_cursor}
+    if cursor or request.args.get('paginate') in ("1", "true"):
+        return conditional_json(etag, lambda: page)
+
+    response = conditional_json(etag, lambda: page["items"])
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return response
+
+
+# Final Route: GET /api/products/batch?ids=a,b,c  (ya POST {"ids": [...]} lambi lists ke liye)
+# Cart, wishlist, recently-viewed jaise pages ek hi request mein saare products le lete hain
+MAX_BATCH_IDS = 200
+
+@product_bp.route("/api/products/batch", methods=["GET", "POST"])
+def get_products_batch():
+    if request.method == "POST":
+        payload = request.get_json(silent=True)
+        ids = payload.get("ids") if isinstance(payload, dict) else None
+    else:
+        ids = [i for i in (request.args.get("ids") or "").split(",") if i.strip()]
+    if not isinstance(ids, list) or not ids:
+        return jsonify({"error": "ids required"}), 400
+
+    # Order same rakho, duplicates hatao
+    ids = list(dict.fromkeys(str(i).strip() for i in ids))
+    if len(ids) > MAX_BATCH_IDS:
+        return jsonify({"error": f"At most {MAX_BATCH_IDS} ids per request"}), 400
 
-    products = get_all_products(query_filter=query, limit=limit)
-    return jsonify(products)
+    try:
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    valid_ids = [i for i in ids if ObjectId.is_valid(i)]
+    try:
+        found = get_products_by_ids(valid_ids)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    items = [found[i] for i in valid_ids if i in found]
+    if fields:
+        items = [select_fields(p, fields) for p in items]
+    missing = [i for i in ids if i not in found]
+
+    body = {"items": items, "missing": missing}
+    return conditional_json(listing_etag(items, ",".join(missing)), lambda: body)
 
 
 # --- 🏪 SELLER SPECIFIC ROUTES ---
@@ -61,7 +155,7 @@ def add_product():
 
         price = float(data.get('price', 0))
         discount = float(data.get('discount', 0))
-        final_price = price - (price * (discount / 100))
+        final_price = compute_final_price(price, discount)
 
         new_product = {
             "name": data.get('name'),
@@ -84,7 +178,7 @@ def add_product():
             "images": data.get('images', [])
         }
 
-        mongo.db.products.insert_one(new_product)
+        insert_product(new_product)
         return jsonify({"msg": "Product Added Successfully!"}), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -95,11 +189,10 @@ def add_product():
 def get_seller_products():
     try:
         seller_email = get_jwt_identity()
-        # MongoDB se products nikale
-        products = list(mongo.db.products.find({"seller_email": seller_email}))
-        
-        # Format_product use karke bhej rahe hain taaki "_id" ki jagah "id" mile (Frontend requirement)
-        return jsonify([format_product(p) for p in products]), 200
+        card = VIEWS["card"]
+        # Sirf card fields mangwate hain, aur card serializer "_id" ki jagah "id" deta hai (Frontend requirement)
+        products = mongo.db.products.find({"seller_email": seller_email}, card["projection"])
+        return jsonify([card["serializer"](p) for p in products]), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -112,12 +205,9 @@ def delete_product(id):
         if not ObjectId.is_valid(id):
             return jsonify({"error": "Invalid ID"}), 400
             
-        result = mongo.db.products.delete_one({
-            "_id": ObjectId(id), 
-            "seller_email": seller_email
-        })
+        deleted = delete_product_doc(id, seller_email=seller_email)
         
-        if result.deleted_count == 1:
+        if deleted is not None:
             return jsonify({"msg": "Product deleted"}), 200
         return jsonify({"msg": "Product not found or unauthorized"}), 404
     except Exception as e:
@@ -140,7 +230,7 @@ def update_product(id):
             if current:
                 price = float(data.get('price', current.get('price', 0)))
                 discount = float(data.get('discount', current.get('discount', 0)))
-                data['finalPrice'] = price - (price * (discount / 100))
+                data['finalPrice'] = compute_final_price(price, discount)
         
         if 'stock' in data:
             data['stock'] = int(data['stock'])
@@ -148,12 +238,9 @@ def update_product(id):
         # _id ko update query se bahar rakho
         update_data = {k: v for k, v in data.items() if k not in ['_id', 'id']}
         
-        result = mongo.db.products.update_one(
-            {"_id": ObjectId(id), "seller_email": seller_email},
-            {"$set": update_data}
-        )
+        updated = update_product_fields(id, update_data, seller_email=seller_email)
         
-        if result.matched_count == 1:
+        if updated is not None:
             return jsonify({"msg": "Product updated"}), 200
         return jsonify({"msg": "Unauthorized or not found"}), 404
     except Exception as e:
@@ -1,9 +1,65 @@
+import json
+
 from flask import Blueprint, jsonify, request
 # Repository se functions import kar rahe hain
-from repositories.products_repository import get_all_products
+from repositories.cache import LRUTTLCache
+from repositories.products_repository import (
+    get_all_products, get_facet_counts, filter_collation, parse_fields, search_filter, select_fields,
+    CARD_PROJECTION,
+)
+from routes.http_cache import conditional_json, listing_etag
+from services import facets
+from services.search_index import search_index
+from services.suggest_index import MAX_RESULTS, suggest_index
 
 search_bp = Blueprint('search_bp', __name__)
 
+SEARCH_LIMIT = 50
+
+# Indexed search ke (results, facet counts): bade match sets pe scoring + counting 100ms+
+# hai. Key mein index generation hai, toh koi bhi write/rebuild purani entries unreachable
+# kar deta hai. Process-local hi, kyunki index bhi har worker ka apna hai.
+_results_cache = LRUTTLCache(max_size=1024, ttl=300)
+
+
+def _search_response(results, counts):
+    # Purane clients ko list hi milti hai; facets=1 pe {items, facets}
+    if counts is None:
+        return conditional_json(listing_etag(results), lambda: results)
+    body = {"items": results, "facets": counts}
+    return conditional_json(listing_etag(results, json.dumps(counts, sort_keys=True)), lambda: body)
+
+
+def parse_search_fields(raw):
+    fields = parse_fields(raw)
+    # Index mein sirf card view hai, toh fields= bhi card fields tak limited hai
+    if fields and not all(f == "id" or f in CARD_PROJECTION for f in fields):
+        raise ValueError("Search results only support card fields")
+    return fields
+
+
+def indexed_search(query_text, filters, with_facets, fields=None):
+    """(results, counts) from the in-memory index; asgi search route bhi yahi use karta hai."""
+    key = json.dumps([search_index.generation, query_text.strip().lower(), filters, with_facets],
+                     sort_keys=True, default=str)
+    cached = _results_cache.get(key)
+    if cached is not None:
+        results, counts = cached
+    elif with_facets or facets.has_filters(filters):
+        # Filters/counts poore match set pe, phir top 50
+        results, counts = facets.count_facets(search_index.search(query_text, limit=None), filters,
+                                              with_counts=with_facets)
+        results = results[:SEARCH_LIMIT]
+        _results_cache.set(key, (results, counts))
+    else:
+        results, counts = search_index.search(query_text, limit=SEARCH_LIMIT), None
+        _results_cache.set(key, (results, counts))
+    if fields:
+        results = [select_fields(doc, fields) for doc in results]
+    return results, counts
+
+
+# Final Route: GET /api/search/?q=..&brand=..&min_price=..&max_price=..&min_rating=..&facets=1
 @search_bp.route("/", methods=["GET"])
 def search_products():
     query_text = request.args.get('q', '')
@@ -11,30 +67,36 @@ def search_products():
     if not query_text:
         return jsonify([])
 
-    # 🛠️ DEBUG 1: Pehle check karo search text kya aa raha hai
-    print(f"\n--- DEBUG: Searching for text: '{query_text}' ---")
-
-    # Filter ko thoda flexible banate hain
-    search_filter = {
-        "isActive": True,  # Compass mein check karo icon 'bool' hai ya 'abc'
-        "$or": [
-            {"name": {"$regex": query_text, "$options": "i"}},
-            {"brand": {"$regex": query_text, "$options": "i"}},
-            {"category": {"$regex": query_text, "$options": "i"}},
-            {"tags": {"$regex": query_text, "$options": "i"}}
-        ]
-    }
-    
-    # 🛠️ DEBUG 2: Dekho filter final kaisa dikh raha hai
-    print(f"--- DEBUG: Final Filter: {search_filter}")
+    try:
+        fields = parse_search_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    filters = facets.parse_filters(request.args)
+    with_facets = facets.wants_facets(request.args)
 
     try:
-        results = get_all_products(query_filter=search_filter, limit=50)
-        
-        # 🛠️ DEBUG 3: Dekho database se kitne items mile
-        print(f"--- DEBUG: Items Found in DB: {len(results)} ---\n")
-        
-        return jsonify(results)
+        # ⚡ Inverted index se ranked results (BM25), DB scan nahi
+        if search_index.built_at is not None:
+            return _search_response(*indexed_search(query_text, filters, with_facets, fields))
+
+        # Index abhi build nahi hua (warmup chal raha hai ya startup pe DB down tha) toh purana regex fallback
+        regex_filter = search_filter(query_text)
+        collation = filter_collation(filters)
+        results = get_all_products(query_filter=facets.apply_filters(regex_filter, filters), limit=SEARCH_LIMIT,
+                                   collation=collation, view="card", fields=fields)
+        counts = get_facet_counts(regex_filter, filters, collation) if with_facets else None
+        return _search_response(results, counts)
     except Exception as e:
         print(f"--- ERROR: Search Failed: {str(e)} ---")
-        return jsonify({"error": "Internal Server Error"}), 500
\ No newline at end of file
+        return jsonify({"error": "Internal Server Error"}), 500
+
+
+# ⌨️ SEARCH-AS-YOU-TYPE
+# Final Route: GET /api/search/suggest?q=sham&limit=10
+# Sirf in-memory prefix index, DB kabhi nahi (har keystroke pe request aati hai)
+@search_bp.route("/suggest", methods=["GET"])
+def suggest():
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', MAX_RESULTS, type=int), 1), MAX_RESULTS)
+    return jsonify(suggest_index.suggest(prefix, limit)), 200
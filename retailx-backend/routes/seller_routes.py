@@ -1,10 +1,17 @@
-from datetime import datetime  # <--- Ye line bilkul top par honi chahiye
+from concurrent.futures import TimeoutError as HashTimeout
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from extensions import mongo, bcrypt
+from extensions import mongo
 from models.seller_model import Seller 
 from flask_cors import cross_origin
-from bson import ObjectId
+from services.executor import PoolSaturated
+from services.password_hashing import hash_password
+from services.product_import import ImportInProgress, start_import, get_job
+from repositories.seller_stats_repository import get_seller_stats, rebuild_seller_stats
+from repositories.products_repository import (
+    insert_product, update_product_fields, delete_product as delete_product_doc, VIEWS,
+    build_seller_product, compute_final_price, parse_tags, bulk_update_products,
+)
 
 seller_bp = Blueprint("seller", __name__)
 
@@ -28,7 +35,7 @@ def register_seller():
         if Seller.find_by_email(email):
             return jsonify({"message": "Seller is already registered!"}), 409
 
-        hashed_pw = bcrypt.generate_password_hash(password).decode('utf-8')
+        hashed_pw = hash_password(password)
         
         # Method call with hashed password
         Seller.create_seller(email, hashed_pw, storeName, registrationId)
@@ -36,6 +43,10 @@ def register_seller():
         token = create_access_token(identity=email, additional_claims={"role": "seller"})
         
         return jsonify({"message": "Seller registered successfully", "token": token}), 201
+    except PoolSaturated:
+        return jsonify({"message": "Server busy, please try again"}), 429, {"Retry-After": "1"}
+    except HashTimeout:
+        return jsonify({"message": "Server busy, please try again"}), 503, {"Retry-After": "5"}
     except Exception as e:
         print(f"Register Error: {e}")
         return jsonify({"message": f"Server error: {str(e)}"}), 500
@@ -57,7 +68,7 @@ def login_seller():
 
         seller = Seller.find_by_email(email)
 
-        if not seller or not bcrypt.check_password_hash(seller["password"], password):
+        if not seller or not Seller.verify_password(seller, password):
             return jsonify({"message": "Invalid credentials"}), 401
 
         token = create_access_token(identity=email, additional_claims={"role": "seller"})
@@ -67,6 +78,10 @@ def login_seller():
             "token": token,
             "seller": {"email": email, "storeName": seller.get("storeName")}
         }), 200
+    except PoolSaturated:
+        return jsonify({"message": "Server busy, please try again"}), 429, {"Retry-After": "1"}
+    except HashTimeout:
+        return jsonify({"message": "Server busy, please try again"}), 503, {"Retry-After": "5"}
     except Exception as e:
         print(f"Login Error: {e}")
         return jsonify({"message": "Server error during login"}), 500
@@ -79,11 +94,34 @@ def login_seller():
 def get_inventory():
     try:
         current_seller_email = get_jwt_identity()
-        # Sirf wahi products dikhao jo is logged-in seller ke hain
-        products = list(mongo.db.products.find({"seller_email": current_seller_email}))
-        for p in products:
-            p["_id"] = str(p["_id"])
-        return jsonify(products), 200
+        # Sirf wahi products dikhao jo is logged-in seller ke hain (aiMetadata/images ke bina)
+        # Raw docs hi bhej rahe hain, ObjectId/datetime JSON provider sambhal leta hai
+        products = mongo.db.products.find({"seller_email": current_seller_email}, VIEWS["seller-inventory"]["projection"])
+        return jsonify(list(products)), 200
+    except Exception as e:
+        return jsonify({"message": f"Server Error: {str(e)}"}), 500
+
+# --- 📊 SELLER STATS ---
+# Final Route: GET /api/seller/stats
+# Precomputed doc (har product write pe update hota hai), inventory scan nahi
+@seller_bp.route("/stats", methods=["GET"])
+@jwt_required()
+@cross_origin()
+def get_stats():
+    try:
+        return jsonify(get_seller_stats(get_jwt_identity())), 200
+    except Exception as e:
+        return jsonify({"message": f"Server Error: {str(e)}"}), 500
+
+# Final Route: POST /api/seller/stats/rebuild  (products se dobara count, on demand reconcile)
+@seller_bp.route("/stats/rebuild", methods=["POST"])
+@jwt_required()
+@cross_origin()
+def rebuild_stats():
+    try:
+        seller_email = get_jwt_identity()
+        rebuild_seller_stats(seller_email)
+        return jsonify(get_seller_stats(seller_email)), 200
     except Exception as e:
         return jsonify({"message": f"Server Error: {str(e)}"}), 500
 
@@ -97,51 +135,10 @@ def add_product():
         data = request.json
         seller_email = get_jwt_identity()
         
-        # Numbers convert kar rahe hain calculations ke liye
-        price = float(data.get('price', 0))
-        discount = float(data.get('discount', 0))
-        final_price = price - (price * (discount / 100))
-
-        # Frontend se tags 'string' mein aa sakte hain (comma separated), unhe list mein convert karo
-        # tags_raw = data.get('tags', [])
-        # tags_list = [t.strip() for t in tags_raw.split(",")] if isinstance(tags_raw, str) else tags_raw
-
-        # Backend logic to handle both "string" and ["array"]
-        tags_data = data.get('tags', [])
-
-        if isinstance(tags_data, str):
-            # Agar user ne "shampoo, organic" bheja toh array ban jayega ["shampoo", "organic"]
-            # Agar sirf "shampoo" bheja toh ["shampoo"] ban jayega
-            tags_list = [t.strip() for t in tags_data.split(",") if t.strip()]
-        elif isinstance(tags_data, list):
-            tags_list = tags_data
-        else:
-            tags_list = []
-
-        # # Phir database mein tags_list ko save karo
-        # "tags": tags_list
-
-        new_product = {
-            "name": data.get('name'),
-            "brand": data.get('brand', "Generic"),
-            "price": price,
-            "discount": discount,
-            "finalPrice": final_price,
-            "stock": int(data.get('stock', 0)),
-            "rating": 0,
-            "imageURL": data.get('imageURL', ""),
-            "description": data.get('description', ""),
-            "category": data.get('category', "Other"),
-            "subCategory": data.get('subCategory', ""),
-            "seller_email": seller_email, # Isse connect hota hai product seller se
-            "isActive": True,
-            "tags": tags_list,
-            "highlights": data.get('highlights', []), # Expecting Array from frontend
-            "specs": data.get('specs', {}),           # Expecting Object from frontend
-            "createdAt":datetime.utcnow() # Better to use datetime.utcnow()
-        }
+        # Numbers convert, tags "string" ya ["array"] dono, finalPrice calculate (repository helper)
+        new_product = build_seller_product(data, seller_email)
         
-        result = mongo.db.products.insert_one(new_product)
+        result = insert_product(new_product)
         return jsonify({"message": "Product Live ho gaya!", "id": str(result.inserted_id)}), 201
     except Exception as e:
         return jsonify({"message": str(e)}), 500
@@ -156,16 +153,7 @@ def update_product(id):
         data = request.json
         price = float(data.get('price', 0))
         discount = float(data.get('discount', 0))
-        tags_data = data.get('tags', [])
-
-        if isinstance(tags_data, str):
-            # Agar user ne "shampoo, organic" bheja toh array ban jayega ["shampoo", "organic"]
-            # Agar sirf "shampoo" bheja toh ["shampoo"] ban jayega
-            tags_list = [t.strip() for t in tags_data.split(",") if t.strip()]
-        elif isinstance(tags_data, list):
-            tags_list = tags_data
-        else:
-            tags_list = []
+        tags_list = parse_tags(data.get('tags', []))
         
         update_data = {
             "name": data.get('name'),
@@ -175,7 +163,7 @@ def update_product(id):
             "brand": data.get('brand'),
             "price": price,
             "discount": discount,
-            "finalPrice": price - (price * (discount / 100)),
+            "finalPrice": compute_final_price(price, discount),
             "stock": int(data.get('stock', 0)),
             "imageURL": data.get('imageURL'),
             "tags": tags_list,
@@ -185,12 +173,9 @@ def update_product(id):
         }
         
         # Product ID se dhoond kar update karo
-        result = mongo.db.products.update_one(
-            {"_id": ObjectId(id)}, 
-            {"$set": update_data}
-        )
+        updated = update_product_fields(id, update_data)
         
-        if result.matched_count == 0:
+        if updated is None:
             return jsonify({"message": "Product nahi mila"}), 404
 
         return jsonify({"message": "Product details updated successfully"}), 200
@@ -204,8 +189,8 @@ def update_product(id):
 @cross_origin()
 def delete_product(id):
     try:
-        result = mongo.db.products.delete_one({"_id": ObjectId(id)})
-        if result.deleted_count == 0:
+        deleted = delete_product_doc(id)
+        if deleted is None:
             return jsonify({"message": "Product already deleted or not found"}), 404
             
         return jsonify({"message": "Product removed from market"}), 200
@@ -220,15 +205,83 @@ def delete_product(id):
 def update_stock(id):
     try:
         new_stock = request.json.get('stock')
-        mongo.db.products.update_one(
-            {"_id": ObjectId(id)}, 
-            {"$set": {"stock": int(new_stock)}}
-        )
+        update_product_fields(id, {"stock": int(new_stock)})
         return jsonify({"message": "Stock updated"}), 200
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
 
+# --- 📦 BULK STOCK / PRICE UPDATE ---
+# Final Route: PATCH /api/seller/product/bulk-update
+# Body: {"updates": [{"id", "stock"}, {"id", "price", "discount"}, ...]}
+MAX_BULK_UPDATES = 1000
+
+@seller_bp.route("/product/bulk-update", methods=["PATCH"])
+@jwt_required()
+@cross_origin()
+def bulk_update():
+    try:
+        updates = (request.json or {}).get("updates")
+        if not isinstance(updates, list) or not updates:
+            return jsonify({"message": "updates list chahiye"}), 400
+        if len(updates) > MAX_BULK_UPDATES:
+            return jsonify({"message": f"Ek baar mein max {MAX_BULK_UPDATES} updates"}), 400
+
+        results = bulk_update_products(updates, get_jwt_identity())
+        updated = sum(1 for r in results if r["status"] == "updated")
+        return jsonify({
+            "message": f"{updated}/{len(results)} products updated",
+            "updated": updated,
+            "failed": len(results) - updated,
+            "results": results,
+        }), 200
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+# --- 📥 BULK IMPORT (CSV / NDJSON) ---
+# Final Route: POST /api/seller/product/import  (multipart "file", optional "format")
+# File background mein batches mein import hoti hai; job_id se progress poll karo
+@seller_bp.route("/product/import", methods=["POST"])
+@jwt_required()
+@cross_origin()
+def import_products():
+    try:
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            return jsonify({"message": "CSV ya NDJSON file upload karo (field: file)"}), 400
+
+        job_id = start_import(upload, get_jwt_identity(), request.form.get("format"))
+        return jsonify({
+            "message": "Import shuru ho gaya",
+            "job_id": job_id,
+            "status_url": f"/api/seller/product/import/{job_id}",
+        }), 202
+    except ImportInProgress as e:
+        # Ek seller ka ek hi import ek time pe (har job ek background thread hai)
+        return jsonify({
+            "message": "Pichla import abhi chal raha hai, khatam hone do",
+            "job_id": str(e),
+            "status_url": f"/api/seller/product/import/{e}",
+        }), 409
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+# Final Route: GET /api/seller/product/import/<job_id>
+@seller_bp.route("/product/import/<job_id>", methods=["GET"])
+@jwt_required()
+@cross_origin()
+def import_status(job_id):
+    try:
+        job = get_job(job_id, get_jwt_identity())
+        if not job:
+            return jsonify({"message": "Import job nahi mila"}), 404
+        return jsonify(job), 200
+    except Exception as e:
+        return jsonify({"message": str(e)}), 500
+
+
 
 
 
@@ -245,7 +298,6 @@ def get_seller_profile():
         if not seller:
             return jsonify({"message": "Seller not found"}), 404
         
-        seller["_id"] = str(seller["_id"])
         return jsonify(seller), 200
     except Exception as e:
         return jsonify({"message": str(e)}), 500
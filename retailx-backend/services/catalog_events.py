@@ -0,0 +1,45 @@
+# Catalog write hooks
+# In-memory indexes (search etc.) yahan subscribe karte hain, aur repository ke
+# write helpers har insert/update/delete ke baad publish karte hain. Bulk writes
+# (insert_products, bulk_update_products) publish_many se poora batch ek saath bhejte
+# hain, taaki batch listeners (seller stats) ek hi DB round trip mein sab laga sakein.
+
+_listeners = []
+_batch_listeners = []
+
+
+def subscribe(listener):
+    """Register a listener(before, after) for product writes."""
+    _listeners.append(listener)
+    return listener
+
+
+def subscribe_batch(listener):
+    """Register a listener(changes) that gets every batch as one [(before, after)] list."""
+    _batch_listeners.append(listener)
+    return listener
+
+
+def _notify(listener, *args):
+    try:
+        listener(*args)
+    except Exception as e:
+        # Ek listener fail ho toh write request fail nahi honi chahiye
+        print(f"Catalog listener error ({listener.__name__}): {e}")
+
+
+def publish_many(changes):
+    """Notify listeners of a batch of (before, after) writes."""
+    changes = list(changes)
+    if not changes:
+        return
+    for listener in list(_listeners):
+        for before, after in changes:
+            _notify(listener, before, after)
+    for listener in list(_batch_listeners):
+        _notify(listener, changes)
+
+
+def publish(before, after):
+    """Notify listeners. Insert: before=None, delete: after=None."""
+    publish_many([(before, after)])
@@ -0,0 +1,220 @@
+import asyncio
+import queue
+import re
+import threading
+import time
+from concurrent.futures import TimeoutError as CallTimeout
+
+from repositories.cache import create_cache
+from services.executor import BoundedExecutor
+from services.metrics import span, timed
+
+# Chatbot ka two-tier cache
+#   Tier 1: normalized query -> inventory context string (DB retrieval bachata hai)
+#   Tier 2: (normalized message, inventory version) -> model reply (Gemini call bachata hai)
+# Dono keys mein inventory version hai, toh catalog write pe invalidate() karte hi
+# purane context aur replies unreachable ho jaate hain.
+#
+# Model calls ek bounded executor pe chalti hain (per-call timeout ke saath); pool
+# full ho toh PoolSaturated turant raise hota hai aur route 503 de deta hai.
+# *_async methods (asgi.py ke chat routes) model ka wait event loop pe karte hain:
+# reply aane tak koi request thread nahi rukta, sirf executor ka worker.
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+_SPACES_RE = re.compile(r"\s+")
+
+SYSTEM_PROMPT = """
+        You are the 'RetailX Beauty Expert'. 
+        Current Inventory Info:
+        {context}
+
+        RULES:
+        1. Always suggest products only from the inventory provided above.
+        2. If a user has a specific skin concern (like acne, dry skin, etc.), match it with the 'Best for' section.
+        3. If no products match, tell them we don't have that specific item but suggest the closest alternative from the inventory.
+        4. Keep the conversation friendly, Hinglish (Hindi + English) is okay if the user uses it.
+        """
+
+
+def normalize_message(message):
+    """"Show ALL products!!" aur "show all products" ek hi key banate hain."""
+    text = _PUNCTUATION_RE.sub(" ", message.lower())
+    return _SPACES_RE.sub(" ", text).strip()
+
+
+def build_prompt(context, message):
+    return f"{SYSTEM_PROMPT.format(context=context)}\nUser: {message}"
+
+
+_DONE = object()
+
+
+async def _single(text):
+    yield text
+
+
+# Retrieval fail ho toh model ko ye context milta hai; na ye cache hota hai na iska reply
+CONTEXT_UNAVAILABLE = "Error fetching products from database."
+
+
+class ChatService:
+    def __init__(self, model_client, retrieve_context, cache_url=None,
+                 context_cache_size=1024, context_ttl=300, reply_cache_size=2048, reply_ttl=600,
+                 executor=None, timeout=30):
+        self.model_client = model_client
+        self.retrieve_context = retrieve_context
+        self.executor = executor or BoundedExecutor(max_workers=8, max_queue=16, name="chat-llm")
+        self.timeout = timeout
+        self.context_cache = create_cache(cache_url, max_size=context_cache_size, ttl=context_ttl)
+        self.reply_cache = create_cache(cache_url, max_size=reply_cache_size, ttl=reply_ttl)
+
+    def inventory_version(self):
+        return self.context_cache.generation("inventory")
+
+    def invalidate(self):
+        """Catalog badla: dono tiers ki purani entries chhod do."""
+        self.context_cache.bump("inventory")
+
+    def get_context(self, message, version=None):
+        normalized = normalize_message(message)
+        version = self.inventory_version() if version is None else version
+        key = f"chat-ctx:{version}:{normalized}"
+        context = self.context_cache.get(key)
+        if context is None:
+            try:
+                context = self.retrieve_context(normalized)
+            except Exception as e:
+                print(f"DB Fetch Error: {e}")
+                return CONTEXT_UNAVAILABLE
+            self.context_cache.set(key, context)
+        return context
+
+    def _prepare(self, message):
+        """(reply cache key, cached reply, context); cached reply mila toh context None."""
+        normalized = normalize_message(message)
+        version = self.inventory_version()
+        key = f"chat-reply:{version}:{normalized}"
+        cached = self.reply_cache.get(key)
+        if cached is not None:
+            return key, cached, None
+        return key, None, self.get_context(message, version)
+
+    def _remember(self, key, context, text):
+        if text and context != CONTEXT_UNAVAILABLE:
+            self.reply_cache.set(key, text)
+
+    def reply(self, message):
+        """Returns (reply_text, cache_hit)."""
+        key, cached, context = self._prepare(message)
+        if cached is not None:
+            return cached, True
+
+        generate = timed("llm.generate", self.model_client.generate)
+        text = self.executor.run(generate, build_prompt(context, message), timeout=self.timeout)
+        self._remember(key, context, text)
+        return text, False
+
+    async def reply_async(self, message):
+        """reply() for the event loop: cache/context lookups in a thread, model call awaited."""
+        key, cached, context = await asyncio.to_thread(self._prepare, message)
+        if cached is not None:
+            return cached, True
+
+        generate = timed("llm.generate", self.model_client.generate)
+        future = self.executor.submit(generate, build_prompt(context, message))
+        try:
+            text = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise CallTimeout("Model call timed out")
+        await asyncio.to_thread(self._remember, key, context, text)
+        return text, False
+
+    def _producer(self, key, context, prompt, emit, cancelled):
+        """Executor task: model ke chunks emit(), end mein _DONE (error ho toh pehle exception)."""
+        def produce():
+            parts = []
+            try:
+                with span("llm.generate_stream"):
+                    for chunk in self.model_client.generate_stream(prompt):
+                        if cancelled.is_set():
+                            return  # client chala gaya, aadha reply cache nahi karna
+                        parts.append(chunk)
+                        emit(chunk)
+                self._remember(key, context, "".join(parts))
+            except Exception as e:
+                emit(e)
+            finally:
+                emit(_DONE)
+        return produce
+
+    def stream_reply(self, message):
+        """Iterator of reply chunks. Submits the model call right away, so PoolSaturated is raised here."""
+        key, cached, context = self._prepare(message)
+        if cached is not None:
+            return iter([cached])
+
+        chunks = queue.Queue()
+        cancelled = threading.Event()
+        self.executor.submit(self._producer(key, context, build_prompt(context, message), chunks.put, cancelled))
+        return self._drain(chunks, cancelled)
+
+    async def stream_reply_async(self, message):
+        """Async iterator of reply chunks; like stream_reply(), PoolSaturated is raised by this await."""
+        key, cached, context = await asyncio.to_thread(self._prepare, message)
+        if cached is not None:
+            return _single(cached)
+
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+            except RuntimeError:
+                cancelled.set()   # event loop band ho gaya
+
+        self.executor.submit(self._producer(key, context, build_prompt(context, message), emit, cancelled))
+        return self._drain_async(chunks, cancelled)
+
+    def _drain(self, chunks, cancelled):
+        deadline = time.monotonic() + self.timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CallTimeout("Model stream timed out")
+                try:
+                    item = chunks.get(timeout=remaining)
+                except queue.Empty:
+                    raise CallTimeout("Model stream timed out")
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+
+    async def _drain_async(self, chunks, cancelled):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise CallTimeout("Model stream timed out")
+                try:
+                    item = await asyncio.wait_for(chunks.get(), remaining)
+                except asyncio.TimeoutError:
+                    raise CallTimeout("Model stream timed out")
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+
+    def stats(self):
+        return {"context": self.context_cache.stats(), "reply": self.reply_cache.stats()}
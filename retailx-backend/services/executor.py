@@ -0,0 +1,49 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Bounded worker pool
+# Slow kaam (LLM calls waghera) yahan chalta hai taaki request threads ek burst mein
+# saare na phas jaayein. Queue bhi full ho toh submit turant PoolSaturated deta hai.
+
+
+class PoolSaturated(Exception):
+    pass
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers, max_queue=0, name="pool"):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        # Running + waiting tasks ki total limit
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._in_flight = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit without blocking; raises PoolSaturated when workers and queue are all busy."""
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated(f"{self.name} pool saturated ({self.max_workers} workers, {self.max_queue} queued)")
+        with self._count_lock:
+            self._in_flight += 1
+        try:
+            future = self._pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """submit() and wait; raises concurrent.futures.TimeoutError after `timeout` seconds."""
+        return self.submit(fn, *args, **kwargs).result(timeout=timeout)
+
+    def _release(self):
+        with self._count_lock:
+            self._in_flight -= 1
+        self._slots.release()
@@ -0,0 +1,186 @@
+import math
+
+# Faceted navigation (/api/search aur /api/products pe ?facets=1)
+# Counts poore match set pe hote hain, sirf pehle page pe nahi. Har facet apna
+# filter chhod ke baaki sab filters pe count hota hai (disjunctive): "Brand = Boat"
+# select karne ke baad bhi baaki brands ke counts dikhte rahein.
+# Mongo path: ek hi $facet aggregation. In-memory path (search index): ek hi pass.
+
+PRICE_BUCKETS = [0, 500, 1000, 2500, 5000, 10000, 25000, 50000]
+RATING_BANDS = [0, 1, 2, 3, 4]
+MAX_FACET_VALUES = 20
+FACETS = ("category", "brand", "price", "rating")
+
+
+def parse_filters(args):
+    """Facet filters from query args: category/brand repeatable, min/max_price, min_rating."""
+    def values(name):
+        return list(dict.fromkeys(v.strip() for v in args.getlist(name) if v.strip()))
+
+    return {
+        "category": values("category"),
+        "brand": values("brand"),
+        "min_price": args.get("min_price", type=float),
+        "max_price": args.get("max_price", type=float),
+        "min_rating": args.get("min_rating", type=float),
+    }
+
+
+def wants_facets(args):
+    return args.get("facets") in ("1", "true")
+
+
+def has_filters(filters):
+    return any(v not in (None, []) for v in filters.values())
+
+
+# --- 🍃 MONGO ---
+
+def mongo_clauses(filters):
+    """{facet: query clause}; har facet ka clause alag taaki use skip kar sakein."""
+    clauses = {}
+    if filters["category"]:
+        clauses["category"] = {"category": {"$in": filters["category"]}}
+    if filters["brand"]:
+        clauses["brand"] = {"brand": {"$in": filters["brand"]}}
+    price = {}
+    if filters["min_price"] is not None:
+        price["$gte"] = filters["min_price"]
+    if filters["max_price"] is not None:
+        price["$lte"] = filters["max_price"]
+    if price:
+        clauses["price"] = {"finalPrice": price}
+    if filters["min_rating"] is not None:
+        clauses["rating"] = {"rating": {"$gte": filters["min_rating"]}}
+    return clauses
+
+
+def apply_filters(query, filters):
+    """Base query + saare facet filters (listing ke items ke liye)."""
+    query = dict(query)
+    for clause in mongo_clauses(filters).values():
+        query.update(clause)
+    return query
+
+
+def facet_pipeline(base_query, filters):
+    clauses = mongo_clauses(filters)
+
+    def others(facet):
+        match = {}
+        for name, clause in clauses.items():
+            if name != facet:
+                match.update(clause)
+        return [{"$match": match}] if match else []
+
+    def top_values(field):
+        return [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": MAX_FACET_VALUES},
+        ]
+
+    def buckets(group_by, boundaries):
+        # Aakhri bucket open-ended; null/negative "other" mein jaata hai aur ignore hota hai
+        return [{"$bucket": {"groupBy": group_by, "boundaries": boundaries + [math.inf],
+                             "default": "other", "output": {"count": {"$sum": 1}}}}]
+
+    return [
+        {"$match": base_query},
+        {"$facet": {
+            "category": others("category") + top_values("category"),
+            "brand": others("brand") + top_values("brand"),
+            "price": others("price") + buckets("$finalPrice", PRICE_BUCKETS),
+            "rating": others("rating") + buckets({"$ifNull": ["$rating", 0]}, RATING_BANDS),
+        }},
+    ]
+
+
+def from_aggregation(doc):
+    """$facet output -> response shape (same as count_facets)."""
+    def bucket_counts(rows):
+        return {row["_id"]: row["count"] for row in rows if row["_id"] != "other"}
+
+    return {
+        "category": [{"value": row["_id"], "count": row["count"]} for row in doc.get("category", []) if row["_id"]],
+        "brand": [{"value": row["_id"], "count": row["count"]} for row in doc.get("brand", []) if row["_id"]],
+        "price": _bucket_list(PRICE_BUCKETS, bucket_counts(doc.get("price", []))),
+        "rating": _bucket_list(RATING_BANDS, bucket_counts(doc.get("rating", []))),
+    }
+
+
+# --- 🧠 IN-MEMORY (search results) ---
+
+def _bucket_of(value, boundaries):
+    if not isinstance(value, (int, float)) or value < boundaries[0]:
+        return None
+    lower = boundaries[0]
+    for bound in boundaries:
+        if value < bound:
+            break
+        lower = bound
+    return lower
+
+
+def _bucket_list(boundaries, counts):
+    # Khaali buckets bhi bhejte hain taaki UI ke options stable rahein
+    uppers = boundaries[1:] + [None]
+    return [{"min": low, "max": high, "count": counts.get(low, 0)} for low, high in zip(boundaries, uppers)]
+
+
+def _top_values(counts):
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:MAX_FACET_VALUES]
+    return [{"value": value, "count": count} for value, count in ranked]
+
+
+def _failed_facets(card, filters):
+    failed = []
+    if filters["category"] and str(card.get("category") or "").casefold() not in filters["category"]:
+        failed.append("category")
+    if filters["brand"] and str(card.get("brand") or "").casefold() not in filters["brand"]:
+        failed.append("brand")
+    price = card.get("finalPrice") or 0
+    if (filters["min_price"] is not None and price < filters["min_price"]) or \
+            (filters["max_price"] is not None and price > filters["max_price"]):
+        failed.append("price")
+    if filters["min_rating"] is not None and (card.get("rating") or 0) < filters["min_rating"]:
+        failed.append("rating")
+    return failed
+
+
+def count_facets(cards, filters, with_counts=True):
+    """One pass over the full match set: (cards passing every filter, facet counts or None).
+
+    Card jo sirf ek filter pe fail hota hai woh usi facet ke count mein jaata hai
+    (disjunctive counts), do ya zyada pe fail ho toh kahin nahi.
+    """
+    # Category/brand Mongo collation jaisa case-insensitive
+    filters = {**filters, "category": {c.casefold() for c in filters["category"]},
+               "brand": {b.casefold() for b in filters["brand"]}}
+    matched = []
+    counts = {facet: {} for facet in FACETS}
+    for card in cards:
+        failed = _failed_facets(card, filters)
+        if not failed:
+            matched.append(card)
+        if not with_counts or len(failed) > 1:
+            continue
+        keys = {
+            "category": card.get("category"),
+            "brand": card.get("brand"),
+            "price": _bucket_of(card.get("finalPrice"), PRICE_BUCKETS),
+            "rating": _bucket_of(card.get("rating") or 0, RATING_BANDS),
+        }
+        for facet in (failed or FACETS):
+            key = keys[facet]
+            if key is not None and key != "":
+                counts[facet][key] = counts[facet].get(key, 0) + 1
+
+    if not with_counts:
+        return matched, None
+    return matched, {
+        "category": _top_values(counts["category"]),
+        "brand": _top_values(counts["brand"]),
+        "price": _bucket_list(PRICE_BUCKETS, counts["price"]),
+        "rating": _bucket_list(RATING_BANDS, counts["rating"]),
+    }
@@ -0,0 +1,129 @@
+import heapq
+import threading
+import time
+
+from extensions import mongo
+from repositories.products_repository import CARD_PROJECTION, format_product_card
+from services import catalog_events, scheduler
+
+# Personalized feed (/api/feed) ke liye precomputed per-category top lists
+# Har category ke liye rating, reviewsCount aur discount teeno se top-N nikaalke ek
+# list mein mila dete hain. Request pe sirf user ki preferences ki lists memory se
+# round-robin interleave hoti hain, koi product query nahi.
+
+TOP_N = 30
+RANKINGS = {
+    "rating": lambda p: (p.get("rating") or 0, p.get("reviewsCount") or 0),
+    "reviewsCount": lambda p: (p.get("reviewsCount") or 0, p.get("rating") or 0),
+    "discount": lambda p: (p.get("discount") or 0, p.get("rating") or 0),
+}
+ALL = "*"  # preferences na hon toh poore catalog ki top list
+
+FEED_PROJECTION = {**CARD_PROJECTION, "isActive": 1}
+
+
+def _category_key(category):
+    return str(category or "").casefold()
+
+
+def _blend(ranked_lists, n):
+    """Round-robin across the ranking lists, skipping duplicates."""
+    seen, blended = set(), []
+    for row in zip(*ranked_lists):
+        for product_id in row:
+            if product_id not in seen:
+                seen.add(product_id)
+                blended.append(product_id)
+    # zip sabse chhoti list pe ruk jaata hai; bache hue bhi jod do
+    for ranked in ranked_lists:
+        for product_id in ranked:
+            if product_id not in seen:
+                seen.add(product_id)
+                blended.append(product_id)
+    return blended[:n]
+
+
+class CategoryTopLists:
+    def __init__(self, top_n=TOP_N):
+        self.top_n = top_n
+        self.built_at = None
+        self._lock = threading.Lock()
+        self._lists = {}   # category key -> [product ids]
+        self._cards = {}   # product id -> card view
+
+    def __len__(self):
+        return len([k for k in self._lists if k != ALL])
+
+    def rebuild(self, products):
+        by_category, cards = {}, {}
+        for p in products:
+            if not p.get("isActive", True):
+                continue
+            card = format_product_card(p)
+            cards[card["id"]] = card
+            by_category.setdefault(_category_key(p.get("category")), []).append(p)
+        by_category[ALL] = [p for group in by_category.values() for p in group]
+
+        lists = {}
+        for key, group in by_category.items():
+            ranked = [
+                [str(p["_id"]) for p in heapq.nlargest(self.top_n, group, key=rank)]
+                for rank in RANKINGS.values()
+            ]
+            lists[key] = _blend(ranked, self.top_n)
+
+        with self._lock:
+            self._lists, self._cards = lists, cards
+            self.built_at = time.time()
+
+    def refresh_product(self, before, after):
+        # Lists agle rebuild tak same; bas card (price/stock) taaza rakho ya hata do
+        with self._lock:
+            if after is not None and after.get("isActive", True):
+                product_id = str(after.get("_id"))
+                if product_id in self._cards:
+                    self._cards[product_id] = format_product_card(after)
+            else:
+                self._cards.pop(str((after or before).get("_id")), None)
+
+    def feed(self, categories, limit=40):
+        """Fair interleave of the preferred categories' lists (one product per category per round)."""
+        keys = list(dict.fromkeys(_category_key(c) for c in categories or []))
+        with self._lock:
+            lists = [self._lists[k] for k in keys if k in self._lists] or [self._lists.get(ALL, [])]
+            cards = self._cards
+            seen, items = set(), []
+            for round_no in range(self.top_n):
+                for ranked in lists:
+                    if round_no < len(ranked):
+                        product_id = ranked[round_no]
+                        if product_id in cards and product_id not in seen:
+                            seen.add(product_id)
+                            items.append(cards[product_id])
+                            if len(items) >= limit:
+                                return items
+            return items
+
+
+category_top_lists = CategoryTopLists()
+
+
+@catalog_events.subscribe
+def _on_product_change(before, after):
+    category_top_lists.refresh_product(before, after)
+
+
+def rebuild_from_db():
+    category_top_lists.rebuild(mongo.db.products.find({"isActive": True}, FEED_PROJECTION))
+
+
+def init_feed(app):
+    try:
+        rebuild_from_db()
+        print(f"✅ Feed lists ready: {len(category_top_lists)} categories")
+    except Exception as e:
+        print(f"❌ Feed lists build failed: {e}")
+
+    interval = app.config.get("FEED_REFRESH_SECONDS")
+    if interval:
+        scheduler.every(interval, rebuild_from_db, name="feed-refresh")
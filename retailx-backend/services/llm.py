@@ -0,0 +1,78 @@
+import threading
+import time
+
+# Chat model clients
+# Route sirf .generate(prompt) -> text dekhta hai, toh Gemini ki jagah offline
+# StubModelClient laga ke cache hit rate / latency measure kar sakte hain.
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+
+class GeminiModelClient:
+    def __init__(self, api_key, model=DEFAULT_MODEL):
+        from google import genai
+
+        self.model = model
+        self._client = genai.Client(api_key=api_key)
+
+    def generate(self, prompt):
+        response = self._client.models.generate_content(model=self.model, contents=prompt)
+        return response.text
+
+    def generate_stream(self, prompt):
+        for chunk in self._client.models.generate_content_stream(model=self.model, contents=prompt):
+            if chunk.text:
+                yield chunk.text
+
+
+class StubModelClient:
+    """Offline stand-in for Gemini: fixed latency, deterministic reply, call counter."""
+
+    def __init__(self, latency=0.5):
+        self.latency = latency
+        self.calls = 0
+
+    def _reply_for(self, prompt):
+        user_line = prompt.rsplit("User:", 1)[-1].strip()
+        return f"(stub reply) Aapne pucha: {user_line}"
+
+    def generate(self, prompt):
+        self.calls += 1
+        time.sleep(self.latency)
+        return self._reply_for(prompt)
+
+    def generate_stream(self, prompt):
+        self.calls += 1
+        words = self._reply_for(prompt).split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self.latency / len(words))
+            yield word if i == 0 else " " + word
+
+
+def create_model_client(backend="gemini", api_key=None, model=DEFAULT_MODEL, stub_latency=0.5):
+    if backend == "stub":
+        return StubModelClient(latency=stub_latency)
+    return GeminiModelClient(api_key=api_key, model=model)
+
+
+class LazyModelClient:
+    """Real client pehli generate() pe banta hai (genai import + Client sirf chat use karne wale worker mein)."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def generate(self, prompt):
+        return self.client.generate(prompt)
+
+    def generate_stream(self, prompt):
+        return self.client.generate_stream(prompt)
@@ -0,0 +1,155 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import Response, g, request
+from pymongo import monitoring
+
+# In-process metrics (Prometheus text format, /metrics pe)
+# Har request: blueprint/route latency histogram (before/after hooks)
+# Har Mongo command: collection + operation wise timing (PyMongo CommandListener)
+# Spans: bcrypt, LLM call, JSON serialization jaise hot spots ke liye span("name")
+# Observe = ek bisect + ek lock, request ke time ke saamne negligible.
+# Gunicorn ke har worker ki apni registry hai; Prometheus har worker ko alag scrape kare
+# ya counts sum kare.
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames, buckets=REQUEST_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, seconds, *labels):
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += seconds
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(snapshot):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return "\n".join(lines)
+
+
+_registry = []
+
+
+def histogram(name, help_text, labelnames, buckets=REQUEST_BUCKETS):
+    metric = Histogram(name, help_text, labelnames, buckets)
+    _registry.append(metric)
+    return metric
+
+
+def render():
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+http_request_seconds = histogram(
+    "retailx_http_request_duration_seconds", "Flask request latency", ("blueprint", "route", "method", "status"))
+mongo_command_seconds = histogram(
+    "retailx_mongo_command_duration_seconds", "MongoDB command latency", ("collection", "command", "outcome"),
+    DB_BUCKETS)
+span_seconds = histogram(
+    "retailx_span_duration_seconds", "Timed sections (bcrypt, llm, serialization)", ("span",), DB_BUCKETS + (10, 30))
+
+
+def span(name):
+    """with span("bcrypt.hash"): ..."""
+    return span_seconds.time(name)
+
+
+def timed(name, fn):
+    """fn wrapped in span(name), executor pe submit karne ke liye."""
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+# --- 🍃 MONGO COMMANDS ---
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """Times every command by collection and operation (duration PyMongo khud deta hai)."""
+
+    def __init__(self):
+        self._collections = {}  # (request_id, connection) -> collection; started -> succeeded/failed
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        self._collections[(event.request_id, event.connection_id)] = target if isinstance(target, str) else ""
+
+    def _finish(self, event, outcome):
+        collection = self._collections.pop((event.request_id, event.connection_id), "")
+        mongo_command_seconds.observe(event.duration_micros / 1e6, collection, event.command_name, outcome)
+
+    def succeeded(self, event):
+        self._finish(event, "ok")
+
+    def failed(self, event):
+        self._finish(event, "error")
+
+
+mongo_command_listener = MongoCommandTimer()
+
+
+# --- 🌐 FLASK HOOKS ---
+
+def _before_request():
+    g._metrics_start = time.perf_counter()
+
+
+def _after_request(response):
+    start = g.pop("_metrics_start", None)
+    if start is not None:
+        # Route template ("/api/product/<id>"), asli URL nahi, warna har id ek naya series
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        http_request_seconds.observe(time.perf_counter() - start, request.blueprint or "app", route,
+                                     request.method, str(response.status_code))
+    return response
+
+
+def metrics_endpoint():
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_metrics(app):
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.add_url_rule("/metrics", "metrics", metrics_endpoint, methods=["GET"])
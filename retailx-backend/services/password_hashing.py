@@ -0,0 +1,64 @@
+import os
+
+from extensions import bcrypt
+from services.metrics import span, timed
+from services.executor import BoundedExecutor, PoolSaturated
+
+# bcrypt hashing/checking ek alag bounded pool pe
+# bcrypt jaan-boojh ke slow hai (~250ms @ cost 12). Request thread pe chalaya toh
+# login storm saare workers kha jaata hai. Pool + queue full hone pe PoolSaturated
+# turant raise hota hai, route 429 deta hai. Queue mein AUTH_HASH_TIMEOUT se zyada ruka
+# toh concurrent.futures.TimeoutError, route 503 deta hai.
+
+_executor = BoundedExecutor(max_workers=os.cpu_count() or 2, max_queue=64, name="bcrypt")
+_timeout = 10
+_log_rounds = 12
+
+
+def init_password_hashing(app):
+    global _executor, _timeout, _log_rounds
+    _executor = BoundedExecutor(
+        max_workers=app.config.get("AUTH_POOL_WORKERS") or os.cpu_count() or 2,
+        max_queue=app.config.get("AUTH_POOL_QUEUE", 64),
+        name="bcrypt",
+    )
+    _timeout = app.config.get("AUTH_HASH_TIMEOUT", 10)
+    _log_rounds = app.config.get("BCRYPT_LOG_ROUNDS", 12)
+
+
+def hash_password(password):
+    return _executor.run(timed("bcrypt.hash", bcrypt.generate_password_hash), password, timeout=_timeout).decode("utf-8")
+
+
+def check_password(stored_hash, password):
+    return _executor.run(timed("bcrypt.check", bcrypt.check_password_hash), stored_hash, password, timeout=_timeout)
+
+
+def hash_cost(stored_hash):
+    """"$2b$12$..." -> 12 (None if it doesn't look like a bcrypt hash)."""
+    parts = stored_hash.split("$") if stored_hash else []
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(stored_hash):
+    return hash_cost(stored_hash) != _log_rounds
+
+
+def verify_and_upgrade(stored_hash, password, save_hash):
+    """Check the password; on success with an outdated cost, rehash in the background and save_hash(new)."""
+    if not check_password(stored_hash, password):
+        return False
+
+    if needs_rehash(stored_hash):
+        def rehash():
+            with span("bcrypt.hash"):
+                new_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+            save_hash(new_hash)
+        try:
+            _executor.submit(rehash)
+        except PoolSaturated:
+            pass  # agle login pe ho jaayega
+    return True
@@ -0,0 +1,213 @@
+import csv
+import io
+import json
+import math
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from extensions import mongo
+from repositories.products_repository import build_seller_product, insert_products
+
+# Bulk product import (CSV / NDJSON)
+# Upload pehle temp file mein spool hota hai (poora memory mein nahi), phir background
+# thread file ko row-by-row padhta hai, validate karta hai aur BATCH_SIZE ke batches mein
+# insert_many(ordered=False) karta hai. Progress "import_jobs" collection mein rehta hai.
+# Har seller ka ek time pe ek hi job chalta hai; pehle MAX_REPORTED_ERRORS errors hi
+# store (aur memory mein) hote hain, baaki sirf "failed" count mein judte hain.
+
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+# Itni der se jis "running" job ka progress update nahi hua (process mar gaya), woh naya import nahi rokta
+STALE_JOB_AFTER = timedelta(minutes=15)
+FORMATS = ("csv", "ndjson")
+
+# CSV mein list fields "|" se alag hote hain, specs ek JSON string hota hai
+CSV_LIST_FIELDS = ("highlights",)
+
+
+class ImportInProgress(Exception):
+    pass
+
+
+def detect_format(filename, requested=None):
+    fmt = (requested or "").lower() or os.path.splitext(filename or "")[1].lstrip(".").lower()
+    if fmt == "jsonl":
+        fmt = "ndjson"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', use one of {', '.join(FORMATS)}")
+    return fmt
+
+
+# --- 📄 ROW READERS ---
+# Readers sirf raw rows dete hain; parsing alag hoti hai taaki ek kharab row
+# generator ko band na kare aur baaki file import hoti rahe.
+
+def _csv_row(row):
+    data = {k.strip(): (v or "").strip() for k, v in row.items() if k}
+    for field in CSV_LIST_FIELDS:
+        if field in data:
+            data[field] = [v.strip() for v in data[field].split("|") if v.strip()]
+    if data.get("specs"):
+        data["specs"] = json.loads(data["specs"])
+    else:
+        data.pop("specs", None)
+    return data
+
+
+def iter_rows(f, fmt):
+    """Yields (line number, raw row, parser)."""
+    text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row, _csv_row
+    else:
+        for line_no, line in enumerate(text, start=1):
+            if line.strip():
+                yield line_no, line, json.loads
+
+
+# --- ✅ VALIDATION ---
+
+def validate_row(data, seller_email):
+    """Row -> product document, ya ValueError with a readable message."""
+    if not isinstance(data, dict):
+        raise ValueError("row must be an object")
+    if not str(data.get("name") or "").strip():
+        raise ValueError("name is required")
+
+    try:
+        product = build_seller_product(data, seller_email)
+    except (TypeError, ValueError, OverflowError):
+        # OverflowError: int(float("inf")) jaisa stock
+        raise ValueError("price, discount and stock must be numbers")
+
+    if not product["price"] >= 0:  # NaN bhi yahin pakda jaata hai
+        raise ValueError("price must be >= 0")
+    if not math.isfinite(product["price"]):
+        raise ValueError("price must be a finite number")
+    if not 0 <= product["discount"] <= 100:
+        raise ValueError("discount must be between 0 and 100")
+    if product["stock"] < 0:
+        raise ValueError("stock must be >= 0")
+    if not isinstance(product["highlights"], list) or not isinstance(product["specs"], dict):
+        raise ValueError("highlights must be a list and specs an object")
+    return product
+
+
+# --- 🏃 JOB ---
+
+def _record_batch(job_id, processed, inserted, failed, errors):
+    mongo.db.import_jobs.update_one(
+        {"_id": job_id},
+        {
+            "$inc": {"processed": processed, "inserted": inserted, "failed": failed},
+            "$push": {"errors": {"$each": errors, "$slice": MAX_REPORTED_ERRORS}},
+            "$set": {"updatedAt": datetime.utcnow()},
+        },
+    )
+
+
+def _flush(job_id, batch, errors, failed, processed, room):
+    """Batch insert + progress record; room = job doc mein aur kitne errors aa sakte hain. Returns stored errors."""
+    inserted = 0
+    if batch:
+        docs = [doc for _, doc in batch]
+        written, insert_failed = insert_products(docs)
+        inserted = len(written)
+        failed += len(insert_failed)
+        errors = errors + [{"line": batch[i][0], "error": msg} for i, msg in insert_failed.items()]
+    errors = errors[:room]
+    _record_batch(job_id, processed, inserted, failed, errors)
+    return len(errors)
+
+
+def run_import(job_id, path, fmt, seller_email):
+    batch, errors, failed, processed = [], [], 0, 0
+    reported = 0  # job doc mein ab tak store hue errors
+    try:
+        with open(path, "rb") as f:
+            for line_no, raw, parse in iter_rows(f, fmt):
+                processed += 1
+                error = None
+                try:
+                    row = parse(raw)
+                except ValueError as e:
+                    error = f"could not parse row: {e}"
+                else:
+                    try:
+                        batch.append((line_no, validate_row(row, seller_email)))
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    failed += 1
+                    if reported + len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"line": line_no, "error": error})
+
+                # processed pe flush: kharab rows wali file mein bhi progress dikhe aur memory na bhare
+                if processed >= BATCH_SIZE:
+                    reported += _flush(job_id, batch, errors, failed, processed, MAX_REPORTED_ERRORS - reported)
+                    batch, errors, failed, processed = [], [], 0, 0
+
+        if processed:
+            _flush(job_id, batch, errors, failed, processed, MAX_REPORTED_ERRORS - reported)
+        status, message = "completed", None
+    except Exception as e:
+        status, message = "failed", str(e)
+    finally:
+        os.remove(path)
+
+    mongo.db.import_jobs.update_one(
+        {"_id": job_id},
+        {"$set": {"status": status, "message": message, "finishedAt": datetime.utcnow()}},
+    )
+
+
+def start_import(file_storage, seller_email, fmt=None):
+    """Upload ko disk pe spool karo, job doc banao, background thread shuru karo. Returns job id.
+
+    Seller ka pichla import abhi chal raha ho toh ImportInProgress.
+    """
+    fmt = detect_format(file_storage.filename, fmt)
+    running = mongo.db.import_jobs.find_one({
+        "seller_email": seller_email,
+        "status": "running",
+        "updatedAt": {"$gte": datetime.utcnow() - STALE_JOB_AFTER},
+    }, {"_id": 1})
+    if running:
+        raise ImportInProgress(str(running["_id"]))
+
+    fd, path = tempfile.mkstemp(prefix="retailx-import-", suffix=f".{fmt}")
+    with os.fdopen(fd, "wb") as out:
+        file_storage.save(out)  # chunks mein copy hota hai
+
+    job_id = ObjectId()
+    mongo.db.import_jobs.insert_one({
+        "_id": job_id,
+        "seller_email": seller_email,
+        "filename": file_storage.filename,
+        "format": fmt,
+        "status": "running",
+        "processed": 0,
+        "inserted": 0,
+        "failed": 0,
+        "errors": [],
+        "createdAt": datetime.utcnow(),
+        "updatedAt": datetime.utcnow(),
+    })
+
+    threading.Thread(
+        target=run_import, args=(job_id, path, fmt, seller_email),
+        name=f"import-{job_id}", daemon=True,
+    ).start()
+    return str(job_id)
+
+
+def get_job(job_id, seller_email):
+    if not ObjectId.is_valid(job_id):
+        return None
+    return mongo.db.import_jobs.find_one({"_id": ObjectId(job_id), "seller_email": seller_email})
@@ -0,0 +1,394 @@
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from extensions import mongo
+from services import catalog_events, scheduler
+
+# Chatbot ke liye semantic-ish retrieval
+# Har product ka hashed n-gram vector (words + char trigrams) sparse rakha jaata hai:
+# inverted postings (bucket -> rows, values). Query sirf apne buckets ki postings padhti
+# hai, np.bincount se saare cosine scores, phir argpartition se top-k. Regex scan ya DB call nahi.
+
+# Pure numbers ("634") token nahi bante, warna random collisions noise dete hain
+TOKEN_RE = re.compile(r"[a-z][a-z0-9]*")
+
+# Chat context ke liye kaunse fields aur kitna weight
+FIELD_WEIGHTS = {
+    "name": 2.0,
+    "tags": 1.5,
+    "subCategory": 1.0,
+    "category": 1.0,
+    "aiMetadata.style": 1.5,
+    "aiMetadata.concern": 2.0,
+}
+TRIGRAM_WEIGHT = 0.5
+
+RETRIEVAL_PROJECTION = {
+    "name": 1, "brand": 1, "finalPrice": 1, "rating": 1, "isActive": 1,
+    **{field: 1 for field in FIELD_WEIGHTS},
+}
+
+
+def _field_text(product, field):
+    value = product
+    for part in field.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return str(value) if value else ""
+
+
+def _features(text, weight):
+    """(feature, weight) pairs: words plus char trigrams ("oily" ~ "oil")."""
+    for word in TOKEN_RE.findall(text.lower()):
+        yield "w:" + word, weight
+        padded = f"#{word}#"
+        for i in range(len(padded) - 2):
+            yield "c:" + padded[i:i + 3], weight * TRIGRAM_WEIGHT
+
+
+class _Segment:
+    """Immutable inverted postings: har bucket ke liye (rows, values), bucket order mein.
+
+    CSC layout: bucket b ki postings rows[indptr[b]:indptr[b + 1]] mein hain. Memory
+    sirf non-zero entries ki (~8 bytes each), dim se independent.
+    """
+
+    def __init__(self, indptr, rows, vals, row_ids):
+        self.indptr = indptr
+        self.rows = rows
+        self.vals = vals
+        self.row_ids = row_ids
+
+    @classmethod
+    def build(cls, dim, row_ids, buckets, rows, vals):
+        order = np.argsort(buckets, kind="stable")
+        indptr = np.zeros(dim + 1, dtype=np.int64)
+        np.cumsum(np.bincount(buckets, minlength=dim), out=indptr[1:])
+        return cls(indptr, rows[order].astype(np.int32, copy=False), vals[order], row_ids)
+
+    @classmethod
+    def from_entries(cls, dim, entries):
+        """entries: [(doc_id, buckets, values)]"""
+        row_ids = [doc_id for doc_id, _, _ in entries]
+        if not entries:
+            return cls(np.zeros(dim + 1, dtype=np.int64), _EMPTY_ROWS, _EMPTY_VALS, row_ids)
+        lengths = np.fromiter((len(b) for _, b, _ in entries), dtype=np.int64, count=len(entries))
+        buckets = np.concatenate([b for _, b, _ in entries])
+        vals = np.concatenate([v for _, _, v in entries])
+        rows = np.repeat(np.arange(len(entries), dtype=np.int32), lengths)
+        return cls.build(dim, row_ids, buckets, rows, vals)
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def doc_freq(self):
+        return np.diff(self.indptr).astype(np.float32)
+
+    def score(self, buckets, weights):
+        """Sparse query ke against har row ka dot product (sirf query buckets ki postings padhta hai)."""
+        starts, ends = self.indptr[buckets], self.indptr[buckets + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return np.zeros(len(self), dtype=np.float64)
+        rows = np.concatenate([self.rows[s:e] for s, e in zip(starts, ends)])
+        vals = np.concatenate([self.vals[s:e] for s, e in zip(starts, ends)])
+        return np.bincount(rows, weights=vals * np.repeat(weights, lengths), minlength=len(self))
+
+    def merge(self, dim, dead, delta):
+        """Live rows + delta docs ka naya segment (compaction)."""
+        bucket_of = np.repeat(np.arange(dim, dtype=np.int32), np.diff(self.indptr))
+        keep = ~dead[self.rows]
+        alive = np.flatnonzero(~dead)
+        remap = np.full(len(self), -1, dtype=np.int32)
+        remap[alive] = np.arange(len(alive), dtype=np.int32)
+
+        row_ids = [self.row_ids[r] for r in alive] + list(delta)
+        parts_b, parts_r, parts_v = [bucket_of[keep]], [remap[self.rows[keep]]], [self.vals[keep]]
+        for i, (buckets, vals) in enumerate(delta.values(), start=len(alive)):
+            parts_b.append(buckets)
+            parts_r.append(np.full(len(buckets), i, dtype=np.int32))
+            parts_v.append(vals)
+        return _Segment.build(dim, row_ids, np.concatenate(parts_b), np.concatenate(parts_r),
+                              np.concatenate(parts_v))
+
+
+_EMPTY_ROWS = np.zeros(0, dtype=np.int32)
+_EMPTY_VALS = np.zeros(0, dtype=np.float32)
+_EMPTY_BUCKETS = np.zeros(0, dtype=np.int32)
+
+
+class RetrievalIndex:
+    def __init__(self, dim=1 << 18, max_delta=4096):
+        self.dim = dim
+        self.max_delta = max_delta
+        self.built_at = None
+        self._lock = threading.Lock()
+        # Base segment (rebuild/compaction pe banta hai) + delta (us ke baad ke upserts).
+        # Base ke updated/removed rows _dead se mask hote hain.
+        self._base = _Segment.from_entries(dim, [])
+        self._dead = np.zeros(0, dtype=bool)
+        self._id_to_row = {}
+        self._delta = {}
+        self._delta_view = None
+        # Query-side idf ke liye bucket doc-frequency. Base ke dead rows compaction tak count
+        # mein rehte hain (idf ke liye itna drift chalta hai).
+        self._df = np.zeros(dim, dtype=np.float32)
+        self._payloads = {}
+        self._compacting = False
+        self._removed_during_compaction = set()
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def configure(self, dim):
+        """Hash dimension badlo; purane vectors is dim ke nahi rehte, toh index khaali (rebuild chahiye)."""
+        with self._lock:
+            if dim == self.dim:
+                return
+            self.dim = dim
+            self._install(_Segment.from_entries(dim, []), np.zeros(0, dtype=bool), {})
+            self._payloads = {}
+            self.built_at = None
+
+    # --- 🔢 VECTORS ---
+
+    def _hash(self, feature):
+        h = zlib.crc32(feature.encode())
+        # Signed hashing: collisions ek dusre ko cancel karte hain, bias nahi karte
+        return h % self.dim, (1.0 if h & 0x80000000 else -1.0)
+
+    def vectorize(self, pairs):
+        """Sparse unit vector: (buckets, values), sirf non-zero buckets."""
+        acc = {}
+        for feature, weight in pairs:
+            bucket, sign = self._hash(feature)
+            acc[bucket] = acc.get(bucket, 0.0) + sign * weight
+        buckets = np.fromiter(acc.keys(), dtype=np.int32, count=len(acc))
+        vals = np.fromiter(acc.values(), dtype=np.float32, count=len(acc))
+        nonzero = vals != 0
+        buckets, vals = buckets[nonzero], vals[nonzero]
+        norm = np.linalg.norm(vals)
+        return buckets, (vals / norm if norm else vals)
+
+    def product_vector(self, product):
+        pairs = []
+        for field, weight in FIELD_WEIGHTS.items():
+            pairs.extend(_features(_field_text(product, field), weight))
+        return self.vectorize(pairs)
+
+    # --- ✍️ WRITES ---
+
+    @staticmethod
+    def _payload(product):
+        return {
+            "name": product.get("name"),
+            "brand": product.get("brand"),
+            "finalPrice": product.get("finalPrice"),
+            "rating": product.get("rating"),
+            "style": (product.get("aiMetadata") or {}).get("style", "General"),
+            "concern": (product.get("aiMetadata") or {}).get("concern", "daily use"),
+        }
+
+    def _drop(self, doc_id):
+        """Lock ke andar: doc ko base (tombstone) aur delta dono se hatao."""
+        row = self._id_to_row.get(doc_id)
+        if row is not None:
+            self._dead[row] = True
+        old = self._delta.pop(doc_id, None)
+        if old is not None:
+            self._df[old[0]] -= 1
+            self._delta_view = None
+        if self._compacting:
+            self._removed_during_compaction.add(doc_id)
+
+    def upsert(self, product):
+        doc_id = str(product.get("_id"))
+        if not product.get("isActive", True):
+            self.remove(doc_id)
+            return
+        entry = self.product_vector(product)
+        with self._lock:
+            self._drop(doc_id)
+            self._delta[doc_id] = entry
+            self._delta_view = None
+            self._df[entry[0]] += 1
+            self._payloads[doc_id] = self._payload(product)
+            compact = len(self._delta) > self.max_delta and not self._compacting
+        if compact:
+            threading.Thread(target=self.compact, name="retrieval-index-compact", daemon=True).start()
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._drop(str(doc_id))
+            self._payloads.pop(str(doc_id), None)
+
+    def rebuild(self, products):
+        entries, payloads = [], {}
+        for p in products:
+            if not p.get("isActive", True):
+                continue
+            doc_id = str(p.get("_id"))
+            if doc_id in payloads:
+                continue
+            entries.append((doc_id, *self.product_vector(p)))
+            payloads[doc_id] = self._payload(p)
+        base = _Segment.from_entries(self.dim, entries)
+        with self._lock:
+            self._install(base, np.zeros(len(base), dtype=bool), {})
+            self._payloads = payloads
+            self.built_at = time.time()
+
+    def _install(self, base, dead, delta):
+        self._base, self._dead, self._delta = base, dead, delta
+        self._id_to_row = {doc_id: row for row, doc_id in enumerate(base.row_ids)}
+        self._delta_view = None
+        self._df = base.doc_freq()
+        for buckets, _ in delta.values():
+            self._df[buckets] += 1
+
+    def compact(self):
+        """Delta ko base mein merge karo. Merge lock ke bahar; beech ke writes baad mein replay."""
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+            self._removed_during_compaction = set()
+            base, dead, delta = self._base, self._dead.copy(), dict(self._delta)
+        try:
+            merged = base.merge(self.dim, dead, delta)
+            with self._lock:
+                if self._base is not base:
+                    return   # beech mein rebuild ho gaya, woh naya hai
+                # Merge ke dauraan dobara likhe gaye ya hataye gaye docs new base mein tombstone
+                remaining = {doc_id: entry for doc_id, entry in self._delta.items()
+                             if delta.get(doc_id) is not entry}
+                new_dead = np.zeros(len(merged), dtype=bool)
+                self._install(merged, new_dead, remaining)
+                for doc_id in self._removed_during_compaction | remaining.keys():
+                    row = self._id_to_row.get(doc_id)
+                    if row is not None:
+                        new_dead[row] = True
+        finally:
+            with self._lock:
+                self._compacting = False
+                self._removed_during_compaction = set()
+
+    # --- 🔍 READS ---
+
+    def _delta_arrays(self):
+        """Lock ke andar: delta docs ek chhote sparse block mein (writes tak cached)."""
+        if self._delta_view is None:
+            ids = list(self._delta)
+            entries = list(self._delta.values())
+            if entries:
+                lengths = np.fromiter((len(b) for b, _ in entries), dtype=np.int64, count=len(entries))
+                rows = np.repeat(np.arange(len(entries), dtype=np.int32), lengths)
+                buckets = np.concatenate([b for b, _ in entries])
+                vals = np.concatenate([v for _, v in entries])
+            else:
+                rows, buckets, vals = _EMPTY_ROWS, _EMPTY_BUCKETS, _EMPTY_VALS
+            self._delta_view = (ids, rows, buckets, vals)
+        return self._delta_view
+
+    def search_many(self, queries, k=5, min_score=0.0):
+        """Cosine top-k per query over the inverted postings. Returns [[(payload, score)]].
+
+        Only scores strictly above min_score are returned.
+        """
+        parsed = [self.vectorize(_features(text, 1.0)) for text in queries]
+        # Lock ke andar sirf snapshot (segments immutable hain); scoring bahar
+        with self._lock:
+            n_docs = len(self._payloads)
+            if not n_docs:
+                return [[] for _ in queries]
+            base, dead = self._base, self._dead.copy()
+            delta_ids, delta_rows, delta_buckets, delta_vals = self._delta_arrays()
+            # Query-side idf: "products", "for" jaise common buckets ka weight kam
+            idfs = [np.log1p(n_docs / (1.0 + self._df[buckets])) for buckets, _ in parsed]
+            payloads = self._payloads
+
+        results = []
+        for (buckets, vals), idf in zip(parsed, idfs):
+            weights = vals * idf
+            norm = np.linalg.norm(weights)
+            if not norm:
+                results.append([])
+                continue
+            weights = weights / norm
+
+            scores = base.score(buckets, weights)
+            scores[dead] = 0
+            ids = base.row_ids
+            if delta_ids:
+                query = np.zeros(self.dim, dtype=np.float32)
+                query[buckets] = weights
+                delta_scores = np.bincount(delta_rows, weights=query[delta_buckets] * delta_vals,
+                                           minlength=len(delta_ids))
+                scores = np.concatenate([scores, delta_scores])
+                ids = _Concat(base.row_ids, delta_ids)
+
+            top_k = min(k, len(scores))
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            top = top[np.argsort(-scores[top])]
+            hits = []
+            for r in top:
+                if scores[r] <= min_score:
+                    break
+                payload = payloads.get(ids[r])
+                if payload is not None:
+                    hits.append((payload, float(scores[r])))
+            results.append(hits)
+        return results
+
+    def search(self, query, k=5, min_score=0.0):
+        return self.search_many([query], k=k, min_score=min_score)[0]
+
+    def top_rated(self, k=8):
+        with self._lock:
+            payloads = list(self._payloads.values())
+        return sorted(payloads, key=lambda p: -(p.get("rating") or 0))[:k]
+
+
+class _Concat:
+    """Do lists ko bina copy kiye ek index space mein dekhna (base rows, phir delta rows)."""
+
+    def __init__(self, first, second):
+        self._first, self._second = first, second
+
+    def __getitem__(self, i):
+        n = len(self._first)
+        return self._first[i] if i < n else self._second[i - n]
+
+
+# dim init_retrieval_index mein app config (RETRIEVAL_DIM) se aata hai
+retrieval_index = RetrievalIndex()
+
+
+@catalog_events.subscribe
+def _on_product_change(before, after):
+    if after is not None:
+        retrieval_index.upsert(after)
+    elif before is not None:
+        retrieval_index.remove(before.get("_id"))
+
+
+def rebuild_from_db():
+    retrieval_index.rebuild(mongo.db.products.find({"isActive": True}, RETRIEVAL_PROJECTION))
+
+
+def init_retrieval_index(app):
+    retrieval_index.configure(dim=app.config["RETRIEVAL_DIM"])
+    try:
+        rebuild_from_db()
+        print(f"✅ Chat retrieval index ready: {len(retrieval_index)} products")
+    except Exception as e:
+        print(f"❌ Chat retrieval index build failed: {e}")
+
+    interval = app.config.get("SEARCH_INDEX_REFRESH_SECONDS")
+    if interval:
+        scheduler.every(interval, rebuild_from_db, name="retrieval-index-refresh")
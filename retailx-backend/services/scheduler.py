@@ -0,0 +1,22 @@
+import threading
+
+# Background jobs ke liye simple daemon-thread scheduler
+_stop = threading.Event()
+
+
+def every(seconds, fn, name=None):
+    """Run fn every `seconds` in a daemon thread (first run after one interval)."""
+    def _loop():
+        while not _stop.wait(seconds):
+            try:
+                fn()
+            except Exception as e:
+                print(f"Scheduled job error ({name or fn.__name__}): {e}")
+
+    thread = threading.Thread(target=_loop, name=name or fn.__name__, daemon=True)
+    thread.start()
+    return thread
+
+
+def stop_all():
+    _stop.set()
@@ -0,0 +1,218 @@
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from extensions import mongo
+from repositories.products_repository import CARD_PROJECTION, format_product_card
+from services import catalog_events, scheduler
+
+# In-process inverted index for /api/search
+# Regex $or ki jagah tokens -> postings, aur ranking BM25 se hoti hai.
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Field weights: name/brand/tags ka match description se zyada important hai
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "brand": 2.0,
+    "category": 2.0,
+    "subCategory": 1.5,
+    "tags": 2.0,
+    "aiMetadata.style": 1.0,
+    "aiMetadata.concern": 1.0,
+    "description": 0.5,
+}
+
+# Partial words ("sham" -> "shampoo") prefix expansion se match hote hain, thode kam score ke saath
+PREFIX_MATCH_BOOST = 0.7
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return TOKEN_RE.findall(str(text).lower())
+
+
+# Rebuild ke liye sirf card fields + jo fields tokenize hote hain
+INDEX_PROJECTION = {**CARD_PROJECTION, "isActive": 1, **{field: 1 for field in FIELD_WEIGHTS}}
+
+
+def _field_values(product, field):
+    value = product
+    for part in field.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    if isinstance(value, (list, tuple)):
+        return value
+    return [value] if value else []
+
+
+def document_terms(product):
+    """Weighted term frequencies for one product document."""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for value in _field_values(product, field):
+            for token in tokenize(value):
+                terms[token] += weight
+    return terms
+
+
+class SearchIndex:
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.built_at = None
+        # Har write/rebuild pe badhta hai; search results cache ki key mein jaata hai
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._postings = {}    # term -> {doc_id: weighted tf}
+        self._doc_terms = {}   # doc_id -> Counter (remove ke time kaam aata hai)
+        self._doc_len = {}
+        self._docs = {}        # doc_id -> card view (search results isi se serve hote hain)
+        self._total_len = 0.0
+        self._vocab = None     # sorted terms, prefix lookup ke liye lazily banta hai
+
+    def __len__(self):
+        return len(self._docs)
+
+    # --- ✍️ WRITES ---
+
+    def rebuild(self, products):
+        """Build a fresh index and swap it in, so searches never see a half-built one."""
+        fresh = SearchIndex(self.k1, self.b)
+        for p in products:
+            fresh._add(p)
+        with self._lock:
+            self._postings = fresh._postings
+            self._doc_terms = fresh._doc_terms
+            self._doc_len = fresh._doc_len
+            self._docs = fresh._docs
+            self._total_len = fresh._total_len
+            self._vocab = None
+            self.built_at = time.time()
+            self.generation += 1
+
+    def upsert(self, product):
+        with self._lock:
+            doc_id = str(product.get("_id"))
+            self._remove(doc_id)
+            if product.get("isActive", True):
+                self._add(product)
+            self.generation += 1
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(str(doc_id))
+            self.generation += 1
+
+    def _add(self, product):
+        doc = format_product_card(product)
+        doc_id = doc["id"]
+        terms = document_terms(product)
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocab = None
+            postings[doc_id] = tf
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_len[doc_id] = length
+        self._docs[doc_id] = doc
+        self._total_len += length
+
+    def _remove(self, doc_id):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocab = None
+        self._total_len -= self._doc_len.pop(doc_id, 0)
+        self._docs.pop(doc_id, None)
+
+    # --- 🔍 READS ---
+
+    def _expand(self, token):
+        """Exact term plus vocabulary terms that start with it."""
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        matches = []
+        i = bisect_left(self._vocab, token)
+        while i < len(self._vocab) and len(matches) < MAX_PREFIX_EXPANSIONS:
+            term = self._vocab[i]
+            if not term.startswith(token):
+                break
+            matches.append((term, 1.0 if term == token else PREFIX_MATCH_BOOST))
+            i += 1
+        return matches
+
+    def search(self, query, limit=50):
+        """Return product cards ranked by BM25 relevance."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs:
+                return []
+            avg_len = self._total_len / n_docs
+            scores = {}
+
+            for token in tokens:
+                # Har query token ke liye doc ka best expansion hi count hota hai
+                best = {}
+                for term, boost in self._expand(token):
+                    postings = self._postings[term]
+                    df = len(postings)
+                    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                    for doc_id, tf in postings.items():
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                        score = boost * idf * tf * (self.k1 + 1) / (tf + norm)
+                        if score > best.get(doc_id, 0):
+                            best[doc_id] = score
+                for doc_id, score in best.items():
+                    scores[doc_id] = scores.get(doc_id, 0) + score
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], self._docs[item[0]].get("name") or ""))
+            return [self._docs[doc_id] for doc_id, _ in ranked[:limit]]
+
+
+search_index = SearchIndex()
+
+
+@catalog_events.subscribe
+def _on_product_change(before, after):
+    if after is not None:
+        search_index.upsert(after)
+    elif before is not None:
+        search_index.remove(before.get("_id"))
+
+
+def rebuild_from_db():
+    search_index.rebuild(mongo.db.products.find({"isActive": True}, INDEX_PROJECTION))
+
+
+def init_search_index(app):
+    """Startup pe index build karo aur multi-worker sync ke liye periodic rebuild schedule karo."""
+    try:
+        rebuild_from_db()
+        print(f"✅ Search index ready: {len(search_index)} products")
+    except Exception as e:
+        print(f"❌ Search index build failed: {e}")
+
+    interval = app.config.get("SEARCH_INDEX_REFRESH_SECONDS")
+    if interval:
+        scheduler.every(interval, rebuild_from_db, name="search-index-refresh")
@@ -0,0 +1,380 @@
+import math
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from extensions import mongo
+from repositories.products_repository import CARD_PROJECTION, format_product_card
+from services import catalog_events, scheduler
+
+# "Similar products" ke liye precomputed item-item table
+# Har product ka top-K neighbours uski category ke andar, ek weighted score se:
+# shared tags (hashed multi-hot ka cosine) + same subCategory + same brand + price band
+# (log price ka distance) + neighbour ki rating. Request pe sirf memory se lookup hota hai.
+#
+# All-pairs (n^2 per category) bade catalog pe nahi chalta, isliye candidates blocked hain:
+# category ke members (subCategory, log price) key pe sorted, aur har product sirf key mein
+# apne CANDIDATES nearest members ko score karta hai (same subCategory, paas ka price;
+# chhoti subCategory ho toh padosi subCategory tak spill). Approximate hai, par score ke
+# sabse bhaari signals (subCategory + price) yahi hain; cost O(n * CANDIDATES).
+#
+# Writes (catalog events) sirf queue mein jaate hain; ek background thread unhe apply
+# karta hai (group arrays in-place update, sirf affected lists recompute). Request thread
+# pe koi matrix kaam nahi hota.
+
+TAG_DIM = 128
+WEIGHTS = {"tags": 3.0, "subCategory": 2.0, "brand": 1.0, "price": 1.5, "rating": 0.5}
+# exp(-|log p1 - log p2| / PRICE_BAND): ~2x price difference pe similarity ~0.5
+PRICE_BAND = 1.0
+CANDIDATES = 512
+BLOCK_ROWS = 512
+# log1p(price) isse bahut chhota hai, toh sort key mein subCategory pehle aata hai
+_SUB_STRIDE = 1000.0
+
+SIMILARITY_PROJECTION = {**CARD_PROJECTION, "isActive": 1, "tags": 1, "subCategory": 1}
+
+
+def _group_key(product):
+    return str(product.get("category") or "other").casefold()
+
+
+def _tag_vector(tags):
+    vec = np.zeros(TAG_DIM, dtype=np.float32)
+    for tag in tags or []:
+        vec[zlib.crc32(str(tag).strip().lower().encode()) % TAG_DIM] = 1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def _features(product):
+    price = float(product.get("finalPrice") or product.get("price") or 0)
+    return {
+        "group": _group_key(product),
+        "tags": _tag_vector(product.get("tags")),
+        "subCategory": str(product.get("subCategory") or "").casefold(),
+        "brand": str(product.get("brand") or "").casefold(),
+        "log_price": math.log1p(max(price, 0.0)),
+        "rating": float(product.get("rating") or 0) / 5.0,
+    }
+
+
+def _same_features(a, b):
+    return (
+        a["group"] == b["group"] and a["subCategory"] == b["subCategory"] and a["brand"] == b["brand"]
+        and a["log_price"] == b["log_price"] and a["rating"] == b["rating"]
+        and np.array_equal(a["tags"], b["tags"])
+    )
+
+
+class _Group:
+    """Feature arrays for one category, updated in place (append / overwrite / swap-remove)."""
+
+    def __init__(self, capacity=64):
+        self.ids = []
+        self.pos = {}
+        self._codes = {}
+        self.tags = np.zeros((capacity, TAG_DIM), np.float32)
+        self.sub = np.zeros(capacity, np.int32)
+        self.brand = np.zeros(capacity, np.int32)
+        self.log_price = np.zeros(capacity, np.float32)
+        self.rating = np.zeros(capacity, np.float32)
+        self.key = np.zeros(capacity, np.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _code(self, prefix, value):
+        return self._codes.setdefault(prefix + value, len(self._codes))
+
+    def _grow(self):
+        capacity = max(len(self.sub) * 2, 64)
+        for name in ("tags", "sub", "brand", "log_price", "rating", "key"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:len(self.ids)] = old[:len(self.ids)]
+            setattr(self, name, new)
+
+    def put(self, doc_id, features):
+        row = self.pos.get(doc_id)
+        if row is None:
+            if len(self.ids) == len(self.sub):
+                self._grow()
+            row = len(self.ids)
+            self.ids.append(doc_id)
+            self.pos[doc_id] = row
+        sub = self._code("s:", features["subCategory"])
+        self.tags[row] = features["tags"]
+        self.sub[row] = sub
+        self.brand[row] = self._code("b:", features["brand"])
+        self.log_price[row] = features["log_price"]
+        self.rating[row] = features["rating"]
+        self.key[row] = sub * _SUB_STRIDE + features["log_price"]
+        return row
+
+    def drop(self, doc_id):
+        row = self.pos.pop(doc_id)
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.pos[moved] = row
+            for name in ("tags", "sub", "brand", "log_price", "rating", "key"):
+                arr = getattr(self, name)
+                arr[row] = arr[last]
+        self.ids.pop()
+
+    def candidates(self, row):
+        """Group rows nearest to `row` on the (subCategory, price) key."""
+        n = len(self.ids)
+        if n <= CANDIDATES:
+            return np.arange(n)
+        distance = np.abs(self.key[:n] - self.key[row])
+        return np.argpartition(distance, CANDIDATES - 1)[:CANDIDATES]
+
+    def pair_scores(self, rows, cols):
+        """Symmetric part of the score, (len(rows), len(cols))."""
+        scores = WEIGHTS["tags"] * (self.tags[rows] @ self.tags[cols].T)
+        scores += WEIGHTS["subCategory"] * (self.sub[rows, None] == self.sub[None, cols])
+        scores += WEIGHTS["brand"] * (self.brand[rows, None] == self.brand[None, cols])
+        scores += WEIGHTS["price"] * np.exp(-np.abs(self.log_price[rows, None] - self.log_price[None, cols]) / PRICE_BAND)
+        return scores
+
+    def scores(self, rows, cols):
+        # Neighbour ki rating asymmetric hai (j ke liye score mein j ki rating)
+        scores = self.pair_scores(rows, cols) + WEIGHTS["rating"] * self.rating[None, cols]
+        scores[rows[:, None] == cols[None, :]] = -np.inf  # khud ko similar mat bolo
+        return scores
+
+
+class SimilarProducts:
+    def __init__(self, k=24):
+        self.k = k
+        self.built_at = None
+        self._lock = threading.RLock()
+        self._reset()
+        # Catalog writes yahan aate hain (doc id -> product, None = remove); worker apply karta hai
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker = None
+        self._replay = None  # rebuild ke dauraan applied changes, naye table pe dobara
+
+    def _reset(self):
+        self._features = {}    # id -> features
+        self._cards = {}       # id -> card view (response isi se banta hai)
+        self._groups = {}      # group -> _Group
+        self._neighbors = {}   # id -> [(neighbour id, score)] best first
+        self._reverse = {}     # id -> set(ids jinki list mein ye hai)
+
+    def __len__(self):
+        return len(self._cards)
+
+    def configure(self, k):
+        """Top-K badlo; lists agle rebuild se naye K ki banti hain."""
+        with self._lock:
+            self.k = k
+
+    # --- 🧮 TOP-K ---
+
+    def _set_neighbors(self, doc_id, neighbors):
+        for other, _ in self._neighbors.get(doc_id, []):
+            self._reverse.get(other, set()).discard(doc_id)
+        self._neighbors[doc_id] = neighbors
+        for other, _ in neighbors:
+            self._reverse.setdefault(other, set()).add(doc_id)
+
+    def _top_k(self, group, cols, scores):
+        k = min(self.k, len(cols) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        order = top[np.argsort(-scores[top])]
+        return [(group.ids[cols[c]], float(scores[c])) for c in order]
+
+    def _recompute(self, key, doc_ids):
+        """Fresh top-K for doc_ids (all in group `key`) over their candidates."""
+        group = self._groups[key]
+        for doc_id in doc_ids:
+            row = group.pos.get(doc_id)
+            if row is None:
+                continue
+            cols = group.candidates(row)
+            scores = group.scores(np.array([row]), cols)[0]
+            self._set_neighbors(doc_id, self._top_k(group, cols, scores))
+
+    def _recompute_all(self, group):
+        """Poora group: key pe sorted blocks, har block apni window (block + CANDIDATES/2 dono taraf) pe."""
+        n = len(group)
+        order = np.argsort(group.key[:n], kind="stable")
+        half = CANDIDATES // 2
+        for start in range(0, n, BLOCK_ROWS):
+            rows = order[start:start + BLOCK_ROWS]
+            cols = order[max(0, start - half):min(n, start + BLOCK_ROWS + half)]
+            scores = group.scores(rows, cols)
+            k = min(self.k, len(cols) - 1)
+            if k <= 0:
+                for row in rows:
+                    self._set_neighbors(group.ids[row], [])
+                continue
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            best = np.argsort(-top_scores, axis=1)
+            top, top_scores = np.take_along_axis(top, best, axis=1), np.take_along_axis(top_scores, best, axis=1)
+            neighbor_ids = [group.ids[c] for c in cols[top].ravel()]
+            for i, row in enumerate(rows):
+                self._set_neighbors(group.ids[row], list(zip(neighbor_ids[i * k:(i + 1) * k],
+                                                             top_scores[i].tolist())))
+
+    # --- ✍️ WRITES ---
+
+    def rebuild(self, products):
+        fresh = SimilarProducts(self.k)
+        with self._lock:
+            # Is beech aaye changes fresh table pe dobara lagenge (DB cursor unhe miss kar sakta hai)
+            self._replay = {}
+        try:
+            for p in products:
+                if p.get("isActive", True):
+                    fresh._add(p)
+            for group in fresh._groups.values():
+                fresh._recompute_all(group)
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+        with self._lock:
+            for doc_id, product in self._replay.items():
+                fresh._apply(doc_id, product)
+            self._replay = None
+            self._features, self._cards, self._groups = fresh._features, fresh._cards, fresh._groups
+            self._neighbors, self._reverse = fresh._neighbors, fresh._reverse
+            self.built_at = time.time()
+
+    def _add(self, product):
+        doc_id = str(product.get("_id"))
+        features = _features(product)
+        self._features[doc_id] = features
+        self._cards[doc_id] = format_product_card(product)
+        self._groups.setdefault(features["group"], _Group()).put(doc_id, features)
+        return doc_id, features
+
+    def _detach(self, doc_id):
+        """Remove from its group; returns (group, ids whose lists pointed at it)."""
+        features = self._features.pop(doc_id)
+        self._cards.pop(doc_id, None)
+        self._groups[features["group"]].drop(doc_id)
+        self._set_neighbors(doc_id, [])
+        self._neighbors.pop(doc_id, None)
+        return features["group"], self._reverse.pop(doc_id, set())
+
+    def _upsert(self, product):
+        doc_id = str(product.get("_id"))
+        old = self._features.get(doc_id)
+        if old is not None and _same_features(old, _features(product)):
+            # Sirf stock/images jaisa change: score same, card refresh kaafi hai
+            self._cards[doc_id] = format_product_card(product)
+            return
+
+        if old is not None:
+            old_group, pointing = self._detach(doc_id)
+            self._recompute(old_group, [d for d in pointing if d in self._features])
+
+        doc_id, features = self._add(product)
+        key = features["group"]
+        self._recompute(key, [doc_id])
+
+        # Candidates ki lists: jahan naya product unke K-th score se behtar hai wahan insert (poora recompute nahi)
+        group = self._groups[key]
+        row = group.pos[doc_id]
+        cols = group.candidates(row)
+        column = group.pair_scores(np.array([row]), cols)[0] + WEIGHTS["rating"] * group.rating[row]
+        for c, score in zip(cols, column):
+            other = group.ids[c]
+            if other == doc_id:
+                continue
+            neighbors = self._neighbors.get(other, [])
+            if len(neighbors) < self.k or score > neighbors[-1][1]:
+                merged = sorted(neighbors + [(doc_id, float(score))], key=lambda n: -n[1])[:self.k]
+                self._set_neighbors(other, merged)
+
+    def _remove(self, doc_id):
+        if doc_id not in self._features:
+            return
+        key, pointing = self._detach(doc_id)
+        self._recompute(key, [d for d in pointing if d in self._features])
+
+    def _apply(self, doc_id, product):
+        if product is None or not product.get("isActive", True):
+            self._remove(doc_id)
+        else:
+            self._upsert(product)
+
+    def enqueue(self, doc_id, product):
+        """Catalog write ka O(1) hissa: change queue karo, background worker apply karega."""
+        with self._pending_lock:
+            self._pending[str(doc_id)] = product
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_worker, name="similar-products-updates",
+                                                daemon=True)
+                self._worker.start()
+        self._wakeup.set()
+
+    def flush(self):
+        """Apply every queued change now; returns how many were applied."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for doc_id, product in pending.items():
+            with self._lock:
+                try:
+                    self._apply(doc_id, product)
+                except Exception as e:
+                    print(f"Similar-products update failed ({doc_id}): {e}")
+                if self._replay is not None:
+                    self._replay[doc_id] = product
+        return len(pending)
+
+    def _run_worker(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.flush()
+
+    # --- 🔍 READS ---
+
+    def similar(self, doc_id, limit=None):
+        """Card views of the top neighbours, or None if the product isn't indexed."""
+        with self._lock:
+            neighbors = self._neighbors.get(str(doc_id))
+            if neighbors is None:
+                return None
+            return [self._cards[other] for other, _ in neighbors[:limit or self.k] if other in self._cards]
+
+
+# k init_similar_products mein app config (SIMILAR_TOP_K) se aata hai
+similar_products = SimilarProducts()
+
+
+@catalog_events.subscribe
+def _on_product_change(before, after):
+    doc = after if after is not None else before
+    if doc is not None:
+        similar_products.enqueue(doc.get("_id"), after)
+
+
+def rebuild_from_db():
+    similar_products.rebuild(mongo.db.products.find({"isActive": True}, SIMILARITY_PROJECTION))
+
+
+def init_similar_products(app):
+    similar_products.configure(k=app.config["SIMILAR_TOP_K"])
+    try:
+        rebuild_from_db()
+        print(f"✅ Similar-products table ready: {len(similar_products)} products")
+    except Exception as e:
+        print(f"❌ Similar-products build failed: {e}")
+
+    interval = app.config.get("SIMILAR_PRODUCTS_REFRESH_SECONDS")
+    if interval:
+        scheduler.every(interval, rebuild_from_db, name="similar-products-refresh")
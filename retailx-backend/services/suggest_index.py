@@ -0,0 +1,235 @@
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+
+import numpy as np
+
+from extensions import mongo
+from services import catalog_events, scheduler
+
+# Search-as-you-type (/api/search/suggest) ke liye prefix index
+# Sorted array of (key, entry) + binary search: prefix ki range do bisect se milti hai.
+# Har key ka popularity weight ek parallel NumPy array mein hai, toh range ka top-N
+# ek argpartition se nikalta hai (Python loop nahi) - "m" jaisi badi range bhi ~ms mein.
+# Catalog writes keys/weights ko jagah pe update karte hain, rebuild ki zaroorat nahi.
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+MAX_RESULTS = 10
+# Ek name kai keys (suffixes) se match ho sakta hai, isliye range se thode zyada candidates
+CANDIDATES = MAX_RESULTS * 4
+KINDS = ("category", "brand", "tag", "name")
+
+SUGGEST_PROJECTION = {"name": 1, "brand": 1, "category": 1, "tags": 1, "rating": 1, "reviewsCount": 1, "isActive": 1}
+
+
+def normalize(text):
+    return " ".join(WORD_RE.findall(str(text or "").lower()))
+
+
+def popularity(product):
+    return math.log1p(product.get("reviewsCount") or 0) + (product.get("rating") or 0)
+
+
+def _entry_keys(entry):
+    normalized = normalize(entry["text"])
+    if entry["type"] != "name":
+        return {normalized}
+    # Har word se shuru hone wala suffix bhi key hai: "sham" -> "Himalaya Shampoo ..."
+    words = normalized.split()
+    return {" ".join(words[i:]) for i in range(len(words))}
+
+
+class SuggestIndex:
+    def __init__(self):
+        self.built_at = None
+        self._lock = threading.RLock()
+        self._keys = []                                 # sorted [(key, entry_id)]
+        self._key_weights = np.zeros(1024, np.float64)  # _keys ke parallel (capacity doubling)
+        self._entries = {}           # entry_id -> {"text", "type", "id"?}
+        self._keys_of = {}           # entry_id -> set(keys)
+        self._weights = {}           # entry_id -> popularity (brand/category/tag: products ka sum)
+        self._refs = {}              # entry_id -> kitne products is entry ko use karte hain
+        self._contrib = {}           # product_id -> {entry_id: weight}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _rank(self, entry_id):
+        return (-self._weights[entry_id], KINDS.index(entry_id[0]), entry_id[1:])
+
+    # --- 🔢 SORTED KEYS + WEIGHTS ---
+
+    def _insert_key(self, key, entry_id):
+        i = bisect_left(self._keys, (key, entry_id))
+        n = len(self._keys)
+        if n == len(self._key_weights):
+            self._key_weights = np.concatenate([self._key_weights, np.zeros(n, np.float64)])
+        self._key_weights[i + 1:n + 1] = self._key_weights[i:n]   # memmove, list.insert jaisa
+        self._key_weights[i] = self._weights[entry_id]
+        self._keys.insert(i, (key, entry_id))
+
+    def _delete_key(self, key, entry_id):
+        i = bisect_left(self._keys, (key, entry_id))
+        n = len(self._keys)
+        if i < n and self._keys[i] == (key, entry_id):
+            self._key_weights[i:n - 1] = self._key_weights[i + 1:n]
+            del self._keys[i]
+
+    def _sync_weight(self, entry_id):
+        weight = self._weights[entry_id]
+        for key in self._keys_of[entry_id]:
+            self._key_weights[bisect_left(self._keys, (key, entry_id))] = weight
+
+    # --- ✍️ WRITES ---
+
+    def _product_entries(self, product):
+        """{entry_id: (entry, weight)} for one product."""
+        product_id = str(product.get("_id"))
+        weight = popularity(product)
+        entries = {}
+        name = str(product.get("name") or "").strip()
+        if normalize(name):
+            # Name text entry_id mein hai: rename = purani entry hatao, nayi jodo
+            entries[("name", product_id, normalize(name))] = ({"text": name, "type": "name", "id": product_id}, weight)
+        for kind, values in (("brand", [product.get("brand")]), ("category", [product.get("category")]),
+                             ("tag", product.get("tags") or [])):
+            for value in values:
+                text = str(value or "").strip()
+                if normalize(text):
+                    entries[(kind, normalize(text))] = ({"text": text, "type": kind}, weight)
+        return entries
+
+    def _add_ref(self, entry_id, entry, weight):
+        if entry_id in self._entries:
+            self._weights[entry_id] += weight
+            self._refs[entry_id] += 1
+            self._sync_weight(entry_id)
+            return
+        self._entries[entry_id] = entry
+        self._keys_of[entry_id] = _entry_keys(entry)
+        self._weights[entry_id] = weight
+        self._refs[entry_id] = 1
+        for key in self._keys_of[entry_id]:
+            self._insert_key(key, entry_id)
+
+    def _drop_ref(self, entry_id, weight):
+        self._refs[entry_id] -= 1
+        if self._refs[entry_id] > 0:
+            self._weights[entry_id] -= weight
+            self._sync_weight(entry_id)
+            return
+        for key in self._keys_of[entry_id]:
+            self._delete_key(key, entry_id)
+        for store in (self._entries, self._keys_of, self._weights, self._refs):
+            store.pop(entry_id, None)
+
+    def upsert(self, product):
+        product_id = str(product.get("_id"))
+        with self._lock:
+            old = self._contrib.pop(product_id, {})
+            new = self._product_entries(product) if product.get("isActive", True) else {}
+
+            for entry_id, weight in old.items():
+                if entry_id not in new:
+                    self._drop_ref(entry_id, weight)
+            for entry_id, (entry, weight) in new.items():
+                if entry_id not in old:
+                    self._add_ref(entry_id, entry, weight)
+                elif weight != old[entry_id]:
+                    # Same entry, sirf popularity badli (rating / reviewsCount)
+                    self._weights[entry_id] += weight - old[entry_id]
+                    self._sync_weight(entry_id)
+            if new:
+                self._contrib[product_id] = {entry_id: weight for entry_id, (_, weight) in new.items()}
+
+    def remove(self, product_id):
+        with self._lock:
+            for entry_id, weight in self._contrib.pop(str(product_id), {}).items():
+                self._drop_ref(entry_id, weight)
+
+    def rebuild(self, products):
+        fresh = SuggestIndex()
+        for p in products:
+            if not p.get("isActive", True):
+                continue
+            new = fresh._product_entries(p)
+            for entry_id, (entry, weight) in new.items():
+                if entry_id not in fresh._entries:
+                    fresh._entries[entry_id] = entry
+                    fresh._keys_of[entry_id] = _entry_keys(entry)
+                    fresh._weights[entry_id] = 0.0
+                    fresh._refs[entry_id] = 0
+                fresh._weights[entry_id] += weight
+                fresh._refs[entry_id] += 1
+            fresh._contrib[str(p.get("_id"))] = {entry_id: weight for entry_id, (_, weight) in new.items()}
+
+        # Bulk build: saari keys ek baar sort (har key pe insert se kaafi tez)
+        keys = sorted((key, entry_id) for entry_id, entry_keys in fresh._keys_of.items() for key in entry_keys)
+        weights = np.zeros(max(len(keys) * 2, 1024), np.float64)
+        weights[:len(keys)] = [fresh._weights[entry_id] for _, entry_id in keys]
+
+        with self._lock:
+            self._keys, self._key_weights = keys, weights
+            self._entries, self._keys_of, self._weights = fresh._entries, fresh._keys_of, fresh._weights
+            self._refs, self._contrib = fresh._refs, fresh._contrib
+            self.built_at = time.time()
+
+    # --- 🔍 READS ---
+
+    def suggest(self, prefix, limit=MAX_RESULTS):
+        """Top `limit` completions for prefix: [{"text", "type", "id"?}], most popular first."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            start = bisect_left(self._keys, (prefix,))
+            end = bisect_left(self._keys, (prefix + "\uffff",), start)
+            if start == end:
+                return []
+            weights = self._key_weights[start:end]
+            if end - start > CANDIDATES:
+                top = np.argpartition(-weights, CANDIDATES - 1)[:CANDIDATES]
+            else:
+                top = range(end - start)
+            candidates = sorted({self._keys[start + i][1] for i in top}, key=self._rank)
+
+            seen, results = set(), []
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                # Same naam ke do products ek hi suggestion
+                label = (entry["type"], entry["text"].casefold())
+                if label not in seen:
+                    seen.add(label)
+                    results.append(entry)
+                    if len(results) >= limit:
+                        break
+            return results
+
+
+suggest_index = SuggestIndex()
+
+
+@catalog_events.subscribe
+def _on_product_change(before, after):
+    if after is not None:
+        suggest_index.upsert(after)
+    elif before is not None:
+        suggest_index.remove(before.get("_id"))
+
+
+def rebuild_from_db():
+    suggest_index.rebuild(mongo.db.products.find({"isActive": True}, SUGGEST_PROJECTION))
+
+
+def init_suggest_index(app):
+    try:
+        rebuild_from_db()
+        print(f"✅ Suggest index ready: {len(suggest_index)} entries")
+    except Exception as e:
+        print(f"❌ Suggest index build failed: {e}")
+
+    interval = app.config.get("SEARCH_INDEX_REFRESH_SECONDS")
+    if interval:
+        scheduler.every(interval, rebuild_from_db, name="suggest-index-refresh")
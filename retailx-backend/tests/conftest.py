@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """create_app() against an in-memory mongomock database (warmup off, no index self-check)."""
+    flask_pymongo = pytest.importorskip("flask_pymongo")
+    mongomock = pytest.importorskip("mongomock")
+    monkeypatch.setattr(flask_pymongo, "MongoClient", mongomock.MongoClient)
+    from app import create_app
+
+    return create_app({
+        "TESTING": True,
+        "MONGO_URI": "mongodb://localhost:27017/retailx_test",
+        "SECRET_KEY": "test-secret",
+        "JWT_SECRET_KEY": "test-jwt-secret-with-enough-bytes-for-hs256",
+        "BCRYPT_LOG_ROUNDS": 4,
+        "STARTUP_WARMUP": "off",
+        "DB_INDEX_SELF_CHECK": False,
+        "METRICS_ENABLED": False,
+    })
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def db(app):
+    from extensions import mongo
+
+    return mongo.db
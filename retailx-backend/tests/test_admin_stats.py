@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import bcrypt
+
+PASSWORD = "Admin@12345"
+
+
+def _login_admin(client, db, email="admin@example.com"):
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+    db.admins.insert_one({"email": email, "password": hashed, "role": "admin"})
+    response = client.post("/api/admin/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["token"]
+
+
+def _store_snapshots(db):
+    # mongomock mein $facet/$bucket poore nahi, toh snapshots pehle se rakhe hain
+    now = datetime.utcnow()
+    db.admin_stats.insert_many([
+        {"_id": "catalog", "refreshedAt": now, "buildMs": 1.0, "data": {"totals": {"products": 3}}},
+        {"_id": "signups", "refreshedAt": now, "buildMs": 1.0, "data": {"users": 2}},
+    ])
+
+
+def test_admin_token_reads_stats(client, db):
+    _store_snapshots(db)
+    token = _login_admin(client, db)
+
+    response = client.get("/api/admin/stats", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+    assert body["catalog"]["totals"] == {"products": 3}
+    assert body["signups"]["users"] == 2
+
+    single = client.get("/api/admin/stats/catalog", headers={"Authorization": f"Bearer {token}"})
+    assert single.status_code == 200
+
+
+def test_non_admin_token_is_forbidden(app, client, db):
+    _store_snapshots(db)
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        token = create_access_token(identity="seller@example.com", additional_claims={"role": "seller"})
+
+    response = client.get("/api/admin/stats", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("flask_pymongo")
+
+from repositories import products_repository
+from repositories.cache import LRUTTLCache
+
+
+class RemoteCache(LRUTTLCache):
+    """In-memory cache that claims to be remote and records which thread served each call."""
+
+    remote = True
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.current_thread())
+        return super().get(key)
+
+
+def test_remote_cache_calls_leave_the_event_loop(monkeypatch):
+    cache = RemoteCache()
+    monkeypatch.setattr(products_repository, "_cache", cache)
+    cache.set(products_repository._product_key("abc"), {"id": "abc"})
+
+    async def read():
+        return await products_repository.get_product_by_id_async(None, "abc"), threading.current_thread()
+
+    product, loop_thread = asyncio.run(read())
+    assert product == {"id": "abc"}
+    assert cache.threads and loop_thread not in cache.threads
+
+
+def test_local_cache_is_called_inline(monkeypatch):
+    cache = LRUTTLCache()
+    monkeypatch.setattr(products_repository, "_cache", cache)
+    cache.set(products_repository._product_key("abc"), {"id": "abc"})
+
+    assert asyncio.run(products_repository.get_product_by_id_async(None, "abc")) == {"id": "abc"}
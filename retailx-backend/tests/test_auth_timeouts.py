@@ -0,0 +1,42 @@
+from concurrent.futures import TimeoutError as HashTimeout
+
+import pytest
+
+from services import password_hashing
+
+PASSWORD = "Str0ng@Pass"
+STORED = "$2b$04$" + "x" * 53
+
+
+@pytest.fixture
+def slow_bcrypt(app, monkeypatch):
+    def run(fn, *args, timeout=None, **kwargs):
+        raise HashTimeout()
+
+    monkeypatch.setattr(password_hashing._executor, "run", run)
+    monkeypatch.setenv("ADMIN_SECRET_KEY", "admin-key")
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/auth/register", {"email": "new@example.com", "password": PASSWORD}),
+    ("/api/auth/login", {"email": "user@example.com", "password": PASSWORD}),
+    ("/api/admin/register", {"email": "new@example.com", "password": PASSWORD, "adminKey": "admin-key"}),
+    ("/api/admin/login", {"email": "admin@example.com", "password": PASSWORD}),
+    ("/api/seller/register", {"email": "new@example.com", "password": PASSWORD, "storeName": "S",
+                              "registrationId": "R1"}),
+    ("/api/seller/login", {"email": "seller@example.com", "password": PASSWORD}),
+])
+def test_hash_timeout_returns_503(client, db, slow_bcrypt, path, body):
+    for collection in ("users", "admins", "sellers"):
+        db[collection].insert_one({"email": body["email"].replace("new@", collection.rstrip("s") + "@"),
+                                   "password": STORED})
+
+    response = client.post(path, json=body)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_needs_rehash_uses_configured_rounds(app):
+    assert app.config["BCRYPT_LOG_ROUNDS"] == 4
+    assert not password_hashing.needs_rehash(STORED)
+    assert password_hashing.needs_rehash("$2b$12$" + "x" * 53)
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from mongomock.collection import Collection
+
+from repositories import products_repository
+from repositories.products_repository import parse_bulk_item
+
+
+@pytest.mark.parametrize("item", [
+    {"stock": float("inf")},
+    {"stock": 1e400},
+    {"price": float("inf")},
+    {"price": float("nan")},
+    {"discount": float("nan")},
+])
+def test_parse_bulk_item_rejects_non_finite_numbers(item):
+    with pytest.raises(ValueError):
+        parse_bulk_item({"id": str(ObjectId()), **item})
+
+
+def test_final_price_expr_treats_missing_values_as_zero(db):
+    db.products.insert_many([{"_id": 1, "price": 200, "discount": 10}, {"_id": 2, "price": 200},
+                             {"_id": 3, "discount": None}])
+    rows = db.products.aggregate([{"$project": {"finalPrice": products_repository._final_price_expr()}}])
+    assert {row["_id"]: row["finalPrice"] for row in rows} == {1: 180, 2: 200, 3: 0}
+
+
+def test_product_deleted_before_the_write_is_not_reported_updated(app, db, monkeypatch):
+    seller = "seller@example.com"
+    kept, deleted = ObjectId(), ObjectId()
+    db.products.insert_many([{"_id": oid, "seller_email": seller, "price": 100, "discount": 0, "stock": 1,
+                              "version": 1} for oid in (kept, deleted)])
+
+    def bulk_write(self, requests, ordered=True):
+        # Doosra request pre-read ke baad product delete kar deta hai: uska op kuch match nahi karta
+        self.delete_one({"_id": deleted})
+        return SimpleNamespace(matched_count=len(requests) - 1)
+
+    monkeypatch.setattr(Collection, "bulk_write", bulk_write)
+    with app.app_context():
+        results = products_repository.bulk_update_products(
+            [{"id": str(kept), "stock": 5}, {"id": str(deleted), "stock": 5}], seller)
+
+    assert [r["status"] for r in results] == ["updated", "not_found"]
+    assert results[0]["stock"] == 5
@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import TimeoutError as CallTimeout
+
+import pytest
+
+from services.chat_service import ChatService
+from services.executor import BoundedExecutor
+from services.llm import StubModelClient
+
+
+def _service(latency=0.01, timeout=5):
+    return ChatService(StubModelClient(latency=latency), lambda query: "- Test Serum", timeout=timeout,
+                       executor=BoundedExecutor(max_workers=2, max_queue=2, name="test-llm"))
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+async def _collect_stream(service, message):
+    return await _collect(await service.stream_reply_async(message))
+
+
+def test_reply_async_calls_model_once_then_hits_cache():
+    service = _service()
+
+    text, cached = asyncio.run(service.reply_async("oily skin serum?"))
+    assert "oily skin serum" in text and not cached
+    assert asyncio.run(service.reply_async("Oily skin serum")) == (text, True)
+    assert service.model_client.calls == 1
+
+
+def test_stream_reply_async_yields_chunks_and_caches_reply():
+    service = _service()
+
+    text = "".join(asyncio.run(_collect_stream(service, "dry skin")))
+    assert text == service.reply("dry skin")[0]
+    assert service.model_client.calls == 1
+
+
+def test_async_calls_raise_call_timeout():
+    service = _service(latency=1.0, timeout=0.05)
+
+    with pytest.raises(CallTimeout):
+        asyncio.run(service.reply_async("slow"))
+    with pytest.raises(CallTimeout):
+        asyncio.run(_collect_stream(service, "slower"))
+
+
+def test_flask_stream_reports_timeout_event(client, monkeypatch):
+    from routes import chat
+
+    monkeypatch.setattr(chat, "chat_service", _service(latency=1.0, timeout=0.05))
+    response = client.post("/api/chat/stream", json={"message": "hello"})
+
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert "event: error" in body and '"code": "timeout"' in body
+
+
+def test_catalog_batch_bumps_chat_cache_once_and_ignores_stock_only_changes(monkeypatch):
+    from routes import chat
+    from services import catalog_events
+
+    service = _service()
+    monkeypatch.setattr(chat, "chat_service", service)
+    serum = {"_id": 1, "name": "Serum", "finalPrice": 100, "stock": 5, "isActive": True}
+
+    catalog_events.publish_many([(serum, {**serum, "stock": 4}), (serum, {**serum, "stock": 9})])
+    assert service.inventory_version() == 0
+
+    catalog_events.publish_many([(serum, {**serum, "finalPrice": 90}), (serum, {**serum, "stock": 0}), (None, serum)])
+    assert service.inventory_version() == 1
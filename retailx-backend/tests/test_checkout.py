@@ -0,0 +1,54 @@
+import pytest
+from bson import ObjectId
+
+from repositories.orders_repository import CheckoutError, checkout, price_cart
+
+
+def _product(db, **fields):
+    doc = {"_id": ObjectId(), "name": "Serum", "price": 500, "finalPrice": 450, "stock": 5, "isActive": True}
+    doc.update(fields)
+    db.products.insert_one(doc)
+    return doc["_id"]
+
+
+def test_null_final_price_falls_back_to_price(app, db):
+    pid = _product(db, finalPrice=None)
+    with app.app_context():
+        priced = price_cart([{"product_id": pid, "quantity": 2}])
+        order = checkout("a@x.com", [{"product_id": str(pid), "quantity": 2}])
+
+    assert priced["issues"] == []
+    assert priced["total"] == 1000.0
+    assert order["total"] == 1000.0
+
+
+def test_unpriced_product_is_rejected_not_500(app, db):
+    pid = _product(db, finalPrice=None, price=None)
+    with app.app_context():
+        with pytest.raises(CheckoutError) as e:
+            checkout("a@x.com", [{"product_id": str(pid), "quantity": 1}])
+
+    assert e.value.issues == [{"id": str(pid), "issue": "unavailable"}]
+    assert db.products.find_one({"_id": pid})["stock"] == 5
+
+
+def test_explicit_items_are_merged_and_limited_like_the_cart(app, db, monkeypatch):
+    from repositories import orders_repository
+
+    pid = _product(db)
+    with app.app_context():
+        order = checkout("a@x.com", [{"product_id": str(pid), "quantity": 1},
+                                     {"product_id": str(pid), "quantity": 2}])
+        assert [(i["product_id"], i["quantity"]) for i in order["items"]] == [(pid, 3)]
+
+        monkeypatch.setattr(orders_repository, "MAX_CART_LINES", 1)
+        with pytest.raises(ValueError):
+            checkout("a@x.com", [{"product_id": str(pid)}, {"product_id": str(_product(db))}])
+
+
+def test_null_stock_is_reported_not_500(app, db):
+    pid = _product(db, stock=None)
+    with app.app_context():
+        priced = price_cart([{"product_id": pid, "quantity": 1}])
+
+    assert priced["issues"] == [{"id": str(pid), "issue": "insufficient_stock", "available": 0}]
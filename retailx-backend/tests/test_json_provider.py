@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from bson import ObjectId
+from flask import jsonify
+
+from json_provider import PROVIDERS
+
+
+def test_app_json_provider_survives_mongo_init(app):
+    assert type(app.json) in PROVIDERS.values()
+
+
+def test_jsonify_encodes_bson_types_as_plain_values(app):
+    oid = ObjectId()
+    with app.app_context():
+        body = jsonify({"_id": oid, "createdAt": datetime(2024, 1, 2, 3, 4, 5)}).get_json()
+
+    assert body["_id"] == str(oid)
+    assert body["createdAt"].startswith("2024-01-02T03:04:05")
@@ -0,0 +1,42 @@
+import pytest
+from bson import ObjectId
+from pymongo import ASCENDING
+
+from repositories.indexes import ensure_indexes
+
+
+def _walk(client, sort, limit=3):
+    ids, cursor = [], None
+    while True:
+        url = f"/api/products?paginate=1&limit={limit}&sort={sort}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url)
+        assert response.status_code == 200
+        page = response.get_json()
+        ids.extend(p["id"] for p in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("sort", ["finalPrice", "-finalPrice", "rating", "-rating"])
+def test_cursor_pages_include_null_sort_values(client, db, sort):
+    docs = []
+    for i in range(10):
+        doc = {"_id": ObjectId(), "name": f"P{i}", "isActive": True, "price": 100 + i, "discount": 0,
+               "finalPrice": float(100 + i % 4), "rating": float(i % 3)}
+        if i % 3 == 0:
+            doc["finalPrice"] = None
+            doc.pop("rating")
+        docs.append(doc)
+    db.products.insert_many(docs)
+
+    ids = _walk(client, sort)
+    assert sorted(ids) == sorted(str(d["_id"]) for d in docs)
+    assert len(ids) == len(set(ids))
+
+
+def test_ensure_indexes_replaces_retired_index(db):
+    db.products.create_index([("isActive", ASCENDING), ("category", ASCENDING)], name="active_category_ci")
+    ensure_indexes(db)
+    names = db.products.index_information()
+    assert "active_category_ci" not in names and "active_category_id_ci" in names
@@ -0,0 +1,34 @@
+from bson import ObjectId
+
+from repositories import products_repository
+from repositories.cache import LRUTTLCache
+
+
+def test_read_racing_a_write_cannot_cache_the_old_doc(app, db, monkeypatch):
+    monkeypatch.setattr(products_repository, "_cache", LRUTTLCache())
+    pid = db.products.insert_one({"name": "Serum", "price": 100, "finalPrice": 100, "version": 1}).inserted_id
+
+    with app.app_context():
+        # Reader ne key aur doc write se pehle le liye...
+        found, missing, keys = products_repository._cached_products([str(pid)])
+        stale_docs = list(db.products.find({"_id": {"$in": missing}}))
+        # ...write ho gaya aur invalidate bhi...
+        products_repository.update_product_fields(str(pid), {"finalPrice": 80})
+        # ...phir reader ne purana doc cache kiya
+        products_repository._store_products(stale_docs, keys)
+
+        assert products_repository.get_product_by_id(str(pid))["finalPrice"] == 80
+        assert products_repository.get_products_by_ids([str(pid)])[str(pid)]["finalPrice"] == 80
+
+
+def test_product_reads_are_cached_until_written(app, db, monkeypatch):
+    monkeypatch.setattr(products_repository, "_cache", LRUTTLCache())
+    pid = str(db.products.insert_one({"name": "Serum", "price": 100, "finalPrice": 100}).inserted_id)
+
+    with app.app_context():
+        products_repository.get_product_by_id(pid)
+        db.products.update_one({"_id": ObjectId(pid)}, {"$set": {"finalPrice": 1}})  # cache ke bina
+        assert products_repository.get_product_by_id(pid)["finalPrice"] == 100
+
+        products_repository.update_product_fields(pid, {"finalPrice": 90})
+        assert products_repository.get_product_by_id(pid)["finalPrice"] == 90
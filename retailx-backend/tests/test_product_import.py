@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+pytest.importorskip("flask_pymongo")
+
+from services.product_import import validate_row
+
+
+@pytest.mark.parametrize("row", [
+    {"name": "Serum", "price": 100, "stock": "inf"},
+    {"name": "Serum", "price": 100, "stock": 1e400},
+    {"name": "Serum", "price": "inf", "stock": 1},
+    {"name": "Serum", "price": "nan", "stock": 1},
+])
+def test_validate_row_rejects_non_finite_numbers(row):
+    with pytest.raises(ValueError):
+        validate_row(row, "seller@example.com")
+
+
+def test_validate_row_builds_product():
+    product = validate_row({"name": "Serum", "price": "200", "discount": "10", "stock": "3"}, "seller@example.com")
+    assert (product["finalPrice"], product["stock"], product["seller_email"]) == (180, 3, "seller@example.com")
+
+
+def _write(tmp_path, lines):
+    path = tmp_path / "rows.ndjson"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_run_import_flushes_bad_rows_and_caps_stored_errors(app, db, tmp_path, monkeypatch):
+    from services import product_import
+
+    monkeypatch.setattr(product_import, "BATCH_SIZE", 10)
+    monkeypatch.setattr(product_import, "MAX_REPORTED_ERRORS", 15)
+    recorded = []
+    record = product_import._record_batch
+    monkeypatch.setattr(product_import, "_record_batch",
+                        lambda job_id, processed, inserted, failed, errors:
+                        (recorded.append((processed, len(errors))), record(job_id, processed, inserted, failed, errors)))
+
+    job_id = ObjectId()
+    db.import_jobs.insert_one({"_id": job_id, "status": "running", "processed": 0, "inserted": 0,
+                               "failed": 0, "errors": []})
+    lines = ['{"name": "", "price": 1}'] * 38 + ['{"name": "Serum", "price": 100, "stock": 2}'] * 2
+    with app.app_context():
+        product_import.run_import(job_id, _write(tmp_path, lines), "ndjson", "seller@example.com")
+
+    job = db.import_jobs.find_one({"_id": job_id})
+    assert [p for p, _ in recorded] == [10, 10, 10, 10]    # bad rows bhi progress flush karte hain
+    assert [n for _, n in recorded] == [10, 5, 0, 0]        # cap ke baad errors store nahi hote
+    assert (job["status"], job["processed"], job["inserted"], job["failed"]) == ("completed", 40, 2, 38)
+    assert len(job["errors"]) == 15
+
+
+def test_second_running_import_is_rejected(app, db, client):
+    from io import BytesIO
+
+    from flask_jwt_extended import create_access_token
+    from services.product_import import ImportInProgress, start_import
+
+    running = ObjectId()
+    db.import_jobs.insert_one({"_id": running, "seller_email": "seller@example.com", "status": "running",
+                               "updatedAt": datetime.utcnow()})
+
+    class Upload:
+        filename = "rows.csv"
+
+        def save(self, out):
+            out.write(b"name,price\n")
+
+    with app.app_context():
+        with pytest.raises(ImportInProgress):
+            start_import(Upload(), "seller@example.com")
+        token = create_access_token(identity="seller@example.com")
+
+    response = client.post("/api/seller/product/import", headers={"Authorization": f"Bearer {token}"},
+                           data={"file": (BytesIO(b"name,price\n"), "rows.csv")})
+    assert response.status_code == 409
+    assert response.get_json()["job_id"] == str(running)
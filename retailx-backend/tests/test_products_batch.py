@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.mark.parametrize("body", [["a", "b"], "ids", 5, {"ids": []}])
+def test_batch_post_rejects_non_object_body(client, body):
+    response = client.post("/api/products/batch", json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "ids required"}
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("flask_pymongo")
+
+from benchmarks.common import make_product
+from services.retrieval_index import RetrievalIndex, _features
+
+QUERIES = ["oily skin serum", "matte lipstick", "hydrating face wash for dry skin", "sunscreen spf 50"]
+
+
+def _catalog(n, seed=11):
+    rng = random.Random(seed)
+    return [dict(make_product(rng), isActive=True) for _ in range(n)]
+
+
+def _dense(index, buckets, vals):
+    vec = np.zeros(index.dim)
+    vec[buckets] = vals
+    return vec
+
+
+def _brute_force(index, products, query, k):
+    """Dense cosine over every live product, same query-side idf."""
+    docs = {str(p["_id"]): _dense(index, *index.product_vector(p)) for p in products}
+    df = sum((v != 0).astype(float) for v in docs.values())
+    q = _dense(index, *index.vectorize(_features(query, 1.0))) * np.log1p(len(docs) / (1.0 + df))
+    q /= np.linalg.norm(q)
+    scores = sorted(((float(v @ q), doc_id) for doc_id, v in docs.items()), reverse=True)
+    return [s for s, _ in scores[:k] if s > 0]
+
+
+def _scores(index, query, k):
+    return [score for _, score in index.search(query, k=k)]
+
+
+def test_matches_dense_cosine():
+    index = RetrievalIndex(dim=1 << 12)
+    products = _catalog(400)
+    index.rebuild(products)
+
+    for query in QUERIES:
+        assert _scores(index, query, 5) == pytest.approx(_brute_force(index, products, query, 5), rel=1e-4)
+
+
+def test_writes_go_to_delta_and_compaction_keeps_results():
+    index = RetrievalIndex(dim=1 << 12, max_delta=10**6)
+    products = _catalog(300)
+    for p in products[:50]:
+        p["name"] = "Zzqx " + p["name"]
+    index.rebuild(products[:200])
+    assert len(index.search("zzqx", k=100)) == 50
+
+    for p in products[200:]:
+        index.upsert(p)
+    for p in products[:50]:
+        index.remove(p["_id"])
+    for p in products[50:80]:
+        p["name"] = "Qqvx " + p["name"]
+        index.upsert(p)
+    live = products[50:]
+
+    assert len(index) == 250 and len(index._delta) == 130
+    # Removed base rows are masked; updated ones are scored from the delta
+    assert index.search("zzqx", k=100) == []
+    hits = index.search("qqvx", k=100)
+    assert sorted(p["name"] for p, _ in hits) == sorted(p["name"] for p in products[50:80])
+
+    index.compact()
+    assert len(index._base) == 250 and not index._delta and not index._dead.any()
+    for query in QUERIES:
+        assert _scores(index, query, 5) == pytest.approx(_brute_force(index, live, query, 5), rel=1e-4)
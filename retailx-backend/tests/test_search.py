@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+pytest.importorskip("flask_pymongo")
+
+from benchmarks.common import make_product
+from routes import search
+from services import facets
+from services.search_index import search_index
+
+FILTERS = {"category": [], "brand": [], "min_price": None, "max_price": None, "min_rating": None}
+
+
+@pytest.fixture
+def indexed_catalog(monkeypatch):
+    rng = random.Random(3)
+    products = [dict(make_product(rng), isActive=True) for _ in range(200)]
+    search_index.rebuild(products)
+    monkeypatch.setattr(search, "_results_cache", search.LRUTTLCache())
+    return products
+
+
+def test_facet_counts_are_cached_until_the_index_changes(indexed_catalog, monkeypatch):
+    calls = []
+    count_facets = facets.count_facets
+    monkeypatch.setattr(facets, "count_facets", lambda *a, **kw: calls.append(1) or count_facets(*a, **kw))
+
+    first = search.indexed_search("serum", FILTERS, True)
+    assert search.indexed_search("Serum ", FILTERS, True) == first
+    assert len(calls) == 1
+
+    search_index.upsert(dict(indexed_catalog[0], name="Serum Deluxe"))
+    search.indexed_search("serum", FILTERS, True)
+    assert len(calls) == 2
+
+
+def test_brand_filter_is_case_insensitive(indexed_catalog):
+    brand = indexed_catalog[0]["brand"]
+    exact, _ = search.indexed_search(brand, {**FILTERS, "brand": [brand]}, False)
+    lower, _ = search.indexed_search(brand, {**FILTERS, "brand": [brand.lower()]}, False)
+    assert exact and exact == lower
@@ -0,0 +1,38 @@
+import mongomock
+import pytest
+
+from benchmarks.seed import check_resettable, seed
+
+
+def _seed(db, **kwargs):
+    return seed(db, products=5, sellers=2, users=2, rounds=4, **kwargs)
+
+
+def test_reset_refused_outside_bench_db():
+    db = mongomock.MongoClient()["retailx"]
+    db.orders.insert_one({"_id": 1})
+
+    with pytest.raises(ValueError):
+        _seed(db)
+
+    assert db.orders.count_documents({}) == 1
+
+
+def test_reset_allowed_on_bench_db_or_when_forced():
+    bench = mongomock.MongoClient()["retailx_bench"]
+    bench.orders.insert_one({"_id": 1})
+    _seed(bench)
+    assert bench.orders.count_documents({}) == 0
+    assert bench.products.count_documents({}) == 5
+
+    prod = mongomock.MongoClient()["retailx"]
+    prod.orders.insert_one({"_id": 1})
+    _seed(prod, force_reset=True)
+    assert prod.orders.count_documents({}) == 0
+
+
+def test_check_resettable_guards_non_bench_db():
+    check_resettable(mongomock.MongoClient()["retailx_bench"])
+    check_resettable(mongomock.MongoClient()["retailx"], force=True)
+    with pytest.raises(ValueError):
+        check_resettable(mongomock.MongoClient()["retailx"])
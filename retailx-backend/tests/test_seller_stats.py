@@ -0,0 +1,63 @@
+import random
+
+import pytest
+from mongomock.collection import Collection
+from pymongo import ReplaceOne
+
+from benchmarks.common import make_product
+from repositories import products_repository, seller_stats_repository
+
+
+@pytest.fixture
+def seller_stats_writes(monkeypatch):
+    """Record seller_stats bulk_write batches (applied op by op: mongomock's bulk_write lags pymongo's)."""
+    calls = []
+
+    def bulk_write(self, requests, ordered=True):
+        assert self.name == "seller_stats"
+        calls.append(len(requests))
+        for op in requests:
+            write = self.replace_one if isinstance(op, ReplaceOne) else self.update_one
+            write(op._filter, op._doc, upsert=op._upsert)
+
+    monkeypatch.setattr(Collection, "bulk_write", bulk_write)
+    return calls
+
+
+def _stats(db):
+    return {doc["_id"]: doc for doc in db.seller_stats.find()}
+
+
+def test_bulk_insert_applies_one_batched_stats_update(app, db, seller_stats_writes):
+    rng = random.Random(5)
+    products = [dict(make_product(rng), seller_email=f"seller{i % 2}@example.com") for i in range(20)]
+
+    with app.app_context():
+        inserted, failed = products_repository.insert_products(products)
+        assert not failed and len(inserted) == 20
+        assert seller_stats_writes == [2]   # one op per seller, one round trip
+
+        products_repository.update_product_fields(str(products[0]["_id"]), {"stock": 0})
+        products_repository.delete_product(str(products[1]["_id"]))
+        assert seller_stats_writes == [2, 1, 1]
+
+        incremental = _stats(db)
+        seller_stats_repository.rebuild_seller_stats()
+        reconciled = _stats(db)
+
+    assert incremental.keys() == reconciled.keys()
+    for email, doc in reconciled.items():
+        for field in seller_stats_repository.COUNTERS:
+            assert incremental[email].get(field, 0) == pytest.approx(doc[field])
+
+
+def test_batch_deltas_sum_per_seller():
+    a = {"seller_email": "a@example.com", "stock": 2, "finalPrice": 10.0, "category": "Skincare"}
+    b = {"seller_email": "b@example.com", "stock": 0, "finalPrice": 5.0, "category": "Makeup"}
+    changes = [(None, a), (None, b), (a, {**a, "stock": 7})]
+
+    deltas = seller_stats_repository.batch_deltas(changes)
+    assert deltas["a@example.com"]["skus"] == 1
+    assert deltas["a@example.com"]["totalStock"] == 7
+    assert deltas["a@example.com"]["inventoryValue"] == 70.0
+    assert deltas["b@example.com"]["outOfStock"] == 1
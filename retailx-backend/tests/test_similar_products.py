@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("flask_pymongo")
+
+from benchmarks.common import make_product
+from services import similar_products as sp
+
+
+def _catalog(n, seed=7):
+    rng = random.Random(seed)
+    return [dict(make_product(rng), isActive=True) for _ in range(n)]
+
+
+def _brute_force(table, doc_id):
+    """All-pairs top-K inside the product's category (what blocked candidates approximate)."""
+    group = table._groups[table._features[doc_id]["group"]]
+    row = group.pos[doc_id]
+    cols = np.arange(len(group))
+    scores = group.scores(np.array([row]), cols)[0]
+    return [other for other, _ in table._top_k(group, cols, scores)]
+
+
+def test_small_catalog_matches_all_pairs():
+    table = sp.SimilarProducts(k=5)
+    products = _catalog(300)
+    table.rebuild(products)
+
+    for p in [p for p in products if p.get("isActive", True)][:50]:
+        doc_id = str(p["_id"])
+        assert [other for other, _ in table._neighbors[doc_id]] == _brute_force(table, doc_id)
+
+
+def test_writes_are_queued_and_applied_by_flush():
+    table = sp.SimilarProducts(k=5)
+    products = _catalog(200)
+    table.rebuild(products)
+
+    twin = dict(products[0], _id=type(products[0]["_id"])())
+    table._pending[str(twin["_id"])] = twin  # enqueue() bina worker thread ke
+    assert table.similar(twin["_id"]) is None  # request path pe kuch compute nahi hua
+
+    assert table.flush() == 1
+    assert table.similar(twin["_id"]) is not None
+    # Same features wala product ek doosre ki list mein sabse upar
+    assert table._neighbors[str(products[0]["_id"])][0][0] == str(twin["_id"])
+
+    table._pending[str(twin["_id"])] = None
+    table.flush()
+    assert table.similar(twin["_id"]) is None
+    assert all(other != str(twin["_id"]) for neighbors in table._neighbors.values() for other, _ in neighbors)
+
+
+def test_changes_during_rebuild_are_replayed():
+    table = sp.SimilarProducts(k=5)
+    products = _catalog(100)
+    late = dict(products[0], _id=type(products[0]["_id"])())
+
+    def cursor():
+        # DB cursor pe chalte waqt hi ek write aata hai
+        table._pending[str(late["_id"])] = late
+        table.flush()
+        yield from products
+
+    table.rebuild(cursor())
+    assert table.similar(late["_id"]) is not None
@@ -0,0 +1,49 @@
+import pytest
+
+import app as app_module
+
+CONFIG = {
+    "TESTING": True,
+    "MONGO_URI": "mongodb://localhost:27017/retailx_test",
+    "SECRET_KEY": "test-secret",
+    "JWT_SECRET_KEY": "test-jwt-secret-with-enough-bytes-for-hs256",
+    "DB_INDEX_SELF_CHECK": False,
+    "METRICS_ENABLED": False,
+}
+
+
+@pytest.fixture
+def mock_mongo(monkeypatch):
+    flask_pymongo = pytest.importorskip("flask_pymongo")
+    mongomock = pytest.importorskip("mongomock")
+    monkeypatch.setattr(flask_pymongo, "MongoClient", mongomock.MongoClient)
+
+
+def test_index_provisioning_failure_fails_lazy_startup(mock_mongo, monkeypatch):
+    from repositories import indexes
+
+    def conflict(db, self_check=True):
+        raise indexes.QueryPlanError("Hot queries without a usable index: products")
+
+    monkeypatch.setattr(indexes, "provision_indexes", conflict)
+    with pytest.raises(indexes.QueryPlanError):
+        app_module.create_app({**CONFIG, "STARTUP_WARMUP": "lazy"})
+
+
+def test_failed_warmup_step_does_not_skip_the_rest(mock_mongo, monkeypatch):
+    from repositories import admin_stats_repository
+    from services import search_index
+
+    ran = []
+
+    def broken(app):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(search_index, "init_search_index", broken)
+    monkeypatch.setattr(admin_stats_repository, "init_admin_stats", lambda app: ran.append("admin stats"))
+
+    app = app_module.create_app({**CONFIG, "STARTUP_WARMUP": "sync", "SEARCH_INDEX_REFRESH_SECONDS": 0,
+                                 "SIMILAR_PRODUCTS_REFRESH_SECONDS": 0, "FEED_REFRESH_SECONDS": 0,
+                                 "SELLER_STATS_RECONCILE_SECONDS": 0})
+    assert app.config["WARMUP_FAILED"] == ["search index"]
+    assert ran == ["admin stats"]
@@ -0,0 +1,11 @@
+from repositories.products_repository import resolve_view
+
+
+def test_image_url_alone_slices_images():
+    projection, _ = resolve_view(fields=["name", "imageURL"])
+    assert projection["images"] == {"$slice": 1}
+
+
+def test_explicit_images_field_keeps_full_list():
+    projection, _ = resolve_view(fields=["imageURL", "images"])
+    assert projection["images"] == 1
@@ -24,14 +24,57 @@ const Chatbot = () => {
     setLoading(true);
 
     try {
-      // Best practice: Use localhost for frontend fetch
-      const res = await fetch('http://localhost:5000/api/chat/', {
+      // Streaming endpoint: reply tokens SSE events mein aate hain
+      const res = await fetch('http://localhost:5000/api/chat/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ message: input }),
       });
-      const data = await res.json();
-      setMessages(prev => [...prev, { role: 'bot', text: data.reply }]);
+
+      if (!res.ok || !res.body) {
+        const data = await res.json();
+        setMessages(prev => [...prev, { role: 'bot', text: data.reply }]);
+        return;
+      }
+
+      // Khali bot message add karo, phir har delta uske end mein jodo
+      setMessages(prev => [...prev, { role: 'bot', text: '' }]);
+      const appendToReply = (text) => setMessages(prev => {
+        const updated = [...prev];
+        const last = updated[updated.length - 1];
+        updated[updated.length - 1] = { ...last, text: last.text + text };
+        return updated;
+      });
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let firstChunk = true;
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // SSE events "\n\n" se alag hote hain
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const raw of events) {
+          const event = raw.match(/^event: (.*)$/m)?.[1];
+          const data = raw.match(/^data: (.*)$/m)?.[1];
+          if (!data) continue;
+          const payload = JSON.parse(data);
+          if (event === 'delta') {
+            if (firstChunk) {
+              setLoading(false);
+              firstChunk = false;
+            }
+            appendToReply(payload.text);
+          } else if (event === 'error') {
+            appendToReply(payload.reply);
+          }
+        }
+      }
     } catch (err) {
       setMessages(prev => [...prev, { role: 'bot', text: 'Server connect nahi ho raha!' }]);
     } finally {
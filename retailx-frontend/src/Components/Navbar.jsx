@@ -1,4 +1,4 @@
-import { useState, useContext } from "react";
+import { useState, useContext, useEffect } from "react";
 import { ShoppingCart, Search, User, ChevronDown } from "lucide-react";
 import { Button } from "./ui/button";
 import { Link, useNavigate } from "react-router-dom";
@@ -13,14 +13,46 @@ export default function Navbar() {
   // FIX: Yahan change kiya hai. Ab ye sirf unique products count karega.
   const cartCount = cart ? cart.length : 0; 
 
+  const [suggestions, setSuggestions] = useState([]);
+
+  // Search-as-you-type: thoda ruk ke (debounce) backend ke prefix index se suggestions
+  useEffect(() => {
+    const q = searchQuery.trim();
+    if (!q) {
+      setSuggestions([]);
+      return;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const res = await fetch(`http://localhost:5000/api/search/suggest?q=${encodeURIComponent(q)}`, { signal: controller.signal });
+        if (res.ok) setSuggestions(await res.json());
+      } catch (err) {
+        if (err.name !== "AbortError") console.error("Suggest error:", err);
+      }
+    }, 120);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [searchQuery]);
+
   const handleSearch = (e) => {
     e.preventDefault();
     if (searchQuery.trim()) {
       navigate(`/search?q=${searchQuery}`);
       setSearchQuery("");
+      setSuggestions([]);
     }
   };
 
+  const pickSuggestion = (s) => {
+    // Product name seedha product page pe, baaki (brand/category/tag) search pe
+    navigate(s.type === "name" && s.id ? `/product/${s.id}` : `/search?q=${encodeURIComponent(s.text)}`);
+    setSearchQuery("");
+    setSuggestions([]);
+  };
+
   return (
     <nav className="fixed top-0 left-0 w-full z-[100] bg-white/80 backdrop-blur-md border-b border-slate-100">
       <div className="max-w-7xl mx-auto px-6 h-16 flex items-center justify-between">
@@ -41,6 +73,23 @@ export default function Navbar() {
               onChange={(e) => setSearchQuery(e.target.value)}
               className="bg-slate-50 pl-10 pr-4 py-2 w-[320px] xl:w-[400px] text-sm rounded-xl border border-transparent focus:border-emerald-500/20 focus:bg-white focus:ring-4 focus:ring-emerald-500/5 outline-none transition-all"
             />
+            {suggestions.length > 0 && (
+              <ul className="absolute top-full left-0 mt-2 w-full bg-white border border-slate-100 rounded-xl shadow-lg overflow-hidden">
+                {suggestions.map((s) => (
+                  <li key={`${s.type}-${s.id || s.text}`}>
+                    <button
+                      type="button"
+                      onMouseDown={(e) => e.preventDefault()}
+                      onClick={() => pickSuggestion(s)}
+                      className="w-full flex items-center justify-between px-4 py-2 text-sm text-left text-slate-700 hover:bg-slate-50"
+                    >
+                      <span className="truncate">{s.text}</span>
+                      <span className="ml-3 text-[10px] uppercase tracking-wider text-slate-400">{s.type === "name" ? "product" : s.type}</span>
+                    </button>
+                  </li>
+                ))}
+              </ul>
+            )}
           </form>
         </div>
 
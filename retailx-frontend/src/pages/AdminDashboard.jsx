@@ -1,4 +1,4 @@
-import { useState } from "react";
+import { useState, useEffect } from "react";
 import {
   Users, ShoppingBag, Package, BarChart3, IndianRupee,
   ShieldCheck, Tag, LogOut, Bell, Search, 
@@ -127,15 +127,52 @@ function StatCard({ label, value, trend, up }) {
 /* ---------- PAGE VIEWS ---------- */
 
 function InsightsView() {
+  const [stats, setStats] = useState(null);
+
+  // Server pe precomputed snapshots (ek find_one), full collection aggregation nahi
+  useEffect(() => {
+    fetch("http://localhost:5000/api/admin/stats", {
+      headers: { Authorization: `Bearer ${localStorage.getItem("token")}` }
+    })
+      .then(res => (res.ok ? res.json() : null))
+      .then(setStats)
+      .catch(err => console.error("Admin stats error:", err));
+  }, []);
+
+  const catalog = stats?.catalog;
+  const signups = stats?.signups;
+  const recentUsers = (signups?.days || []).slice(-30).reduce((sum, d) => sum + d.users, 0);
+
   return (
     <div className="space-y-10">
       <div className="grid grid-cols-1 md:grid-cols-3 gap-8">
-        <StatCard label="Platform Users" value="12,450" trend="+12%" up={true} />
-        <StatCard label="Total Orders" value="3,210" trend="+5%" up={true} />
-        <StatCard label="Revenue" value="₹8.2L" trend="+18%" up={true} />
+        <StatCard label="Platform Users" value={(signups?.totalUsers ?? 0).toLocaleString()} trend={`+${recentUsers} / 30d`} up={true} />
+        <StatCard label="Live Products" value={(catalog?.active ?? 0).toLocaleString()} trend={`${catalog?.inactive ?? 0} inactive`} up={!catalog?.inactive} />
+        <StatCard label="Inventory Value" value={`₹${Math.round(catalog?.inventoryValue ?? 0).toLocaleString()}`} trend={`${signups?.totalSellers ?? 0} sellers`} up={true} />
       </div>
-      
-      
+
+      {catalog && (
+        <div className="bg-white border border-slate-100 rounded-2xl shadow-sm overflow-hidden">
+          <table className="w-full text-sm text-left">
+            <thead className="bg-slate-50 border-b border-slate-100">
+              <tr>
+                <th className="px-8 py-5 font-bold text-slate-500 uppercase text-[11px] tracking-wider">Category</th>
+                <th className="px-8 py-5 font-bold text-slate-500 uppercase text-[11px] tracking-wider text-center">Products</th>
+                <th className="px-8 py-5 font-bold text-slate-500 uppercase text-[11px] tracking-wider text-right">Inventory Value</th>
+              </tr>
+            </thead>
+            <tbody className="divide-y divide-slate-100">
+              {catalog.byCategory.map(c => (
+                <tr key={c.category} className="hover:bg-slate-50/50 transition-colors">
+                  <td className="px-8 py-4 font-bold text-slate-900">{c.category}</td>
+                  <td className="px-8 py-4 text-center">{c.products} <span className="text-slate-400">({c.active} live)</span></td>
+                  <td className="px-8 py-4 text-right">₹{Math.round(c.inventoryValue).toLocaleString()}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      )}
     </div>
   );
 }
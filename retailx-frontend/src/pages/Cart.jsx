@@ -15,15 +15,16 @@ const Cart = () => {
     const fetchSuggestions = async () => {
       if (cart.length > 0) {
         setLoadingRecs(true);
-        // Cart ke sabse latest item ki category lete hain
-        const lastItemCategory = cart[cart.length - 1].category;
+        // Cart ke sabse latest item ke similar products
+        const lastItem = cart[cart.length - 1];
+        const lastItemId = lastItem.id || lastItem._id;
         try {
-          // Humne backend mein jo 'limit=4' banaya tha wahi use kar rhe hain
-          const res = await fetch(`http://localhost:5000/api/products?category=${lastItemCategory}&limit=4`);
+          // Thode zyada mangte hain kyunki cart wale items filter ho jaate hain
+          const res = await fetch(`http://localhost:5000/api/product/${lastItemId}/similar?limit=8`);
           const data = await res.json();
           // Filter: Jo items pehle se cart mein hain unhe suggestions mein mat dikhao
           const filtered = data.filter(p => !cart.some(item => (item.id || item._id) === p.id));
-          setRecommendations(filtered);
+          setRecommendations(filtered.slice(0, 4));
         } catch (err) {
           console.error("Error fetching suggestions:", err);
         } finally {
@@ -57,6 +58,38 @@ const Cart = () => {
   const totalDiscountedPrice = cart.reduce((acc, item) => acc + (Number(item.finalPrice || item.price) * (item.quantity || 1)), 0);
   const totalSavings = totalOriginalPrice - totalDiscountedPrice;
 
+  // --- PLACE ORDER (backend price/stock revalidate karke stock reserve karta hai) ---
+  const [placingOrder, setPlacingOrder] = useState(false);
+  const placeOrder = async () => {
+    const token = localStorage.getItem("userToken");
+    if (!token) {
+      alert("Order place karne ke liye pehle login karo");
+      return;
+    }
+    setPlacingOrder(true);
+    try {
+      const res = await fetch('http://localhost:5000/api/cart/checkout', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${token}` },
+        body: JSON.stringify({
+          items: cart.map(item => ({ product_id: item.id || item._id, quantity: item.quantity || 1 })),
+          expected_total: totalDiscountedPrice,
+        }),
+      });
+      const data = await res.json();
+      if (res.ok) {
+        alert(`Order placed! Total ₹${data.total.toLocaleString()}`);
+        setCart([]);
+      } else {
+        alert(data.message || "Order place nahi ho paya");
+      }
+    } catch (err) {
+      console.error("Checkout error:", err);
+    } finally {
+      setPlacingOrder(false);
+    }
+  };
+
   // --- 4. EMPTY CART VIEW ---
   if (cart.length === 0) {
     return (
@@ -195,8 +228,8 @@ const Cart = () => {
                    You will save ₹{totalSavings.toLocaleString()} on this order
                 </p>
                 
-                <button className="w-full bg-[#fb641b] text-white py-3 rounded-sm font-bold text-base shadow hover:bg-[#e65a16] transition uppercase tracking-wide">
-                  Place Order
+                <button onClick={placeOrder} disabled={placingOrder} className="w-full bg-[#fb641b] text-white py-3 rounded-sm font-bold text-base shadow hover:bg-[#e65a16] transition uppercase tracking-wide disabled:opacity-60">
+                  {placingOrder ? "Placing Order..." : "Place Order"}
                 </button>
               </div>
             </div>
@@ -35,7 +35,8 @@ const ProductPage = () => {
         setCurrentProduct(data);
         window.scrollTo(0, 0);
 
-        const resSimilar = await fetch(`http://localhost:5000/api/products?category=${data.category}&limit=24`);
+        // Precomputed similar products (tags, brand, price band), current product already excluded
+        const resSimilar = await fetch(`http://localhost:5000/api/product/${id}/similar?limit=24`);
         const sData = await resSimilar.json();
         const filtered = sData.filter(p => (p._id || p.id) !== id);
         
@@ -13,6 +13,7 @@ export default function SearchResults() {
   const { addToCart } = useContext(CartContext); // Global function use karne ke liye
   
   const [products, setProducts] = useState([]);
+  const [facets, setFacets] = useState(null);
   const [loading, setLoading] = useState(true);
   
   const [sortBy, setSortBy] = useState(""); 
@@ -20,13 +21,17 @@ export default function SearchResults() {
   const [maxPrice, setMaxPrice] = useState(100000); 
   const [visibleCount, setVisibleCount] = useState(8);
 
+  // Brand / price filters ab server pe lagte hain (poore match set pe), counts bhi wahi se
   useEffect(() => {
     const fetchResults = async () => {
       setLoading(true);
       try {
-        const response = await fetch(`http://127.0.0.1:5000/api/search/?q=${query}`);
+        const params = new URLSearchParams({ q: query, facets: "1", max_price: maxPrice });
+        if (selectedBrand !== "All") params.append("brand", selectedBrand);
+        const response = await fetch(`http://127.0.0.1:5000/api/search/?${params}`);
         const data = await response.json();
-        setProducts(data);
+        setProducts(data.items || []);
+        setFacets(data.facets || null);
         setVisibleCount(8);
       } catch (error) {
         console.error("Search error:", error);
@@ -34,8 +39,12 @@ export default function SearchResults() {
         setLoading(false);
       }
     };
-    if (query) fetchResults();
-  }, [query]);
+    if (query) {
+      // Slider drag pe har step ki request na jaaye
+      const timer = setTimeout(fetchResults, 250);
+      return () => clearTimeout(timer);
+    }
+  }, [query, selectedBrand, maxPrice]);
 
   // --- LOGIC: Add to Cart and Redirect ---
   const handleAddToCart = (p) => {
@@ -54,23 +63,19 @@ export default function SearchResults() {
   };
 
   const brands = useMemo(() => {
-    const b = products.map(p => p.brand);
-    return ["All", ...new Set(b)];
-  }, [products]);
+    const options = (facets?.brand || []).map(b => ({ value: b.value, label: `${b.value} (${b.count})` }));
+    return [{ value: "All", label: "All" }, ...options];
+  }, [facets]);
 
   const filteredProducts = useMemo(() => {
     let result = [...products];
-    if (selectedBrand !== "All") {
-      result = result.filter(p => p.brand === selectedBrand);
-    }
-    result = result.filter(p => p.finalPrice <= maxPrice);
     if (sortBy === "low-to-high") {
       result.sort((a, b) => a.finalPrice - b.finalPrice);
     } else if (sortBy === "high-to-low") {
       result.sort((a, b) => b.finalPrice - a.finalPrice);
     }
     return result;
-  }, [products, selectedBrand, maxPrice, sortBy]);
+  }, [products, sortBy]);
 
   return (
     <div className="min-h-screen bg-gray-50">
@@ -94,10 +99,11 @@ export default function SearchResults() {
 
             <select 
               className="bg-white border border-gray-200 px-3 py-2 rounded-lg text-sm outline-none"
+              value={selectedBrand}
               onChange={(e) => setSelectedBrand(e.target.value)}
             >
               {brands.map(brand => (
-                <option key={brand} value={brand}>{brand}</option>
+                <option key={brand.value} value={brand.value}>{brand.label}</option>
               ))}
             </select>
 
@@ -15,6 +15,7 @@ const SellerDashboard = () => {
   const [activeTab, setActiveTab] = useState('Overview');
   const [sellerData, setSellerData] = useState(null);
   const [products, setProducts] = useState([]);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [editingProduct, setEditingProduct] = useState(null);
@@ -41,6 +42,17 @@ const SellerDashboard = () => {
   };
   const [newProduct, setNewProduct] = useState(initialProduct);
 
+  // --- 📊 STATS (server pe precomputed, poori inventory se calculate nahi karte) ---
+  const fetchStats = useCallback(async () => {
+    const token = localStorage.getItem("sellerToken");
+    try {
+      const res = await fetch(`${API_BASE}/api/seller/stats`, {
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+      if (res.ok) setStats(await res.json());
+    } catch (err) { console.error("Stats fetch failed"); }
+  }, []);
+
   // --- 🔄 FETCH DATA ---
   const fetchData = useCallback(async () => {
     const token = localStorage.getItem("sellerToken");
@@ -63,11 +75,12 @@ const SellerDashboard = () => {
       
       setSellerData(sData);
       setProducts(Array.isArray(pData) ? pData : []);
+      fetchStats();
     } catch (err) {
       console.error("Fetch Error:", err);
       if (err.message === "Unauthorized") navigate("/seller-auth");
     } finally { setLoading(false); }
-  }, [navigate]); 
+  }, [navigate, fetchStats]); 
 
   useEffect(() => { fetchData(); }, [fetchData]); 
   
@@ -154,6 +167,7 @@ const handleSubmitProduct = async (e) => {
       });
       if (res.ok) {
         setProducts(prev => prev.map(p => p._id === id ? { ...p, stock: newStockVal } : p));
+        fetchStats();
       }
     } catch (err) { console.error("Stock update failed"); }
   };
@@ -256,7 +270,7 @@ const handleSubmitProduct = async (e) => {
 
             <AnimatePresence mode="wait">
                 <motion.div key={activeTab} initial={{ opacity: 0, y: 20 }} animate={{ opacity: 1, y: 0 }} transition={{ duration: 0.4 }}>
-                    {activeTab === 'Overview' && <OverviewView products={products} />}
+                    {activeTab === 'Overview' && <OverviewView stats={stats} />}
                     {activeTab === 'Inventory' && (
                     <InventoryView 
                       products={products} 
@@ -567,11 +581,12 @@ const InventoryView = ({ products, onDelete, onUpdateStock, onEdit }) => (
   </div>
 );
 
-const OverviewView = ({ products }) => (
+const OverviewView = ({ stats }) => (
   <div className="grid grid-cols-4 gap-8">
-    <StatCard label="Total Inventory" value={products.length} icon={Box} color="emerald" />
-    <StatCard label="Live Revenue" value="₹0" icon={DollarSign} color="slate" />
-    <StatCard label="Active Orders" value="0" icon={ShoppingCart} color="slate" />
+    <StatCard label="Total Inventory" value={stats?.skus ?? 0} icon={Box} color="emerald" />
+    <StatCard label="Units In Stock" value={stats?.totalStock ?? 0} icon={Package} color="slate" />
+    <StatCard label="Inventory Value" value={`₹${Math.round(stats?.inventoryValue ?? 0).toLocaleString()}`} icon={DollarSign} color="slate" />
+    <StatCard label="Low / Out of Stock" value={`${stats?.lowStock ?? 0} / ${stats?.outOfStock ?? 0}`} icon={ShoppingCart} color="slate" />
     {/* <StatCard label="Trust Score" value="100%" icon={Star} color="emerald" /> */}
   </div>
 );